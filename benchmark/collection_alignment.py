@@ -0,0 +1,47 @@
+"""
+benchmark of Time_Series_Data_Collection alignment
+
+pad_time_index and remove_different_time_index on a ragged panel
+(every category misses a random part of the timeline).
+
+usage: python benchmark/collection_alignment.py
+"""
+import time
+import numpy as np
+from time_series_transform.transform_core_api.base import (Time_Series_Data, Time_Series_Data_Collection)
+
+
+def make_collection(rows, categories, features=5, seed=0):
+    rng = np.random.default_rng(seed)
+    length = rows // categories
+    keep = rng.random(length * categories) > 0.1
+    data = {
+        'time': np.tile(np.arange(length), categories)[keep],
+        'category': np.repeat(np.arange(categories), length)[keep],
+    }
+    for i in range(features):
+        data[f'f{i}'] = rng.standard_normal(len(data['time']))
+    return Time_Series_Data_Collection(Time_Series_Data(data, 'time'), 'time', 'category')
+
+
+def timeit(func, repeat=3):
+    best = np.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    print(f"{'rows':>10} {'categories':>10} {'pad (s)':>10} {'remove (s)':>10}")
+    for rows in [100_000, 1_000_000]:
+        for categories in [10, 100, 1_000, 5_000]:
+            tsdc = make_collection(rows, categories)
+            pad = timeit(lambda: tsdc.copy(deep=False).pad_time_index())
+            remove = timeit(lambda: tsdc.copy(deep=False).remove_different_time_index())
+            print(f"{rows:>10} {categories:>10} {pad:>10.4f} {remove:>10.4f}")
+
+
+if __name__ == '__main__':
+    main()
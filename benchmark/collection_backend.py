@@ -0,0 +1,65 @@
+"""
+benchmark of Time_Series_Data_Collection.transform backends
+
+numpy kernels release the GIL, so the persistent thread pool avoids the
+process startup and pickling cost of loky. The table shows the best of
+three runs for each backend, category count and series length.
+
+usage: python benchmark/collection_backend.py
+"""
+import time
+import numpy as np
+from time_series_transform.transform_core_api.base import (Time_Series_Data, Time_Series_Data_Collection)
+from time_series_transform.transform_core_api.util import moving_average, differencing, rfft_transform
+
+N_JOBS = 4
+BACKENDS = ['serial', 'thread_pool', 'threading', 'loky', 'memmap']
+FUNCS = {
+    'moving_average': (moving_average, {'windowSize': 20}),
+    'differencing': (differencing, {'order': 1}),
+    'rfft_transform': (rfft_transform, {'threshold': 1e3}),
+}
+
+
+def make_collection(categories, length, seed=0):
+    rng = np.random.default_rng(seed)
+    data = {
+        'time': np.tile(np.arange(length), categories),
+        'category': np.repeat(np.arange(categories), length),
+        'f0': rng.standard_normal(categories * length),
+    }
+    return Time_Series_Data_Collection(Time_Series_Data(data, 'time'), 'time', 'category', copy=False)
+
+
+def timeit(func, repeat=3):
+    best = np.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(tsdc, backend, func, kwargs):
+    if backend == 'serial':
+        return tsdc.transform('f0', 'res', func, **kwargs)
+    return tsdc.transform('f0', 'res', func, n_jobs=N_JOBS, backend=backend, **kwargs)
+
+
+def main():
+    print(f"{'function':>15} {'categories':>10} {'length':>10} " + ' '.join(f'{b:>12}' for b in BACKENDS))
+    for name, (func, kwargs) in FUNCS.items():
+        for categories in [10, 100, 1_000]:
+            for length in [1_000, 100_000]:
+                if categories * length > 10_000_000:
+                    continue
+                tsdc = make_collection(categories, length)
+                # warm up the worker processes and the thread pool
+                for backend in BACKENDS:
+                    run(tsdc, backend, func, kwargs)
+                secs = [timeit(lambda: run(tsdc, backend, func, kwargs)) for backend in BACKENDS]
+                print(f"{name:>15} {categories:>10} {length:>10} " + ' '.join(f'{s:>12.4f}' for s in secs))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+"""
+benchmark of Time_Series_Data_Collection construction
+
+The category split should scale linearly in rows regardless of
+the number of categories.
+
+usage: python benchmark/collection_split.py
+"""
+import time
+import numpy as np
+from time_series_transform.transform_core_api.base import (Time_Series_Data, Time_Series_Data_Collection)
+
+
+def make_data(rows, categories, features=5, seed=0):
+    rng = np.random.default_rng(seed)
+    data = {
+        'time': np.tile(np.arange(rows // categories), categories),
+        'category': np.repeat(np.arange(categories), rows // categories),
+    }
+    for i in range(features):
+        data[f'f{i}'] = rng.standard_normal(len(data['time']))
+    return Time_Series_Data(data, 'time')
+
+
+def timeit(func, repeat=3):
+    best = np.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    print(f"{'rows':>10} {'categories':>10} {'seconds':>10} {'us/row':>10}")
+    for rows in [100_000, 1_000_000]:
+        for categories in [10, 100, 1_000, 5_000]:
+            tsd = make_data(rows, categories)
+            sec = timeit(lambda: Time_Series_Data_Collection(tsd, 'time', 'category', copy=False))
+            print(f"{rows:>10} {categories:>10} {sec:>10.4f} {sec / rows * 1e6:>10.3f}")
+
+
+if __name__ == '__main__':
+    main()
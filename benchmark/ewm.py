@@ -0,0 +1,59 @@
+"""
+benchmark of the ewm kernel against pandas ewm
+
+ema used to build a DataFrame per call and macd called it three times, the
+table shows the best of three runs of the pandas version (DataFrame per call)
+and ewm_mean for one series per call (the per category transform) and
+for a (time, series) block.
+
+usage: python benchmark/ewm.py
+"""
+import time
+import numpy as np
+import pandas as pd
+from time_series_transform.transform_core_api.ewm import ewm_mean
+
+CALLS = 1_000
+
+
+def timeit(func, repeat=3):
+    best = np.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def pandas_macd(arr):
+    df = pd.DataFrame(arr)
+    dif = df.ewm(span=12).mean().to_numpy() - df.ewm(span=26).mean().to_numpy()
+    return dif - pd.DataFrame(dif).ewm(span=9).mean().to_numpy()
+
+
+def kernel_macd(arr):
+    dif = ewm_mean(arr, span=12) - ewm_mean(arr, span=26)
+    return dif - ewm_mean(dif, span=9)
+
+
+def main():
+    rng = np.random.default_rng(0)
+    print(f"{'case':>25} {'shape':>15} {'pandas':>10} {'ewm_mean':>10} {'speedup':>8}")
+    cases = [
+        ('ewm span=12', lambda arr: pd.DataFrame(arr).ewm(span=12).mean().to_numpy(), lambda arr: ewm_mean(arr, span=12)),
+        ('ewm com=13 adjust=False', lambda arr: pd.DataFrame(arr).ewm(com=13, adjust=False).mean().to_numpy(),
+            lambda arr: ewm_mean(arr, com=13, adjust=False)),
+        ('macd', pandas_macd, kernel_macd),
+    ]
+    for name, pandasFunc, kernelFunc in cases:
+        for length in [250, 2_500]:
+            arr = rng.standard_normal(length).cumsum()
+            secs = [timeit(lambda: [f(arr) for _ in range(CALLS)]) for f in [pandasFunc, kernelFunc]]
+            print(f"{name:>25} {f'{CALLS}x({length},)':>15} {secs[0]:>10.4f} {secs[1]:>10.4f} {secs[0] / secs[1]:>8.2f}")
+        arr = rng.standard_normal((2_500, 2_000)).cumsum(axis=0)
+        secs = [timeit(lambda: f(arr)) for f in [pandasFunc, kernelFunc]]
+        print(f"{name:>25} {str(arr.shape):>15} {secs[0]:>10.4f} {secs[1]:>10.4f} {secs[0] / secs[1]:>8.2f}")
+
+
+if __name__ == '__main__':
+    main()
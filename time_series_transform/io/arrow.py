@@ -13,7 +13,7 @@ from time_series_transform.transform_core_api.base import (
     )
 
 class Arrow_IO(io_base):
-    def __init__(self,time_series,timeSeriesCol,mainCategoryCol):
+    def __init__(self,time_series,timeSeriesCol,mainCategoryCol,copy=True):
         """
         Arrow_IO IO class for apache arrow
         
@@ -28,8 +28,10 @@ class Arrow_IO(io_base):
             index of time period column
         mainCategoryCol : str of int
             index of category column
+        copy : bool, optional
+            whether the data is copied, by default True
         """
-        super().__init__(time_series, timeSeriesCol, mainCategoryCol)
+        super().__init__(time_series, timeSeriesCol, mainCategoryCol,copy)
         if self.dictList is not None:
             self.dictList = time_series
 
@@ -42,7 +44,7 @@ class Arrow_IO(io_base):
         Time_Series_Data or Time_Series_Data_Collection
         """
         df = self.dictList.to_pandas()
-        return from_pandas(df,self.timeSeriesCol,self.mainCategoryCol)
+        return from_pandas(df,self.timeSeriesCol,self.mainCategoryCol,copy=False)
 
     def from_arrow_record_batch(self):
         """
@@ -60,8 +62,8 @@ class Arrow_IO(io_base):
                     df = v.to_pandas()
                     continue
                 df = df.append(v.to_pandas(),ignore_index = True)
-            return from_pandas(df,self.timeSeriesCol,self.mainCategoryCol)
-        return from_pandas(self.dictList.to_pandas(),self.timeSeriesCol,self.mainCategoryCol)
+            return from_pandas(df,self.timeSeriesCol,self.mainCategoryCol,copy=False)
+        return from_pandas(self.dictList.to_pandas(),self.timeSeriesCol,self.mainCategoryCol,copy=False)
 
     def to_arrow_table(self,expandCategory,expandTime,preprocessType,seperateLabels):
         """
@@ -197,7 +199,8 @@ def to_arrow_table(time_series,expandCategory,expandTime,preprocessType,seperate
     """
     aio = Arrow_IO(time_series,
                     None,
-                    None
+                    None,
+                    copy=False
                    )
     return aio.to_arrow_table(
         expandCategory= expandCategory,
@@ -234,7 +237,8 @@ def to_arrow_record_batch(time_series,max_chunksize,expandCategory,expandTime,pr
     """
     aio = Arrow_IO(time_series,
                    None,
-                   None
+                   None,
+                   copy=False
                    )
     return aio.to_arrow_record_batch(
         max_chunksize =max_chunksize,
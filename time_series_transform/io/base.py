@@ -1,4 +1,3 @@
-import copy
 from time_series_transform.transform_core_api.base import (
     Time_Series_Data,
     Time_Series_Data_Collection
@@ -6,7 +5,7 @@ from time_series_transform.transform_core_api.base import (
 import numpy as np
 
 class io_base (object):
-    def __init__(self,time_series,timeSeriesCol,mainCategoryCol):
+    def __init__(self,time_series,timeSeriesCol,mainCategoryCol,copy=True):
         """
         io_base 
         IO class
@@ -19,15 +18,20 @@ class io_base (object):
             index of time period column
         mainCategoryCol : str of int
             index of category column
+        copy : bool, optional
+            whether the data is copied. if False, Time_Series_Data input
+            shares its arrays and raw input is kept as read-only views, by default True
         """
         if isinstance(time_series,(Time_Series_Data,Time_Series_Data_Collection)):
-            self.time_series = copy.deepcopy(time_series)
+            self.time_series = time_series.copy(deep=copy)
             self.dictList = None
         else:
+            # raw input is converted into new arrays by to_single and to_collection
             self.time_series = None
-            self.dictList = copy.deepcopy(time_series)
+            self.dictList = time_series
         self.timeSeriesCol = timeSeriesCol
         self.mainCategoryCol = mainCategoryCol
+        self.copy = copy
 
     def to_single(self):
         """
@@ -42,7 +46,7 @@ class io_base (object):
         KeyError
             invalid data
         """
-        tsd = Time_Series_Data()
+        tsd = Time_Series_Data(copy=self.copy)
         if self.timeSeriesCol is None:
             raise KeyError("time series index is required")
         tsd.set_time_index(self.dictList[self.timeSeriesCol],self.timeSeriesCol)
@@ -67,8 +71,8 @@ class io_base (object):
         """
         if self.timeSeriesCol is None:
             raise KeyError("time series index is required")
-        tsd = Time_Series_Data(self.dictList,self.timeSeriesCol)
-        tsc = Time_Series_Data_Collection(tsd,self.timeSeriesCol,self.mainCategoryCol)
+        tsd = Time_Series_Data(self.dictList,self.timeSeriesCol,copy=self.copy)
+        tsc = Time_Series_Data_Collection(tsd,self.timeSeriesCol,self.mainCategoryCol,copy=False)
         return tsc
 
     def from_collection(self,expandCategory,expandTimeIx,preprocessType='ignore'):
@@ -95,7 +99,8 @@ class io_base (object):
         KeyError
             invalid key
         """
-        transCollection = copy.deepcopy(self.time_series)
+        # the preprocessing replaces arrays instead of mutating them
+        transCollection = self.time_series.copy(deep=False)
         transCollection =  transCollection.sort()
         if preprocessType == 'remove':
             transCollection = transCollection.remove_different_time_index()
@@ -1,6 +1,7 @@
 import numpy as np
 import pandas as pd
 from time_series_transform.io.base import io_base
+from time_series_transform.transform_core_api.window import Window_Array
 from time_series_transform.transform_core_api.base import (
     Time_Series_Data_Collection,
     Time_Series_Data
@@ -8,7 +9,7 @@ from time_series_transform.transform_core_api.base import (
 
 
 class Numpy_IO (io_base):
-    def __init__(self, time_series, timeSeriesColIx, mainCategoryColIx):
+    def __init__(self, time_series, timeSeriesColIx, mainCategoryColIx,copy=True):
         """
         Numpy_IO IO class for numpy data
         
@@ -20,8 +21,10 @@ class Numpy_IO (io_base):
             index of time period column
         mainCategoryCol : str of int
             index of category column
+        copy : bool, optional
+            whether the data is copied, by default True
         """
-        super().__init__(time_series, timeSeriesColIx, mainCategoryColIx)
+        super().__init__(time_series, timeSeriesColIx, mainCategoryColIx,copy)
         if self.dictList is not None:
             self.dictList = {}
             for i in range(len(time_series.T)):
@@ -65,7 +68,7 @@ class Numpy_IO (io_base):
         if isinstance(self.time_series,Time_Series_Data_Collection):
             data = self.from_collection(expandCategory,expandTime,preprocessType)
         for i in data:
-            if isinstance(data[i],np.ndarray):
+            if isinstance(data[i],(np.ndarray,Window_Array)):
                 data[i] = data[i].tolist()
         if labelList is None:
             return pd.DataFrame(data).values
@@ -80,7 +83,7 @@ class Numpy_IO (io_base):
         return pd.DataFrame(dataDict).values,pd.DataFrame(labelDict).values
 
 
-def from_numpy(numpyArray,timeSeriesCol,mainCategoryCol=None):
+def from_numpy(numpyArray,timeSeriesCol,mainCategoryCol=None,copy=True):
     """
     from_numpy transform numpy ndArray
          to Time_Series_Data or Time_Series_Data_Collection
@@ -93,6 +96,9 @@ def from_numpy(numpyArray,timeSeriesCol,mainCategoryCol=None):
         index of time period column
     mainCategoryCol : str of int
         index of category column
+    copy : bool, optional
+        whether to copy the array. if False, the columns are kept as 
+        read-only views of the array, by default True
     
     Returns
     -------
@@ -105,7 +111,7 @@ def from_numpy(numpyArray,timeSeriesCol,mainCategoryCol=None):
     """
     if not isinstance(numpyArray,np.ndarray):
         raise ValueError('input data must be numpy array')
-    numpyio = Numpy_IO(numpyArray,timeSeriesCol,mainCategoryCol)
+    numpyio = Numpy_IO(numpyArray,timeSeriesCol,mainCategoryCol,copy)
     return numpyio.from_numpy()
 
 def to_numpy(time_series_data,expandCategory,expandTime,preprocessType,seperateLabels=False):
@@ -140,14 +146,15 @@ def to_numpy(time_series_data,expandCategory,expandTime,preprocessType,seperateL
     """
     labelsList = []
     if isinstance(time_series_data,Time_Series_Data):
-        numpyio = Numpy_IO(time_series_data,time_series_data.time_seriesIx,None)
+        numpyio = Numpy_IO(time_series_data,time_series_data.time_seriesIx,None,copy=False)
         expandCategory = None
         labelsList = list(time_series_data.labels.keys())
     elif isinstance(time_series_data,Time_Series_Data_Collection):
         numpyio = Numpy_IO(
             time_series_data,
             time_series_data._time_series_Ix,
-            time_series_data._categoryIx
+            time_series_data._categoryIx,
+            copy=False
             )
         for i in time_series_data:
             print(time_series_data[i].labels)
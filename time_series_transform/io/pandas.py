@@ -1,10 +1,11 @@
 import pandas as pd
 from time_series_transform.transform_core_api.base import Time_Series_Data, Time_Series_Data_Collection
 from time_series_transform.io.base import io_base
+from time_series_transform.transform_core_api.window import Window_Array
 import numpy as np
 
 class Pandas_IO (io_base):
-    def __init__(self, time_series, timeSeriesCol, mainCategoryCol):
+    def __init__(self, time_series, timeSeriesCol, mainCategoryCol,copy=True):
         """
         Pandas_IO IO class for pandas dataFrame
         
@@ -16,8 +17,10 @@ class Pandas_IO (io_base):
             index of time period column
         mainCategoryCol : str of int
             index of category column
+        copy : bool, optional
+            whether the data is copied, by default True
         """
-        super().__init__(time_series, timeSeriesCol, mainCategoryCol)
+        super().__init__(time_series, timeSeriesCol, mainCategoryCol,copy)
         if self.dictList is not None:
             self.dictList = time_series
     
@@ -68,19 +71,19 @@ class Pandas_IO (io_base):
         if isinstance(self.time_series,Time_Series_Data):
             data = self.from_single(expandTime)
             for i in data:
-                if isinstance(data[i],np.ndarray):
+                if isinstance(data[i],(np.ndarray,Window_Array)):
                     data[i] = data[i].tolist()
             return pd.DataFrame(data)
         if isinstance(self.time_series,Time_Series_Data_Collection):
             data = self.from_collection(expandCategory,expandTime,preprocessType)
             for i in data:
-                if isinstance(data[i],np.ndarray):
+                if isinstance(data[i],(np.ndarray,Window_Array)):
                     data[i] = data[i].tolist()
             return pd.DataFrame(data)
         raise ValueError("Invalid data type")
 
 
-def from_pandas(pandasFrame,timeSeriesCol,mainCategoryCol=None):
+def from_pandas(pandasFrame,timeSeriesCol,mainCategoryCol=None,copy=True):
     """
     from_pandas         
     from_pandas transform dataFrame to 
@@ -94,12 +97,15 @@ def from_pandas(pandasFrame,timeSeriesCol,mainCategoryCol=None):
         index of time period column
     mainCategoryCol : str of int
         index of category column
+    copy : bool, optional
+        whether to copy the frame. if False, the columns are kept as 
+        read-only views of the frame, by default True
     
     Returns
     -------
     Time_Series_Data or Time_Series_Data_Collection
     """
-    pio = Pandas_IO(pandasFrame,timeSeriesCol,mainCategoryCol)
+    pio = Pandas_IO(pandasFrame,timeSeriesCol,mainCategoryCol,copy)
     return pio.from_pandas()
 
 def to_pandas(time_series_data,expandCategory,expandTime,preprocessType,seperateLabels = False):
@@ -132,7 +138,7 @@ def to_pandas(time_series_data,expandCategory,expandTime,preprocessType,seperate
     """
     labelsList = []
     if isinstance(time_series_data,Time_Series_Data):
-        pio = Pandas_IO(time_series_data,time_series_data.time_seriesIx,None)
+        pio = Pandas_IO(time_series_data,time_series_data.time_seriesIx,None,copy=False)
         expandCategory = None
         preprocessType = None
         labelsList = list(time_series_data.labels.keys())
@@ -140,7 +146,8 @@ def to_pandas(time_series_data,expandCategory,expandTime,preprocessType,seperate
         pio = Pandas_IO(
             time_series_data,
             time_series_data._time_series_Ix,
-            time_series_data._categoryIx
+            time_series_data._categoryIx,
+            copy=False
             )
         labelsList = []
         for i in time_series_data:
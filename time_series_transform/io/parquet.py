@@ -34,7 +34,8 @@ class Parquet_IO(io_base):
         version : str, optional
             parquet version, by default "1.0"
         """
-        super().__init__(time_series, timeSeriesCol, mainCategoryCol)
+        # the data is only read through arrow tables, so it is never copied
+        super().__init__(time_series, timeSeriesCol, mainCategoryCol,copy=False)
         if self.dictList is not None:
             self.dictList = time_series
         self.dirPaths = dirPaths
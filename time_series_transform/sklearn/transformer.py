@@ -65,23 +65,18 @@ class Base_Time_Series_Transformer(BaseEstimator, TransformerMixin):
         return time_series_data
 
     def _check_time_not_exist(self,timeList,categoryList):
-        checkedList = []
-        if categoryList is None:
-            for i in timeList:
-                if i not in self.time_series_cache:
-                    checkedList.append(True)
-                    continue
-                checkedList.append(False)
-        else:
-            tmpDict = collections.defaultdict(list)
-            for c,t in zip(self.category_cache,self.time_series_cache):
-                tmpDict[c].append(t)
-            for t,c in zip(timeList,categoryList):
-                if t not in tmpDict[c]:
-                    checkedList.append(True)
-                    continue
-                checkedList.append(False)
-        return checkedList
+        # one lookup on (category, time) codes factorized together with the cache
+        n = len(self.time_series_cache)
+        timeCodes,timeUniques = pd.factorize(np.concatenate([
+            np.asarray(self.time_series_cache,dtype=object),np.asarray(timeList,dtype=object)
+            ]))
+        keys = timeCodes.astype(np.int64)
+        if categoryList is not None:
+            categoryCodes,_ = pd.factorize(np.concatenate([
+                np.asarray(self.category_cache,dtype=object),np.asarray(categoryList,dtype=object)
+                ]))
+            keys = categoryCodes.astype(np.int64)*len(timeUniques)+keys
+        return (~np.isin(keys[n:],keys[:n])).tolist()
 
     def fit(self,X,y = None):
         """
@@ -139,7 +134,8 @@ class Base_Time_Series_Transformer(BaseEstimator, TransformerMixin):
         tst = Time_Series_Transformer.from_pandas(
             df,
             self.time_col,
-            self.category_col
+            self.category_col,
+            copy=False
             )
         if self.category_col is None:
             return tst,X_time,X_header,None
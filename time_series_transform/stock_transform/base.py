@@ -7,6 +7,7 @@ from time_series_transform.io.base import io_base
 from time_series_transform.io.pandas import to_pandas
 from time_series_transform.transform_core_api.util import *
 from time_series_transform.transform_core_api.base import *
+from time_series_transform.transform_core_api.executor import thread_map
 
 class Stock(Time_Series_Data):
     def __init__(self,data,time_index,symbol=None,High='High',Low='Low',Close='Close',Open='Open',Volume='Volume'):
@@ -194,17 +195,24 @@ class Portfolio(Time_Series_Data_Collection):
         verbose : int, optional
             log level (joblib), by default 0
         backend : str, optional
-            backend type (joblib), by default 'loky'
+            backend type (joblib) or 'thread_pool' (persistent thread pool), by default 'loky'
         
         Returns
         -------
         self
         """
-        dctList = Parallel(n_jobs = n_jobs,backend=backend,verbose=verbose)(delayed(self._get_techinal_indicator)(
-            c, 
-            self._time_series_data_collection[c],
-            strategy,*args,**kwargs) for c in self.time_series_data_collection
-        )
+        if backend == 'thread_pool':
+            dctList = thread_map(
+                lambda c: self._get_techinal_indicator(c,self._time_series_data_collection[c],strategy,*args,**kwargs),
+                list(self.time_series_data_collection),
+                n_jobs
+                )
+        else:
+            dctList = Parallel(n_jobs = n_jobs,backend=backend,verbose=verbose)(delayed(self._get_techinal_indicator)(
+                c, 
+                self._time_series_data_collection[c],
+                strategy,*args,**kwargs) for c in self.time_series_data_collection
+            )
         results = {}
         for i in dctList:
             results.update(i)
@@ -1,6 +1,8 @@
 from time_series_transform.transform_core_api.util import *
 from time_series_transform.transform_core_api.base import *
 from time_series_transform.io import *
+from time_series_transform.transform_core_api.rolling import (rolling_mean,rolling_min,rolling_max)
+from time_series_transform.transform_core_api.ewm import ewm_mean
 import pandas as pd
 
 def _arr_check(arr):
@@ -31,7 +33,7 @@ def macd(arr, return_diff = False):
     df['EMA_26'] = ema(arr, span=26).flatten()
 
     df['DIF'] = df['EMA_12'] - df['EMA_26']
-    df['DEM'] = ema(pd.DataFrame(df['DIF']), span=9).flatten()
+    df['DEM'] = ema(df['DIF'], span=9).flatten()
     df['OSC'] = df['DIF'] - df['DEM']
     if return_diff:
         return df['OSC']
@@ -62,12 +64,12 @@ def stochastic_oscillator(arr, window = 14):
     else:
         df = arr
     ret = {}
-    df['Low_window'] = df['Low'].rolling(window = window).min()
-    df['High_window'] = df['High'].rolling(window = window).max()
+    df['Low_window'] = rolling_min(df['Low'].to_numpy(dtype=float),window)
+    df['High_window'] = rolling_max(df['High'].to_numpy(dtype=float),window)
 
     ret['k_val'] = 100*((df['Close'] - df['Low_window']) / (df['High_window'] - df['Low_window']))
-    ret['d_val'] = np.array(ret['k_val'].rolling(window = 3).mean()).reshape(-1)
-    ret['k_val'] = np.array(ret['k_val']).reshape(-1)
+    ret['k_val'] = np.array(ret['k_val'],dtype=float).reshape(-1)
+    ret['d_val'] = rolling_mean(ret['k_val'],3)
 
     return ret
 
@@ -86,19 +88,19 @@ def rsi(arr, n_day = 14):
         Relative Strength Index of the given array
     """
     _arr_check(arr)
-    close = pd.DataFrame(arr)
-    delta = close.diff() 
-    up, down = delta.copy(), delta.copy()
+    close = np.asarray(arr,dtype=float).reshape(len(arr),-1)
+    delta = np.full(close.shape,np.nan)
+    delta[1:] = np.diff(close,axis=0)
 
-    up[up < 0] = 0
-    down[down > 0] = 0
+    up = np.where(delta < 0, 0, delta)
+    down = np.where(delta > 0, 0, delta)
     
-    roll_up = up.ewm(com=n_day - 1, adjust=False).mean()
-    roll_down = down.ewm(com=n_day - 1, adjust=False).mean().abs()
+    roll_up = ewm_mean(up, com=n_day - 1, adjust=False)
+    roll_down = np.abs(ewm_mean(down, com=n_day - 1, adjust=False))
     
-    rs = roll_up / roll_down
-
-    rsi = 100-(100/(1+rs))
+    with np.errstate(divide='ignore',invalid='ignore'):
+        rs = roll_up / roll_down
+        rsi = 100-(100/(1+rs))
     rsi = np.array(rsi).reshape(-1)
     return rsi
 
@@ -127,10 +129,9 @@ def williams_r(arr, n_day=14):
     else:
         df = arr
 
-    r_rolling = df.rolling(n_day)
-    highest = r_rolling.max()['High']
-    lowest = r_rolling.min()['Low']
-    r_val = -100 * (highest - df['Close']) / (highest - lowest)
+    highest = rolling_max(df['High'].to_numpy(dtype=float),n_day)
+    lowest = rolling_min(df['Low'].to_numpy(dtype=float),n_day)
+    r_val = -100 * (highest - df['Close'].to_numpy(dtype=float)) / (highest - lowest)
     r_val = np.array(r_val).reshape(-1)
 
     return r_val
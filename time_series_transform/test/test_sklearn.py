@@ -213,6 +213,14 @@ def collection_stock():
 
 class Test_sklearn_transformer:
 
+    def test_check_time_not_exist(self):
+        transformer = Base_Time_Series_Transformer('time','category')
+        transformer.time_series_cache = [1,2,3,1,2]
+        transformer.category_cache = ['a','a','a','b','b']
+        res = transformer._check_time_not_exist([1,3,3,4,1],['a','a','b','a','c'])
+        assert res == [False,False,True,True,True]
+        assert transformer._check_time_not_exist([1,4],None) == [False,True]
+
     def test_base_input_single(self,data_input_single):
         df = pd.DataFrame(data_input_single['train'])
         numpyData = df.values
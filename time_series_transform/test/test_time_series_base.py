@@ -2,8 +2,10 @@ import os
 import pytest
 import numpy as np
 import pandas as pd
+import pyarrow as pa
 import copy
 from time_series_transform.transform_core_api.base import (Time_Series_Data, Time_Series_Data_Collection)
+from time_series_transform.transform_core_api.executor import (Category_Executor, get_thread_pool)
 
 @pytest.fixture(scope = 'class')
 def data():
@@ -88,6 +90,23 @@ class Test_time_series_base:
         tsd.transform('d1','res',lambda x: pd.DataFrame({'res':x*2}))
         np.testing.assert_array_equal(tsd[:,['res_res']]['res_res'] , np.array([8,12,10]))
 
+    def test_time_series_base_transform_output(self):
+        tsd = Time_Series_Data({'time':[1,2,3],'d1':[4.,5.,6.],'d1_1':[1.,1.,1.]},'time')
+        tsd.transform(['d1','d1_1','d1'],'res',lambda x: x['d1']+x['d1_1']+x['d1_2'])
+        np.testing.assert_array_equal(tsd.data['res'],np.array([9.,11.,13.]))
+        outputs = [
+            pd.DataFrame({'a':[1.,2.,3.],'b':[1,2,3]}),
+            pa.table({'a':[1.,2.,3.],'b':[1,2,3]}),
+            np.array([(1.,1),(2.,2),(3.,3)],dtype=[('a','f8'),('b','i8')])
+            ]
+        for ix,output in enumerate(outputs):
+            tsd.transform('d1',f'out{ix}',lambda x: output)
+            for k in ['a','b']:
+                assert isinstance(tsd.data[f'out{ix}_{k}'],np.ndarray)
+                np.testing.assert_array_equal(tsd.data[f'out{ix}_{k}'],[1,2,3])
+        tsd.transform('d1','out',lambda x: {'c':[1,2,3]})
+        assert isinstance(tsd.data['c'],np.ndarray)
+
     def test_time_series_base_dropna(self):
         data = {
             'time':[1,2,3],
@@ -162,4 +181,349 @@ class Test_Time_Series_Collection:
         tsc = tsc.dropna()
         resd = Time_Series_Data(res,'time')
         resc = Time_Series_Data_Collection(resd,'time','category')
-        assert tsc == resc
\ No newline at end of file
+        assert tsc == resc
+class Test_Block_Storage:
+
+    def test_block_storage_slice(self):
+        data = {
+            'time':[1,2,3,4],
+            'd1':[1,2,3,4],
+            'd2':[5,6,7,8],
+            'd3':[.1,.2,.3,.4],
+            'd4':['a','b','c','d']
+        }
+        tsd = Time_Series_Data(data,'time')
+        btsd = Time_Series_Data(data,'time',blockStorage=True)
+        btsd.set_labels([1,1,0,0],'label')
+        tsd.set_labels([1,1,0,0],'label')
+        assert btsd == tsd
+        mask = [True,False,True,True]
+        for ix in [mask,slice(1,3),np.array([3,0])]:
+            res = btsd[ix]
+            expect = tsd[ix]
+            assert list(res.keys()) == list(expect.keys())
+            for k in expect:
+                np.testing.assert_array_equal(res[k],expect[k])
+        np.testing.assert_array_equal(btsd[1:,['d2']]['d2'],np.array([6,7,8]))
+        assert btsd.data._consolidated
+        assert btsd.data.nblocks == 3
+
+    def test_block_storage_row_ops(self):
+        data = {'time':[3,1,2,4],'d1':[1.,np.nan,3.,4.],'d2':[5.,6.,7.,8.],'d3':[1,2,3,4]}
+        tsd = Time_Series_Data(data,'time',blockStorage=True)
+        for res in [tsd.sort(),tsd.dropna(),tsd._take_rows(slice(1,3))]:
+            # the taken blocks are kept, one block per dtype
+            assert res.data._consolidated
+            assert res.data.nblocks == 2
+
+    def test_block_storage_mutation(self):
+        tsd = Time_Series_Data({'time':[1,2,3],'d1':[1,2,3],'d2':[4,5,6]},'time',blockStorage=True)
+        tsd.transform('d1','d3',lambda x: x*2)
+        tsd.remove('d1')
+        tsd.set_data([7,8,9],'d2')
+        res = tsd[[0,2]]
+        np.testing.assert_array_equal(res['d2'],np.array([7,9]))
+        np.testing.assert_array_equal(res['d3'],np.array([2,6]))
+        assert 'd1' not in res
+        assert tsd.data.nblocks == 1
+
+    def test_block_storage_make_writable(self):
+        tsd = Time_Series_Data({'time':[1,2,3],'a':[0,1,2]},'time',blockStorage=True)
+        tsd.set_data(np.array([3,4,5]),'b')
+        shared = tsd.copy(deep=False)
+        column = tsd.make_writable('a')
+        tsd[0:1]
+        column[0] = 99
+        assert tsd.data['a'].tolist() == [99,1,2]
+        assert shared.data['a'].tolist() == [0,1,2]
+        assert tsd.data.nblocks == 1
+
+class Test_Zero_Copy:
+
+    def test_zero_copy_single(self):
+        data = {'time':np.array([1,2,3]),'d1':np.array([1.,2.,3.])}
+        tsd = Time_Series_Data(data,'time',copy=False)
+        assert 'time' in data
+        assert np.shares_memory(tsd.data['d1'],data['d1'])
+        with pytest.raises(ValueError):
+            tsd.data['d1'][0] = 10
+        arr = tsd.make_writable('d1')
+        arr[0] = 10
+        assert data['d1'][0] == 1
+        assert tsd.data['d1'][0] == 10
+        assert not np.shares_memory(tsd.data['d1'],data['d1'])
+
+    def test_writable_time_index(self):
+        tsd = Time_Series_Data({'time':np.array([1,2,3]),'d1':np.array([1.,2.,3.])},'time',copy=False)
+        assert tsd.loc_time(2) == 1
+        tsd.make_writable('time')[1] = 5
+        assert tsd.loc_time(5) == 1 and not tsd.contains(2)
+
+    def test_zero_copy_collection(self):
+        data = {
+            'time':[1,2,1,2],
+            'data':[1,2,3,4],
+            'category':[1,1,2,2]
+        }
+        tsd = Time_Series_Data(data,'time')
+        tsc = Time_Series_Data_Collection(tsd,'time','category',copy=False)
+        assert tsc == Time_Series_Data_Collection(tsd,'time','category')
+        shallow = tsc.copy(deep=False)
+        shallow.sort(False)
+        assert list(tsc[1].time_index['time']) == [1,2]
+        assert list(shallow[1].time_index['time']) == [2,1]
+
+    def test_collection_expand_unordered(self):
+        data = {
+            'time':[1,1,2,3,2,3],
+            'data':[1,4,2,3,5,6],
+            'category':['b','a','b','b','a','a']
+        }
+        tsd = Time_Series_Data(data,'time')
+        tsd.set_labels([0,1,0,0,1,1],'label')
+        tsc = Time_Series_Data_Collection(tsd,'time','category')
+        assert sorted(tsc.time_series_data_collection.keys()) == ['a','b']
+        np.testing.assert_array_equal(tsc['a'].data['data'],np.array([4,5,6]))
+        np.testing.assert_array_equal(tsc['b'].data['data'],np.array([1,2,3]))
+        np.testing.assert_array_equal(tsc['a'].labels['label'],np.array([1,1,1]))
+        assert 'category' not in tsc['a'].data
+
+class Test_Dropna:
+
+    def test_dropna_options(self):
+        data = {
+            'time':[1,2,3,4],
+            'd1':[np.nan,2,np.nan,4],
+            'd2':[np.nan,2,3,np.nan],
+            'd3':['a',None,'c','d']
+        }
+        tsd = Time_Series_Data(data,'time')
+        assert list(tsd.dropna().time_index['time']) == []
+        assert list(tsd.dropna(subset=['d1','d2']).time_index['time']) == [2]
+        assert list(tsd.dropna(how='all',subset=['d1','d2']).time_index['time']) == [2,3,4]
+        assert list(tsd.dropna(thresh=2).time_index['time']) == [2,3,4]
+        with pytest.raises(ValueError):
+            tsd.dropna(how='some')
+
+    def test_dropna_sequence(self):
+        tsd = Time_Series_Data({'time':[1,2,3],'d1':[1,2,3]},'time')
+        tsd.set_data(np.array([[np.nan,np.nan],[np.nan,1],[1,2]]),'seq')
+        tsd.set_labels(np.array([[1,2],[1,2,3],[np.nan]],dtype=object),'ragged')
+        res = tsd.dropna(subset=['seq'])
+        np.testing.assert_array_equal(res.data['d1'],np.array([3]))
+        res = tsd.dropna(subset=['ragged'])
+        np.testing.assert_array_equal(res.data['d1'],np.array([1,2]))
+        assert 'ragged' in res.labels
+
+class Test_Sort:
+
+    def test_sort_stable(self):
+        tsd = Time_Series_Data({'time':[2,1,2,3,1],'d1':[1,2,3,4,5]},'time')
+        tsd.set_labels(['a','b','c','d','e'],'l1')
+        assert not tsd.is_sorted
+        tsd.sort(False)
+        np.testing.assert_array_equal(tsd.data['d1'],np.array([4,1,3,2,5]))
+        np.testing.assert_array_equal(tsd.labels['l1'],np.array(['d','a','c','b','e']))
+        tsd.sort()
+        assert tsd.is_sorted
+        np.testing.assert_array_equal(tsd.time_index['time'],np.array([1,1,2,2,3]))
+        np.testing.assert_array_equal(tsd.data['d1'],np.array([2,5,1,3,4]))
+
+    def test_sort_skip_sorted(self):
+        tsd = Time_Series_Data({'time':[1,2,3],'d1':[1,2,3]},'time')
+        data = tsd.data['d1']
+        assert tsd.is_sorted
+        tsd.sort()
+        assert tsd.data['d1'] is data
+        tsd.set_time_index([3,2,1],'time')
+        assert not tsd.is_sorted
+
+class Test_Time_Lookup:
+
+    def test_loc_time(self):
+        tsd = Time_Series_Data({'time':[3,1,4,2],'d1':[30,10,40,20]},'time')
+        assert tsd.loc_time(4) == 2
+        assert tsd.loc_time(5) == -1
+        np.testing.assert_array_equal(tsd.loc_time([1,5,2]),np.array([1,-1,3]))
+        np.testing.assert_array_equal(tsd.contains([0,3,2]),np.array([False,True,True]))
+        tsd.sort()
+        np.testing.assert_array_equal(tsd.loc_time([1,5,2]),np.array([0,-1,1]))
+
+    def test_slice_time(self):
+        tsd = Time_Series_Data({'time':[3,1,4,2],'d1':[30,10,40,20]},'time')
+        res = tsd.slice_time(2,3)
+        np.testing.assert_array_equal(res.data['d1'],np.array([30,20]))
+        tsd.sort()
+        res = tsd.slice_time(start=2)
+        np.testing.assert_array_equal(res.data['d1'],np.array([20,30,40]))
+        assert res.is_sorted
+        assert tsd.slice_time(5,6).time_length == 0
+
+class Test_Alignment:
+
+    def _collection(self):
+        tsd = Time_Series_Data({
+            'time':[3,1,1,2],
+            'category':['a','a','b','b'],
+            'd1':[30,10,11,21],
+            'd2':['p','q','r','s']
+            },'time')
+        return Time_Series_Data_Collection(tsd,'time','category')
+
+    def test_pad_typed(self):
+        tsdc = self._collection().pad_time_index()
+        np.testing.assert_array_equal(tsdc['a'].time_index['time'],np.array([1,2,3]))
+        np.testing.assert_array_equal(tsdc['a'].data['d1'],np.array([10,np.nan,30]))
+        assert tsdc['a'].data['d1'].dtype == np.float64
+        assert list(tsdc['b'].data['d2']) == ['r','s',np.nan]
+
+    def test_pad_calendar(self):
+        tsdc = self._collection().pad_time_index(calendar=[0,1,2])
+        np.testing.assert_array_equal(tsdc['b'].time_index['time'],np.array([0,1,2]))
+        np.testing.assert_array_equal(tsdc['b'].data['d1'],np.array([np.nan,11,21]))
+
+    def test_remove_calendar(self):
+        tsdc = self._collection().remove_different_time_index(calendar=[1,2])
+        np.testing.assert_array_equal(tsdc['a'].data['d1'],np.array([10]))
+        tsdc = self._collection().remove_different_time_index(calendar=[2])
+        assert tsdc['a'].time_length == tsdc['b'].time_length == 0
+
+class Test_Panel:
+
+    def _collection(self):
+        tsd = Time_Series_Data({
+            'time':[1,2,1,2,1,2],
+            'category':['a','a','b','b','c','c'],
+            'd1':[1,4,2,5,3,6],
+            'l1':['x','y','x','y','x','y']
+            },'time')
+        tsd.set_labels(tsd.data['l1'],'l1')
+        tsd.remove('l1','data')
+        return Time_Series_Data_Collection(tsd,'time','category')
+
+    def test_round_trip(self):
+        tsdc = self._collection()
+        panel = tsdc.to_panel()
+        assert panel.shape == (3,2,1)
+        assert panel.category_index == ['a','b','c']
+        np.testing.assert_array_equal(panel['d1'],np.array([[1,4],[2,5],[3,6]]))
+        assert panel.labels.shape == (3,2,1)
+        assert panel.to_collection() == tsdc
+
+    def test_transform_axis(self):
+        panel = self._collection().to_panel()
+        panel.transform('d1','demean',lambda x,axis: x - x.mean(axis=axis,keepdims=True),axis=0)
+        np.testing.assert_array_equal(panel['demean'],np.array([[-1.,-1.],[0.,0.],[1.,1.]]))
+        tsdc = panel.to_collection()
+        np.testing.assert_array_equal(tsdc['c'].data['demean'],np.array([1.,1.]))
+
+    def test_feature_growth(self):
+        panel = self._collection().to_panel()
+        panel.transform('d1','lag',lambda x: np.stack([x*i for i in range(6)],axis=-1))
+        buffer = panel.values.base
+        assert buffer.shape[2] > panel.shape[2] == 7
+        panel.set_feature(panel['d1']*10,'d2')
+        # the spare capacity is filled in place
+        assert panel.values.base is buffer
+        np.testing.assert_array_equal(panel['lag_5'],panel['d1']*5)
+        np.testing.assert_array_equal(panel['d2'],panel['d1']*10)
+
+    def test_to_collection_copy_on_write(self):
+        panel = self._collection().to_panel()
+        tsdc = panel.to_collection()
+        assert not tsdc['a'].data['d1'].flags.writeable
+        tsdc['a'].make_writable('d1')[:] = 0
+        np.testing.assert_array_equal(panel['d1'],np.array([[1,4],[2,5],[3,6]]))
+
+    def test_not_aligned(self):
+        tsd = Time_Series_Data({'time':[1,2,1],'category':['a','a','b'],'d1':[1,2,3]},'time')
+        with pytest.raises(ValueError):
+            Time_Series_Data_Collection(tsd,'time','category').to_panel()
+
+    def test_different_features(self):
+        tsdc = self._collection()
+        tsdc['b'].set_data(np.array([7,8]),'d2')
+        with pytest.raises(ValueError,match='d2 of category b'):
+            tsdc.to_panel()
+        tsdc['b'].remove('d2')
+        tsdc['c'].remove('d1')
+        with pytest.raises(ValueError,match='d1 does not exist in category c'):
+            tsdc.to_panel()
+
+class Test_Cross_Sectional_Transform:
+
+    def test_rank(self):
+        tsd = Time_Series_Data({
+            'time':[2,1,1,2,1],
+            'category':['a','a','b','b','c'],
+            'd1':[5.,1.,3.,4.,2.]
+            },'time')
+        tsdc = Time_Series_Data_Collection(tsd,'time','category')
+        tsdc.cross_sectional_transform('d1','rank',lambda x: np.argsort(np.argsort(x,axis=1),axis=1))
+        np.testing.assert_array_equal(tsdc['a'].data['rank'],np.array([1,0]))
+        np.testing.assert_array_equal(tsdc['c'].data['rank'],np.array([1]))
+
+    def test_multi_input(self):
+        tsd = Time_Series_Data({
+            'time':[1,2,1,2],
+            'category':['a','a','b','b'],
+            'd1':[1.,2.,3.,4.],
+            'd2':[1.,1.,2.,2.]
+            },'time')
+        tsdc = Time_Series_Data_Collection(tsd,'time','category')
+        tsdc.cross_sectional_transform(['d1','d2'],'res',lambda x: {'sum':x.sum(axis=-1),'share':x[:,:,0]/x[:,:,0].sum(axis=1,keepdims=True)})
+        np.testing.assert_array_equal(tsdc['b'].data['res_sum'],np.array([5.,6.]))
+        np.testing.assert_array_equal(tsdc['a'].data['res_share'],np.array([0.25,1/3]))
+
+
+class Test_Parallel_Transform:
+
+    def _collection(self,blockStorage=False):
+        tsd = Time_Series_Data({
+            'time':np.tile(np.arange(5),6),
+            'category':np.repeat(np.arange(6),5),
+            'd1':np.arange(30,dtype=float),
+            'd2':np.arange(30,dtype=float)*2
+            },'time',blockStorage=blockStorage)
+        return Time_Series_Data_Collection(tsd,'time','category')
+
+    def test_same_as_serial(self):
+        serial = self._collection().transform('d1','cumsum',np.cumsum)
+        parallel = self._collection().transform('d1','cumsum',np.cumsum,n_jobs=2,backend='threading')
+        for c in serial:
+            assert list(parallel[c].data.keys()) == ['d1','d2','cumsum']
+            np.testing.assert_array_equal(parallel[c].data['cumsum'],serial[c].data['cumsum'])
+
+    def test_batch(self):
+        tsdc = self._collection(blockStorage=True)
+        executor = Category_Executor(n_jobs=2,backend='threading',batchSize=4)
+        assert executor._batches(list(tsdc),2) == [[0,1,2],[3,4,5]]
+        executor.transform(tsdc,['d1','d2'],'sum',lambda x: x['d1']+x['d2'])
+        np.testing.assert_array_equal(tsdc[1].data['sum'],np.arange(5,10)*3.)
+        np.testing.assert_array_equal(tsdc[1].data['d2'],np.arange(5,10)*2.)
+
+    def test_memmap(self,tmp_path):
+        serial = self._collection().transform('d1','d1',lambda x: {'sum':np.cumsum(x),'sign':np.sign(x).astype(int)})
+        tsdc = self._collection()
+        executor = Category_Executor(n_jobs=2,backend='memmap',tempFolder=str(tmp_path))
+        executor.transform(tsdc,'d1','d1',lambda x: {'sum':np.cumsum(x),'sign':np.sign(x).astype(int)})
+        for c in serial:
+            assert serial[c] == tsdc[c]
+            assert tsdc[c].data['sign'].dtype == serial[c].data['sign'].dtype
+        assert list(tmp_path.iterdir()) == []
+
+    def test_memmap_block_storage(self,tmp_path):
+        serial = self._collection().transform('d1','cumsum',np.cumsum)
+        tsdc = self._collection(blockStorage=True)
+        executor = Category_Executor(n_jobs=2,backend='memmap',tempFolder=str(tmp_path))
+        executor.transform(tsdc,'d1','cumsum',np.cumsum)
+        for c in serial:
+            # the untouched columns are not written back from the output files
+            assert serial[c] == tsdc[c]
+
+    def test_thread_pool(self):
+        serial = self._collection().transform('d1','cumsum',np.cumsum)
+        tsdc = self._collection().transform('d1','cumsum',np.cumsum,n_jobs=2,backend='thread_pool')
+        for c in serial:
+            assert serial[c] == tsdc[c]
+        assert get_thread_pool(2) is get_thread_pool(2)
@@ -6,6 +6,16 @@ from time_series_transform.transform_core_api import *
 from time_series_transform.transform_core_api.util import *
 from time_series_transform.transform_core_api.base import *
 from time_series_transform.transform_core_api.time_series_transformer import *
+from time_series_transform.transform_core_api.time_series_transformer import (make_shift,make_lag_sequnece)
+from time_series_transform.transform_core_api.window import Window_Array
+from time_series_transform.transform_core_api.rolling import (
+    rolling_sum,rolling_mean,rolling_var,rolling_min,rolling_max,rolling_median,rolling_gmean,
+    rolling_quantile,rolling_count)
+from time_series_transform.transform_core_api.ewm import (ewm_mean,_ewm_recurrence)
+from time_series_transform.transform_core_api.difference import (difference,difference_weights,fractional_difference,fractional_weights)
+from time_series_transform.transform_core_api.acceleration import (KERNELS,set_numba,use_numba)
+from time_series_transform.transform_core_api.streaming import (
+    Streaming_Kernel,Streaming_Moving_Average,Streaming_EMA,Streaming_Differencing,Streaming_Geometric_MA)
 import pyarrow as pa
 import os
 
@@ -307,6 +317,15 @@ class Test_time_series_transform:
         df = tst.to_pandas()
         pd.testing.assert_frame_equal(df,expectDf,False)
 
+    def test_negative_shift(self,dictList_single):
+        for lazy in [False,True]:
+            tst = Time_Series_Transformer(dictList_single,'time',None,lazy=lazy)
+            with pytest.raises(ValueError,match='lagNum'):
+                tst.make_lag('data',-1,'_lag_')
+            with pytest.raises(ValueError,match='leadNum'):
+                tst.make_lead('data',[1,-2],'_lead_')
+            assert list(tst.to_pandas().columns) == list(dictList_single.keys())
+
     def test_single_lag_sequence(self,dictList_single,expect_single_lag_sequence):
         data = dictList_single
         expectDf = pd.DataFrame(expect_single_lag_sequence)
@@ -418,6 +437,369 @@ class Test_time_series_transform:
         assert df.data.tolist() == data['data']
 
 
+    def test_collection_cross_sectional_transform(self,dictList_collection):
+        data = dictList_collection
+        tst = Time_Series_Transformer(data,'time','category')
+        tst.cross_sectional_transform('data','data_demean',lambda x: x - np.nanmean(x,axis=1,keepdims=True))
+        df = tst.to_pandas()
+        np.testing.assert_array_equal(df['data_demean'].values,np.array([0.,0.,0.,0.]))
+
+    def test_collection_multi_lag(self,dictList_collection):
+        data = dictList_collection
+        tst = Time_Series_Transformer(data,'time','category')
+        tst.make_lag('data',range(0,3),'_lag_')
+        tst.make_lead('data',[1],'_lead_')
+        df = tst.to_pandas()
+        np.testing.assert_array_equal(df['data_lag_0'].values,np.array([1,2,1,2]))
+        np.testing.assert_array_equal(df['data_lag_1'].values,np.array([np.nan,1,np.nan,1]))
+        np.testing.assert_array_equal(df['data_lag_2'].values,np.array([np.nan]*4))
+        np.testing.assert_array_equal(df['data_lead_1'].values,np.array([2,np.nan,2,np.nan]))
+
+    def test_make_shift_dtype(self):
+        res = make_shift(np.array([1,2,3],dtype=np.int32),[1,-1],0)
+        assert res.dtype == np.int32
+        np.testing.assert_array_equal(res,np.array([[0,1,2],[2,3,0]]))
+        res = make_shift(np.array(['a','b']),[1],np.nan)
+        assert res.dtype == object and res[0,1] == 'a'
+
+    def test_window_array(self):
+        data = np.arange(6,dtype=float)
+        data[4] = np.nan
+        window = make_lag_sequnece(data,3,1,np.nan)
+        assert isinstance(window,Window_Array)
+        assert window.shape == (6,3) and window.base.size == 9
+        expect = np.array([[np.nan]*3,[np.nan]*3,[np.nan,0,1],[0,1,2],[1,2,3],[2,3,np.nan]])
+        np.testing.assert_array_equal(np.asarray(window),expect)
+        np.testing.assert_array_equal(np.asarray(window[2:5]),expect[2:5])
+        np.testing.assert_array_equal(window[[5,0]],expect[[5,0]])
+        np.testing.assert_array_equal(window.nan_row_mask(),np.isnan(expect).any(axis=1))
+        assert not window.window_view().flags.writeable
+
+    def test_window_array_dropna(self):
+        data = np.arange(10,dtype=float)
+        tst = Time_Series_Transformer({'time':np.arange(10),'data':data},'time')
+        tst.make_lag_sequence('data',3,1,'_lag_seq_')
+        res = tst.time_series_data.dropna()
+        window = res.data['data_lag_seq_3']
+        # the leading incomplete windows are a slice of the base
+        assert isinstance(window,Window_Array) and np.shares_memory(window.base,tst.time_series_data.data['data_lag_seq_3'].base)
+        expect = np.lib.stride_tricks.sliding_window_view(data,3)[:-1]
+        np.testing.assert_array_equal(np.asarray(window),expect)
+        # the other rows are mapped instead of being materialized
+        taken = window[[6,0,3]]
+        assert isinstance(taken,Window_Array) and np.shares_memory(taken.base,window.base)
+        np.testing.assert_array_equal(np.asarray(taken),expect[[6,0,3]])
+        np.testing.assert_array_equal(np.asarray(taken[1:]),expect[[0,3]])
+        np.testing.assert_array_equal(taken[0],expect[6])
+        data[5] = np.nan
+        tst = Time_Series_Transformer({'time':np.arange(10),'data':data},'time')
+        tst.make_lag_sequence('data',3,1,'_lag_seq_')
+        window = tst.time_series_data.dropna().data['data_lag_seq_3']
+        assert isinstance(window,Window_Array) and not window.nan_row_mask().any()
+        np.testing.assert_array_equal(np.asarray(window),expect[[0,1,6]])
+
+    def test_collection_sequence_tensor(self,dictList_collection):
+        data = dictList_collection
+        tst = Time_Series_Transformer(data,'time','category')
+        tst.make_lead('data',1,'_lead_')
+        tst.make_sequence_tensor(['data','data_lead_1'],'tensor',2,0)
+        tensor = tst.time_series_data[2].data['tensor']
+        assert tensor.dtype == np.float32 and tensor.shape == (2,2,2)
+        np.testing.assert_array_equal(tensor,np.array([[[np.nan,np.nan],[np.nan,np.nan]],[[1,2],[2,np.nan]]]))
+
+    def test_lazy_plan(self,dictList_collection):
+        data = dictList_collection
+        eager = Time_Series_Transformer(data,'time','category')
+        lazy = Time_Series_Transformer(data,'time','category',lazy=True)
+        for tst in [eager,lazy]:
+            tst.make_lag('data',1,'_lag_').make_lead('data',1,'_lead_').make_lag('data',2,'_lag_')
+            tst.make_lag_sequence('data',2,1,'_lag_seq_').make_lead_sequence('data',2,1,'_lead_seq_')
+            tst.make_lag('data',3,'_unused_')
+            tst.remove_feature('data_unused_3')
+        plan = lazy.explain()
+        assert 'fused_shift(data) -> data_lag_1, data_lead_1, data_lag_2' in plan
+        assert 'fused_window(data)' in plan
+        assert '_unused_' not in plan.split('remove')[0]
+        pd.testing.assert_frame_equal(lazy.to_pandas(),eager.to_pandas())
+        assert len(lazy.explain()) == 0
+
+    def test_lazy_overwrite_order(self,dictList_collection):
+        data = dictList_collection
+        eager = Time_Series_Transformer(data,'time','category')
+        lazy = Time_Series_Transformer(data,'time','category',lazy=True)
+        for tst in [eager,lazy]:
+            tst.make_lag('data',1,'_lag_').make_lead('data',1,'_lead_')
+            tst.make_lag('data',1,'_lag_',fillMissing=0)
+            tst.transform('data','double',lambda x: x*2)
+            tst.make_lead('data',1,'_lead_',fillMissing=0)
+        for k in eager.time_series_data:
+            assert list(lazy.time_series_data[k].data.keys()) == list(eager.time_series_data[k].data.keys())
+        pd.testing.assert_frame_equal(lazy.to_pandas(),eager.to_pandas())
+
+    def test_append(self):
+        rng = np.random.default_rng(0)
+        data = {
+            'time':np.tile(np.arange(10),2),
+            'category':np.repeat(['a','b'],10),
+            'data':rng.standard_normal(20)
+            }
+        def build(d,lazy=False):
+            tst = Time_Series_Transformer(d,'time','category',lazy=lazy)
+            tst.make_lag('data',[1,2]).make_lead('data',2).make_lag_sequence('data',3,1)
+            tst.make_stack_sequence(['data3'],'stack')
+            tst.transform('data','ma',moving_average,windowSize=3,appendLookback=2)
+            tst.transform('data','cumsum',np.cumsum)
+            tst.make_sequence_tensor(['data','data1'],'tensor',3,-1)
+            return tst.remove_feature('data2')
+        expected = build(data).to_pandas()
+        for lazy in [False,True]:
+            tst = build({k:v[np.tile(np.arange(10) < 7,2)] for k,v in data.items()},lazy)
+            tst.append({k:v[np.tile(np.arange(10) >= 7,2)] for k,v in data.items()})
+            res = tst.to_pandas()
+            pd.testing.assert_frame_equal(res.drop(columns='ma'),expected.drop(columns='ma'))
+            np.testing.assert_allclose(res['ma'],expected['ma'])
+
+    def test_append_keyword_names(self):
+        # lookback and lookahead are passed to the function, not taken by append
+        def shift(arr,lookback):
+            res = np.full(len(arr),np.nan)
+            res[lookback:] = arr[:-lookback]
+            return res
+        tst = Time_Series_Transformer({'time':np.arange(5),'data':np.arange(5.)},'time',None)
+        tst.transform('data','shift',shift,lookback=2,appendLookback=2)
+        tst.append({'time':[5,6],'data':[5.,6.]})
+        np.testing.assert_array_equal(tst.time_series_data.data['shift'],[np.nan,np.nan,0.,1.,2.,3.,4.])
+
+    def test_append_lead_sequence(self):
+        data = {'time':np.arange(12),'data':np.arange(12.)}
+        def build(d):
+            tst = Time_Series_Transformer(d,'time',None)
+            tst.make_lead_sequence('data',3,1,'_lead')
+            tst.make_stack_sequence(['data_lead3'],'stack')
+            return tst.make_lag('data_lead3',1,'_lag')
+        expected = build(data).to_pandas()
+        tst = build({k:v[:8] for k,v in data.items()})
+        tst.append({k:v[8:] for k,v in data.items()})
+        pd.testing.assert_frame_equal(tst.to_pandas(),expected)
+
+    def test_time_series_data_append(self):
+        tsd = Time_Series_Data({'time':[1,2],'data':[1,2]},'time')
+        tsd.set_labels(['a','b'],'label')
+        shared = tsd.copy(deep=False)
+        for i in range(3,100):
+            tsd.append({'time':[i],'data':[i],'label':['c']})
+        assert tsd._buffers[('data','data')].capacity < 200
+        tsd.append({'time':[100],'data':[0.5]})
+        np.testing.assert_array_equal(tsd.data['data'][-2:],[99.,0.5])
+        assert tsd.labels['label'][-1] is np.nan
+        assert shared.time_length == 2 and shared.data['data'].tolist() == [1,2]
+
+    def test_append_shared_tail(self):
+        tst = Time_Series_Transformer({'time':np.arange(5),'data':np.arange(5.)},'time')
+        tst.append({'time':[5],'data':[5.]})
+        tst.make_lead('data',1,'_lead')
+        # the lead column is a growable view after append, the shallow copy shares it
+        tst.append({'time':[6],'data':[6.]})
+        shared = tst.time_series_data.copy(deep=False)
+        tst.append({'time':[7],'data':[7.]})
+        np.testing.assert_array_equal(tst.time_series_data.data['data_lead1'],[1,2,3,4,5,6,7,np.nan])
+        np.testing.assert_array_equal(shared.data['data_lead1'],[1,2,3,4,5,6,np.nan])
+
+    def test_block_storage_append(self):
+        tsd = Time_Series_Data({'time':[1,2],'data':[1.,2.],'other':[3.,4.]},'time',blockStorage=True)
+        shared = tsd.copy(deep=False)
+        tsd.append({'time':[3],'data':[3.],'other':[5.]})
+        buffer, = tsd.data._buffers.values()
+        for i in range(4,100):
+            tsd.append({'time':[i],'data':[float(i)],'other':[0.]})
+        # the block is extended in place instead of recopying the columns
+        assert tsd.data._buffers[tsd.data._items['data'][0]] is buffer
+        assert buffer.capacity < 200 and tsd.data.nblocks == 1
+        np.testing.assert_array_equal(tsd.data['data'],np.arange(1,100))
+        np.testing.assert_array_equal(shared.data['data'],[1.,2.])
+        tsd.append({'time':[100],'data':[1],'other':['a']})
+        assert tsd.data['other'][-1] == 'a' and tsd.data['data'][-1] == 1.
+
+    def test_block_storage_transformer_append(self):
+        data = {'time':np.arange(10),'data':np.arange(10.),'other':np.arange(10.)}
+        expected = Time_Series_Transformer({k:np.append(v,10.) for k,v in data.items()},'time')
+        expected.make_lag('data',1,'_lag').make_lead('data',1,'_lead')
+        tst = Time_Series_Transformer(Time_Series_Data(data,'time',blockStorage=True),'time')
+        tst.make_lag('data',1,'_lag').make_lead('data',1,'_lead')
+        tst.append({'time':[10],'data':[10.],'other':[10.]})
+        shared = tst.time_series_data.copy(deep=False)
+        tst.append({'time':[11],'data':[11.],'other':[11.]})
+        # the block shared with the copy is copied once
+        tst.append({'time':[12],'data':[12.],'other':[12.]})
+        tsd = tst.time_series_data
+        base = tsd.data['other'].base
+        tst.append({'time':[13],'data':[13.],'other':[13.]})
+        # neither the append nor the update of lag and lead copies the block
+        assert tsd.data['other'].base is base and tsd.data['data_lead1'].base is base
+        assert tsd.data.nblocks == 1 and list(tsd.data) == ['data','other','data_lag1','data_lead1']
+        np.testing.assert_array_equal(tsd.data['data_lead1'],np.append(np.arange(1.,14),np.nan))
+        for k in ['data_lag1','data_lead1']:
+            np.testing.assert_array_equal(shared.data[k],expected.time_series_data.data[k])
+
+    def test_streaming(self):
+        arr = np.random.default_rng(0).standard_normal(200).cumsum()+50
+        withNan = arr.copy()
+        withNan[[0,5,50]] = np.nan
+        np.testing.assert_array_equal(Streaming_Moving_Average(5)(arr),moving_average(arr,5))
+        np.testing.assert_array_equal(Streaming_Differencing(2)(arr),differencing(arr,2))
+        np.testing.assert_allclose(Streaming_Geometric_MA(5)(arr),geometric_ma(arr,5).to_numpy(),rtol=1e-12)
+        for kwargs in [{'span':5},{'alpha':0.3,'adjust':False},{'halflife':3,'ignore_na':True,'min_periods':4}]:
+            np.testing.assert_allclose(Streaming_EMA(**kwargs)(withNan),pd.Series(withNan).ewm(**kwargs).mean().to_numpy(),rtol=1e-12)
+        with pytest.raises(TypeError):
+            Streaming_Kernel()
+        kernel = Streaming_Moving_Average(5)
+        res = np.append(kernel.update_batch(arr[:100]),[kernel.update(i) for i in arr[100:]])
+        np.testing.assert_array_equal(res,moving_average(arr,5))
+        # the log sum does not drift over a long stream
+        arr = np.exp(np.random.default_rng(0).standard_normal(100000)*30)
+        arr[-5:] = 1.
+        assert Streaming_Geometric_MA(5)(arr)[-1] == 1.
+
+    def test_ewm(self):
+        arr = np.random.default_rng(0).standard_normal((300,4)).cumsum(axis=0)
+        arr[:3,1] = np.nan
+        arr[[50,51,90],2] = np.nan
+        arr[:,3] = np.nan
+        for kwargs in [
+            {'span':5},{'com':13,'adjust':False},{'alpha':0.3,'adjust':False,'ignore_na':True},
+            {'halflife':3,'ignore_na':True,'min_periods':4},{'span':12,'min_periods':30},{'alpha':1.}
+            ]:
+            expected = pd.DataFrame(arr).ewm(**kwargs).mean().to_numpy()
+            np.testing.assert_allclose(ewm_mean(arr,**kwargs),expected,rtol=1e-12,atol=1e-12)
+            np.testing.assert_allclose(ewm_mean(arr.T,axis=1,**kwargs),expected.T,rtol=1e-12,atol=1e-12)
+        assert ema(arr[:,0],span=5).shape == (300,1)
+        with pytest.raises(ValueError):
+            ewm_mean(arr,span=5,alpha=0.3)
+
+    def test_difference(self):
+        arr = np.random.default_rng(0).standard_normal((300,2)).cumsum(axis=0)
+        arr[100,0] = np.nan
+        for order,lag in [(1,1),(3,1),(1,12),(2,5),(400,1)]:
+            expected = arr.copy()
+            for _ in range(order):
+                expected = np.concatenate([np.full((lag,2),np.nan),expected[lag:]-expected[:-lag]])[:len(arr)]
+            np.testing.assert_allclose(difference(arr,order,lag),expected,atol=1e-9)
+            np.testing.assert_array_equal(Streaming_Differencing(order,lag)(arr[:,1]),difference(arr[:,1],order,lag))
+        np.testing.assert_allclose(differencing(arr[:,1],2),np.append([np.nan]*2,np.diff(arr[:,1],2)))
+        weights = fractional_weights(0.4,1e-3)
+        assert np.abs(weights[-1]) >= 1e-3 and len(fractional_weights(0.4,window=5)) == 5
+        res = fractional_difference(arr,0.4,1e-3)
+        span = len(weights)-1
+        assert np.isnan(res[:span]).all()
+        np.testing.assert_allclose(res[span+5,1],weights@arr[span+5::-1,1][:len(weights)])
+        data = Time_Series_Data({'time':np.arange(300),'a':arr[:,0],'b':arr[:,1]},'time')
+        data.transform(['a','b'],'seasonal',difference,1,12)
+        np.testing.assert_allclose(data.data['seasonal_b'],difference(arr[:,1],1,12))
+
+    def test_acceleration_kernels(self):
+        # the python source of numba kernels
+        arr = np.random.default_rng(0).random((100,3))
+        arr[[0,10,11,40],0] = np.nan
+        arr[:,2] = np.nan
+        for window,minPeriods in [(1,1),(5,5),(5,2),(200,1)]:
+            np.testing.assert_array_equal(KERNELS['rolling_extreme'](arr,window,minPeriods,False),rolling_min(arr,window,minPeriods))
+            np.testing.assert_array_equal(KERNELS['rolling_extreme'](arr,window,minPeriods,True),rolling_max(arr,window,minPeriods))
+        for alpha,adjust,ignoreNa in [(0.3,True,False),(0.3,False,False),(0.1,False,True)]:
+            np.testing.assert_allclose(KERNELS['ewm'](arr,alpha,adjust,ignoreNa),_ewm_recurrence(arr,alpha,adjust,ignoreNa),rtol=1e-14)
+        for order in [1,3,200]:
+            np.testing.assert_array_equal(KERNELS['differencing'](arr,difference_weights(order),2),difference(arr,order,2))
+
+    def test_numba_parity(self):
+        pytest.importorskip('numba')
+        arr = np.random.default_rng(0).standard_normal((300,3)).cumsum(axis=0)
+        arr[[0,50,51],0] = np.nan
+        funcs = [
+            lambda x: rolling_min(x,20,5),lambda x: rolling_max(x,20),
+            lambda x: ewm_mean(x,com=13,adjust=False),lambda x: ewm_mean(x,span=5,ignore_na=True),
+            lambda x: differencing(x[:,1],4)
+            ]
+        enabled = use_numba()
+        try:
+            for func in funcs:
+                set_numba(False)
+                expected = func(arr)
+                set_numba(True)
+                np.testing.assert_allclose(func(arr),expected,rtol=1e-12)
+            for enabled in [False,True]:
+                set_numba(enabled)
+                np.testing.assert_array_equal(Streaming_Differencing(4,2)(arr[:,1]),differencing(arr[:,1],4,2))
+        finally:
+            set_numba(enabled)
+
+    def test_rolling(self):
+        arr = np.random.default_rng(0).random((100,2))+0.1
+        arr[[0,10,11,40],0] = np.nan
+        for window,minPeriods in [(1,None),(5,None),(5,2),(200,1)]:
+            rolling = pd.DataFrame(arr).rolling(window,min_periods=minPeriods)
+            for func,expected in [
+                (rolling_sum,rolling.sum),(rolling_mean,rolling.mean),(rolling_var,rolling.var),
+                (rolling_min,rolling.min),(rolling_max,rolling.max),(rolling_median,rolling.median)
+                ]:
+                np.testing.assert_allclose(func(arr,window,minPeriods),expected().to_numpy(),rtol=1e-9,atol=1e-12)
+        gmean = np.exp(pd.DataFrame(np.log(arr)).rolling(5).mean().to_numpy())
+        np.testing.assert_allclose(rolling_gmean(arr,5),gmean)
+        np.testing.assert_array_equal(rolling_gmean(np.array([1.,0.,4.,-1.]),2),[np.nan,0.,0.,np.nan])
+
+    def test_rolling_inf(self):
+        arr = np.array([1.,np.inf,1.,1.,1.,1.])
+        np.testing.assert_array_equal(rolling_sum(arr,2),[np.nan,np.inf,np.inf,2.,2.,2.])
+        np.testing.assert_array_equal(rolling_mean(arr,2),[np.nan,np.inf,np.inf,1.,1.,1.])
+        np.testing.assert_array_equal(rolling_var(arr,2),[np.nan,np.nan,np.nan,0.,0.,0.])
+        arr = np.array([1.,np.inf,-np.inf,1.,1.])
+        np.testing.assert_array_equal(rolling_sum(arr,2),[np.nan,np.inf,np.nan,-np.inf,2.])
+
+    def test_rolling_empty(self):
+        for arr in [np.array([]),np.empty((0,2))]:
+            for func in [
+                rolling_sum,rolling_mean,rolling_var,rolling_min,rolling_max,
+                rolling_median,rolling_gmean,rolling_count,lambda x,w: rolling_quantile(x,w,0.5)
+                ]:
+                res = func(arr,3)
+                assert res.shape == arr.shape
+
+    def test_rolling_long_series(self):
+        arr = 1e6+np.random.default_rng(0).random(1000000)
+        rolling = pd.Series(arr).rolling(3)
+        np.testing.assert_allclose(rolling_sum(arr,3),rolling.sum().to_numpy(),rtol=1e-14)
+        np.testing.assert_allclose(rolling_mean(arr,3),rolling.mean().to_numpy(),rtol=1e-14)
+        # pandas var drifts with the offset, so it is compared with the windows themselves
+        exact = np.lib.stride_tricks.sliding_window_view(arr,3).var(axis=1,ddof=1)
+        np.testing.assert_allclose(rolling_var(arr,3)[2:],exact,rtol=1e-8)
+
+    def test_nan_gap_kernels(self):
+        arr = np.random.default_rng(0).standard_normal(200).cumsum()
+        gappy = arr.copy()
+        gappy[[0,50,51,120]] = np.nan
+        res = moving_average(gappy,3)
+        assert np.isnan(res[[0,1,2,50,51,120]]).all()
+        np.testing.assert_allclose(res[52],np.mean(gappy[[48,49,52]]))
+        # the window of rolling_mean is rows, the gap is not skipped
+        rolling = rolling_mean(gappy,3)
+        assert np.isnan(rolling[52]) and np.isnan(rolling[53])
+        np.testing.assert_allclose(res[54:120],rolling[54:120])
+        np.testing.assert_allclose(moving_average(arr,3),rolling_mean(arr,3))
+        for func in [lambda x: rfft_transform(x,5),wavelet_denoising]:
+            res = func(gappy)
+            np.testing.assert_array_equal(np.isnan(res),np.isnan(gappy))
+            np.testing.assert_allclose(res[52:120],func(arr[52:120]))
+        assert len(rfft_transform(arr[:101],5)) == 101
+
+    def test_batch_denoising(self):
+        block = np.random.default_rng(0).standard_normal((6,101)).cumsum(axis=1)
+        block[2,[0,40,41]] = np.nan
+        for batchFunc,func in [(rfft_transform_batch,rfft_transform),(wavelet_denoising_batch,wavelet_denoising)]:
+            expected = np.stack([func(i) for i in block])
+            np.testing.assert_allclose(batchFunc(block),expected)
+            np.testing.assert_allclose(batchFunc(block.T,axis=0),expected.T)
+        data = Time_Series_Data({'time':np.arange(101),'a':block[0],'b':block[1]},'time')
+        data.transform(['a','b'],'denoised',rfft_transform_batch,5)
+        np.testing.assert_allclose(data.data['denoised_b'],rfft_transform(block[1],5))
+
     def test_single_dropna(self,single_na_test):
         data = single_na_test['test']
         res = pd.DataFrame(single_na_test['res'])
@@ -0,0 +1,152 @@
+import numpy as np
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+
+NUMBA_AVAILABLE = numba is not None
+
+config = {'numba':NUMBA_AVAILABLE}
+
+_COMPILED = {}
+
+
+def set_numba(enabled=True):
+    """
+    set_numba switch the numba kernels on or off
+
+    the numba kernels are used by default if numba is importable.
+
+    Parameters
+    ----------
+    enabled : bool, optional
+        whether to use the numba kernels, by default True
+
+    Raises
+    ------
+    ImportError
+        numba is not installed
+    """
+    if enabled and not NUMBA_AVAILABLE:
+        raise ImportError('numba is not installed')
+    config['numba'] = bool(enabled)
+
+
+def use_numba():
+    """
+    use_numba whether the numba kernels are used
+
+    Returns
+    -------
+    bool
+    """
+    return NUMBA_AVAILABLE and config['numba']
+
+
+def get_kernel(name):
+    """
+    get_kernel the compiled kernel of given name
+
+    the kernel is compiled on the first call with cache=True, so the
+    compiled code is reused by the later processes.
+
+    Parameters
+    ----------
+    name : str
+        one of 'rolling_extreme', 'ewm' and 'differencing'
+
+    Returns
+    -------
+    function or None
+        None if numba is not used
+    """
+    if not use_numba():
+        return None
+    if name not in _COMPILED:
+        _COMPILED[name] = numba.njit(cache=True)(KERNELS[name])
+    return _COMPILED[name]
+
+
+def _rolling_extreme_kernel(values,window,min_periods,is_max):
+    # monotonic deque of each (time, series) column, nan is skipped
+    n,m = values.shape
+    res = np.full((n,m),np.nan)
+    deque = np.empty(n,np.int64)
+    for j in range(m):
+        head = 0
+        tail = 0
+        count = 0
+        for i in range(n):
+            x = values[i,j]
+            if x == x:
+                count += 1
+                if is_max:
+                    while tail > head and values[deque[tail-1],j] <= x:
+                        tail -= 1
+                else:
+                    while tail > head and values[deque[tail-1],j] >= x:
+                        tail -= 1
+                deque[tail] = i
+                tail += 1
+            if i >= window:
+                old = values[i-window,j]
+                if old == old:
+                    count -= 1
+            while tail > head and deque[head] <= i-window:
+                head += 1
+            if count >= min_periods and tail > head:
+                res[i,j] = values[deque[head],j]
+    return res
+
+
+def _ewm_kernel(values,alpha,adjust,ignore_na):
+    # the recurrence of pandas ewma for each (time, series) column
+    n,m = values.shape
+    res = np.empty((n,m))
+    newWeight = 1. if adjust else alpha
+    for j in range(m):
+        weighted = values[0,j]
+        oldWeight = 1.
+        res[0,j] = weighted
+        for i in range(1,n):
+            cur = values[i,j]
+            isObservation = cur == cur
+            if weighted == weighted:
+                if isObservation or not ignore_na:
+                    oldWeight *= 1.-alpha
+                    if isObservation:
+                        if weighted != cur:
+                            weighted = (oldWeight*weighted+newWeight*cur)/(oldWeight+newWeight)
+                        if adjust:
+                            oldWeight += newWeight
+                        else:
+                            oldWeight = 1.
+            elif isObservation:
+                weighted = cur
+            res[i,j] = weighted
+    return res
+
+
+def _differencing_kernel(values,weights,lag):
+    # the weights of each (time, series) column in the order of the
+    # batch and streaming versions, so the result is identical
+    n,m = values.shape
+    res = np.full((n,m),np.nan)
+    span = (len(weights)-1)*lag
+    for j in range(m):
+        for i in range(span,n):
+            value = weights[0]*values[i,j]
+            for k in range(1,len(weights)):
+                if weights[k] != 0:
+                    value += weights[k]*values[i-k*lag,j]
+            res[i,j] = value
+    return res
+
+
+KERNELS = {
+    'rolling_extreme':_rolling_extreme_kernel,
+    'ewm':_ewm_kernel,
+    'differencing':_differencing_kernel,
+}
@@ -0,0 +1,122 @@
+import numpy as np
+import pandas as pd
+from functools import reduce
+
+
+def union_time_index(timeIndexList):
+    """
+    union_time_index sorted union of multiple time indexes
+
+    Parameters
+    ----------
+    timeIndexList : list of numpy array
+        the time indexes to be merged
+
+    Returns
+    -------
+    numpy array
+        sorted unique time values
+    """
+    timeIndexList = [np.asarray(i) for i in timeIndexList]
+    if len(timeIndexList) == 0:
+        return np.array([])
+    return np.unique(np.concatenate(timeIndexList))
+
+
+def intersect_time_index(timeIndexList):
+    """
+    intersect_time_index sorted intersection of multiple time indexes
+
+    Parameters
+    ----------
+    timeIndexList : list of numpy array
+        the time indexes to be intersected
+
+    Returns
+    -------
+    numpy array
+        sorted unique time values existing in every time index
+    """
+    timeIndexList = [np.asarray(i) for i in timeIndexList]
+    if len(timeIndexList) == 0:
+        return np.array([])
+    return reduce(np.intersect1d,timeIndexList[1:],np.unique(timeIndexList[0]))
+
+
+def align_positions(timeline,timeIndex):
+    """
+    align_positions locate every row of a time index in a sorted timeline
+
+    Parameters
+    ----------
+    timeline : numpy array
+        sorted unique time values
+    timeIndex : numpy array
+        the time index of one Time_Series_Data
+
+    Returns
+    -------
+    tuple of numpy array
+        (rowMask, positions): rowMask marks the rows existing in timeline,
+        positions are the timeline positions of those rows
+    """
+    timeIndex = np.asarray(timeIndex)
+    if len(timeline) == 0:
+        return np.zeros(len(timeIndex),dtype=bool),np.array([],dtype=int)
+    pos = np.minimum(np.searchsorted(timeline,timeIndex),len(timeline)-1)
+    rowMask = timeline[pos] == timeIndex
+    return rowMask,pos[rowMask]
+
+
+def _fill_dtype(dtype,fillMissing):
+    if dtype.kind in 'mM' and pd.isna(fillMissing):
+        return dtype
+    if dtype.kind not in 'iufc':
+        return np.dtype(object)
+    if not isinstance(fillMissing,(bool,int,float,complex)):
+        # python scalars are weakly typed, e.g. int32 with 0 stays int32
+        fillMissing = np.asarray(fillMissing)
+    try:
+        res = np.result_type(dtype,fillMissing)
+    except TypeError:
+        return np.dtype(object)
+    return res if res.kind in 'iufc' else np.dtype(object)
+
+
+def _fill_value(dtype,fillMissing):
+    if dtype.kind in 'mM' and pd.isna(fillMissing):
+        return np.datetime64('NaT') if dtype.kind == 'M' else np.timedelta64('NaT')
+    return fillMissing
+
+
+def align_array(array,rowMask,positions,length,fillMissing=np.nan):
+    """
+    align_array scatter the rows of an array into a padded timeline
+
+    the output is preallocated with the promoted dtype of the array and
+    the fill value (e.g. int with nan becomes float), non numeric arrays
+    fall back to object dtype.
+
+    Parameters
+    ----------
+    array : numpy array
+        the input array
+    rowMask : numpy array of bool
+        the rows to be kept (see align_positions)
+    positions : numpy array of int
+        the target positions of kept rows (see align_positions)
+    length : int
+        length of timeline
+    fillMissing : object, optional
+        the filling value for missing time, by default np.nan
+
+    Returns
+    -------
+    numpy array
+    """
+    array = np.asarray(array)
+    dtype = _fill_dtype(array.dtype,fillMissing)
+    res = np.empty((length,)+array.shape[1:],dtype=dtype)
+    res[:] = _fill_value(dtype,fillMissing)
+    res[positions] = array[rowMask]
+    return res
@@ -1,16 +1,21 @@
 import copy
+from copy import deepcopy
 import numpy as np
 import pandas as pd
 import pprint
 import collections
-from joblib import Parallel, delayed
 from collections import ChainMap
-from collections import Counter
-import uuid
+import pyarrow as pa
+from time_series_transform.transform_core_api.block_manager import Block_Manager
+from time_series_transform.transform_core_api.window import Window_Array
+from time_series_transform.transform_core_api.executor import Category_Executor
+from time_series_transform.transform_core_api.growable import Growable_Array
+from time_series_transform.transform_core_api.alignment import (
+    union_time_index, intersect_time_index, align_positions, align_array, _fill_dtype, _fill_value)
 
 class Time_Series_Data(object):
 
-    def __init__(self,data=None,time_index=None):
+    def __init__(self,data=None,time_index=None,blockStorage=False,copy=True):
         """
         __init__ Time_Series_Data initializer
         
@@ -27,17 +32,28 @@ class Time_Series_Data(object):
         time_index : dict of list or string or numeric type, optional
             if it is dict of list the time_series_IX will be initiated by the value.
             else it will use the information and search from data parameter., by default None
+        blockStorage : bool, optional
+            whether to store data and labels in consolidated dtype blocks (Block_Manager)
+            instead of one numpy array per column, by default False
+        copy : bool, optional
+            whether to copy the input data. if False, the input arrays are
+            kept as read-only views (copy-on-write, see make_writable), by default True
         
         Raises
         ------
         ValueError
             data type error
         """
-        data = copy.deepcopy(data)
+        if copy:
+            data = deepcopy(data)
+        self._copy = copy
+        self._isSorted = {}
+        self._timeLookup = None
+        self._buffers = {}
         self._time_index = {}
         self.time_length = 0
         self.time_seriesIx = None
-        self._data ={}
+        self._data = Block_Manager() if blockStorage else {}
         if time_index is not None:
             if isinstance(time_index,dict):
                 for i in time_index:
@@ -46,13 +62,14 @@ class Time_Series_Data(object):
             elif isinstance(time_index,(str,int,float)):
                 self.time_seriesIx = time_index
                 self.set_time_index(data[time_index],time_index)
-                data.pop(time_index)
             else:
                 raise ValueError('invalid data type for time_index')
         if data is not None:
             for i in data:
+                if isinstance(time_index,(str,int,float)) and i == time_index:
+                    continue
                 self.set_data(data[i],i)
-        self._labels = {}
+        self._labels = Block_Manager() if blockStorage else {}
 
     def _validate_time_index(self,time_index):
         ctn = collections.Counter(time_index)
@@ -72,6 +89,80 @@ class Time_Series_Data(object):
     def time_index(self):
         return self._time_index
 
+    @property
+    def block_storage(self):
+        return isinstance(self._data,Block_Manager)
+
+    def _as_array(self,inputData):
+        if isinstance(inputData,Window_Array):
+            # read-only by construction
+            return inputData
+        if self._copy:
+            return np.array(inputData)
+        arr = np.asarray(inputData)
+        if arr is inputData or arr.base is not None:
+            # shared with the caller, any mutation has to go through make_writable
+            arr = arr.view()
+            arr.flags.writeable = False
+        return arr
+
+    def make_writable(self,label):
+        """
+        make_writable copy-on-write access of data, label or time index
+        
+        the column is only copied when it is a read-only view
+        (e.g. constructed with copy=False). the cached time lookup
+        (sorted order used by loc_time, contains and slice_time) is dropped
+        for the time index, so call it again before each edit of time index.
+        with block storage, the blocks are consolidated before returning the
+        column (see Block_Manager.writable), so the array stays the stored data
+        until a column is set or removed, call it again after that.
+        
+        Parameters
+        ----------
+        label : str
+            the name of data, label or time index
+        
+        Returns
+        -------
+        numpy array
+            the writable array stored in the data structure
+        """
+        for dictionary in [self._data,self._labels,self._time_index]:
+            if label in dictionary:
+                if isinstance(dictionary,Block_Manager):
+                    return dictionary.writable(label)
+                if not isinstance(dictionary[label],np.ndarray) or not dictionary[label].flags.writeable:
+                    dictionary[label] = np.array(dictionary[label])
+                if dictionary is self._time_index:
+                    self._invalidate_time_index()
+                return dictionary[label]
+        raise KeyError(label)
+
+    def copy(self,deep=True):
+        """
+        copy copy the Time_Series_Data
+        
+        Parameters
+        ----------
+        deep : bool, optional
+            if False, the new object has its own containers
+            but shares the underlying arrays, by default True
+        
+        Returns
+        -------
+        Time_Series_Data
+        """
+        if deep:
+            return deepcopy(self)
+        res = copy.copy(self)
+        res._isSorted = dict(self._isSorted)
+        res._buffers = dict(self._buffers)
+        res._time_index = dict(self._time_index)
+        res._data = self._data.copy()
+        res._labels = self._labels.copy()
+        return res
+
     def set_data(self,inputData,label):
         """
         set_data setter of data
@@ -98,7 +189,7 @@ class Time_Series_Data(object):
         """
         if len(inputData) != self.time_length:
             raise ValueError('input data has different time length')
-        self._data[label] = np.array(inputData)
+        self._data[label] = self._as_array(inputData)
         return self
 
 
@@ -128,7 +219,7 @@ class Time_Series_Data(object):
         """
         if len(inputData) != self.time_length:
             raise ValueError('input data has different time length')
-        self._labels[label] = np.array(inputData)
+        self._labels[label] = self._as_array(inputData)
         return self
 
     def remove(self,key,remove_type=None):
@@ -156,51 +247,178 @@ class Time_Series_Data(object):
         return self
 
 
-    def _nan_pos(self,dataArray):
-        if isinstance(dataArray[0],(list,np.ndarray)):
-            res = []
-            for i in dataArray:
-                res.append(np.isnan(i).any())
-            return np.argwhere(res).tolist()
-        return np.argwhere(np.isnan(np.asarray(dataArray))).tolist()
+    def _fill_rows(self,column,length,fillMissing):
+        dtype = _fill_dtype(column.dtype,fillMissing)
+        res = np.empty((length,)+tuple(column.shape[1:]),dtype=dtype)
+        res[:] = _fill_value(dtype,fillMissing)
+        return res
+
+    def _extend(self,outputType,label,column,values):
+        buffer = self._buffers.get((outputType,label))
+        if buffer is None or not buffer.owns(column):
+            buffer = Growable_Array(column)
+            self._buffers[(outputType,label)] = buffer
+        return buffer.extend(values)
 
+    def _own_rows(self,outputType,label):
+        # copy-on-write of the rows before the latest append, they may be shared
+        # with the views taken earlier (shallow copy or copy=False export).
+        # the copy is a new growable buffer, so the later appends stay in place
+        dictionary = getattr(self,'_'+outputType)
+        buffer = Growable_Array(dictionary[label])
+        self._buffers[(outputType,label)] = buffer
+        dictionary[label] = buffer.array
+        return dictionary[label]
 
-    def dropna(self):
+    def append(self,rows,fillMissing=np.nan):
+        """
+        append adding new rows at the end of time index
+        
+        the columns are kept in growable buffers whose capacity grows 
+        geometrically, so appending is amortized O(1) per row instead 
+        of rebuilding the data (the blocks of block storage are the buffers,
+        so they stay consolidated). the arrays shared with other objects
+        (e.g. copy=False or shallow copy) are never overwritten.
+        
+        Parameters
+        ----------
+        rows : dict of list
+            the new values of time index, data and labels
+        fillMissing : object, optional
+            the value of the data and labels not in rows, by default np.nan
+        
+        Returns
+        -------
+        self
+        
+        Raises
+        ------
+        ValueError
+            missing time index, different length or unknown name
+        """
+        if self.time_seriesIx not in rows:
+            raise ValueError('time index is required')
+        length = len(rows[self.time_seriesIx])
+        for k in rows:
+            if len(rows[k]) != length:
+                raise ValueError('input data has different time length')
+            if k not in self._time_index and k not in self._data and k not in self._labels:
+                raise ValueError(f'{k} does not exist')
+        if length == 0:
+            return self
+        for outputType in ['time_index','data','labels']:
+            dictionary = getattr(self,'_'+outputType)
+            values = {
+                k:np.asarray(rows[k]) if k in rows else self._fill_rows(dictionary[k],length,fillMissing)
+                for k in dictionary
+                }
+            if isinstance(dictionary,Block_Manager):
+                # the blocks grow in place and stay consolidated
+                dictionary.extend(values)
+                continue
+            for k,v in values.items():
+                dictionary[k] = self._extend(outputType,k,dictionary[k],v)
+        self.time_length += length
+        self._invalidate_time_index()
+        return self
+
+
+    def _nan_mask(self,dataArray):
+        if isinstance(dataArray,Window_Array):
+            return dataArray.nan_row_mask()
+        arr = np.asarray(dataArray)
+        if arr.dtype.kind in 'fc':
+            mask = np.isnan(arr)
+        elif arr.dtype.kind in 'mM':
+            mask = np.isnat(arr)
+        elif arr.dtype.kind == 'O':
+            if len(arr) > 0 and isinstance(arr.flat[0],(list,tuple,np.ndarray)):
+                # ragged sequence data
+                mask = np.fromiter((pd.isna(np.asarray(i)).any() for i in arr.flat),bool,arr.size).reshape(arr.shape)
+            else:
+                mask = pd.isna(arr)
+        else:
+            mask = np.zeros(arr.shape,dtype=bool)
+        if mask.ndim > 1:
+            mask = mask.any(axis=tuple(range(1,mask.ndim)))
+        return mask
+
+    def _apply_rows(self,indexer):
+        self._time_index = {k:v[indexer] for k,v in self.time_index.items()}
+        self.time_length = len(next(iter(self._time_index.values()))) if self._time_index else 0
+        if self.block_storage:
+            self._data = self._data.take_manager(indexer)
+            self._labels = self._labels.take_manager(indexer)
+        else:
+            self._data = {k:v[indexer] for k,v in self.data.items()}
+            self._labels = {k:v[indexer] for k,v in self.labels.items()}
+        keepOrder = isinstance(indexer,np.ndarray) and indexer.dtype == bool
+        keepOrder = keepOrder or (isinstance(indexer,slice) and (indexer.step or 1) > 0)
+        self._invalidate_time_index(keepOrder)
+        return self
+
+    def _take_rows(self,indexer):
+        return self.copy(deep=False)._apply_rows(indexer)
+
+    def _take_columns(self,labels,indexer):
+        # the rows of the time index and the selected data and labels as plain
+        # dictionaries of views, so block storage is neither consolidated nor copied
+        res = copy.copy(self)
+        res._buffers = {}
+        res._isSorted = dict(self._isSorted)
+        res._time_index = {k:v[indexer] for k,v in self._time_index.items()}
+        res._data = {k:self._data[k][indexer] for k in labels if k in self._data}
+        res._labels = {k:self._labels[k][indexer] for k in labels if k in self._labels}
+        res.time_length = len(next(iter(res._time_index.values()))) if res._time_index else 0
+        res._invalidate_time_index(True)
+        return res
+
+    def dropna(self,how='any',subset=None,thresh=None):
         """
         dropna drop null values
         
         it will drop null values for the time index.
         For example, time_index:[1,2,3], data1:[1,2,np.nan], data2[1,2,3]
         dropna will return time_index:[1,2], data1:[1,2], data2[1,2]
+        sequence data (e.g. make_lag_sequence) is null if any of its values is null.
+        
+        Parameters
+        ----------
+        how : {'any','all'}, optional
+            drop the time index if any or all of the columns are null, by default 'any'
+        subset : list of str, optional
+            the data or labels to be checked, if None all are checked, by default None
+        thresh : int, optional
+            keep the time index with at least thresh non null columns, 
+            it overrides how, by default None
         
         Returns
         -------
         Time_Series_Data
             it will return a new Time_Series_Data without null values
+        
+        Raises
+        ------
+        ValueError
+            invalid how
         """
-        ixList = []
-        notNaList=[]
-        for i in self.data:
-            tmp = self._nan_pos(self.data[i])
-            for t in tmp:
-                ixList.extend(t)
-        for i in self.labels:
-            tmp =  self._nan_pos(self.labels[i])
-            for t in tmp:
-                ixList.extend(t)
-        if len(ixList) == 0:
+        if how not in ['any','all']:
+            raise ValueError("how must be 'any' or 'all'")
+        allInfo = ChainMap(self.labels,self.data)
+        if subset is None:
+            subset = list(allInfo.keys())
+        if len(subset) == 0:
             return self
-        ixList = list(set(ixList))
-        for i in range(self.time_length):
-            if i in ixList:
-                notNaList.append(False)
-                continue
-            notNaList.append(True)
-        tsd = Time_Series_Data(self[notNaList],self.time_seriesIx)
-        for i in self.labels:
-            tsd = tsd.set_labels(tsd[:,[i]][i],i)
-            tsd = tsd.remove(i,'data')
-        return tsd
+        naMask = np.vstack([self._nan_mask(allInfo[i]) for i in subset])
+        if thresh is not None:
+            keep = (~naMask).sum(axis=0) >= thresh
+        elif how == 'any':
+            keep = ~naMask.any(axis=0)
+        else:
+            keep = ~naMask.all(axis=0)
+        if keep.all():
+            return self
+        return self._take_rows(keep)
 
 
     def set_time_index(self,inputData,label):
@@ -222,12 +440,15 @@ class Time_Series_Data(object):
             it will return self
         """
         self._time_index = {}
-        self._time_index[label] = np.array(inputData)
+        self._time_index[label] = self._as_array(inputData)
         self.time_seriesIx = label
         self.time_length = len(inputData)
+        self._invalidate_time_index()
         return self
 
     def _get_dictionary_list_info(self,dictionary,indexSlice,label):
+        if isinstance(dictionary,Block_Manager) and not np.isscalar(indexSlice):
+            return dictionary.take(indexSlice,None if label is None else [label])
         res = {}
         if label is None:
             for i in dictionary:
@@ -237,17 +458,122 @@ class Time_Series_Data(object):
         return res
 
 
-    def _reorder_list(self,sortingList,targetList,ascending):
-        descending = 1-ascending
-        ixList = sorted(range(len(sortingList)), key=lambda k: sortingList[k],reverse = descending)
-        ordered_list = [targetList[i] for i in ixList]
-        return np.array(ordered_list)
+    def _check_sorted(self,ascending):
+        if ascending not in self._isSorted:
+            if self.time_seriesIx not in self.time_index:
+                return True
+            timeIx = self.time_index[self.time_seriesIx]
+            try:
+                if ascending:
+                    self._isSorted[ascending] = bool(np.all(timeIx[:-1] <= timeIx[1:]))
+                else:
+                    self._isSorted[ascending] = bool(np.all(timeIx[:-1] >= timeIx[1:]))
+            except TypeError:
+                self._isSorted[ascending] = False
+        return self._isSorted[ascending]
+
+    def _invalidate_time_index(self,keepOrder=False):
+        if not keepOrder:
+            self._isSorted = {}
+        self._timeLookup = None
+
+    def _get_time_lookup(self):
+        if self._timeLookup is None:
+            timeIx = self.time_index[self.time_seriesIx]
+            if self._check_sorted(True):
+                self._timeLookup = (timeIx,None)
+            else:
+                sorter = np.argsort(timeIx,kind='stable')
+                self._timeLookup = (timeIx[sorter],sorter)
+        return self._timeLookup
+
+    def loc_time(self,times):
+        """
+        loc_time the positions of time index values
+        
+        it uses a cached sorted time index (binary search), the cache is
+        rebuilt only after the time index is changed.
+        
+        Parameters
+        ----------
+        times : object or list of object
+            the target time index values
+        
+        Returns
+        -------
+        int or numpy array of int
+            the positions, -1 if the time does not exist
+        """
+        sortedTime,sorter = self._get_time_lookup()
+        times = np.asarray(times)
+        if len(sortedTime) == 0:
+            res = np.full(times.shape,-1)
+        else:
+            pos = np.minimum(np.searchsorted(sortedTime,times),len(sortedTime)-1)
+            found = sortedTime[pos] == times
+            if sorter is not None:
+                pos = sorter[pos]
+            res = np.where(found,pos,-1)
+        if res.ndim == 0:
+            return int(res)
+        return res
+
+    def contains(self,times):
+        """
+        contains whether time index values exist
+        
+        Parameters
+        ----------
+        times : object or list of object
+            the target time index values
+        
+        Returns
+        -------
+        bool or numpy array of bool
+        """
+        return np.asarray(self.loc_time(times)) >= 0
+
+    def slice_time(self,start=None,end=None):
+        """
+        slice_time select a time range
+        
+        both start and end are inclusive, the original order is kept.
+        
+        Parameters
+        ----------
+        start : object, optional
+            the start of time range, if None starts from the beginning, by default None
+        end : object, optional
+            the end of time range, if None ends at the last time, by default None
+        
+        Returns
+        -------
+        Time_Series_Data
+            a new Time_Series_Data in the given range
+        """
+        sortedTime,sorter = self._get_time_lookup()
+        lo = 0 if start is None else np.searchsorted(sortedTime,start,'left')
+        hi = len(sortedTime) if end is None else np.searchsorted(sortedTime,end,'right')
+        hi = max(lo,hi)
+        if sorter is None:
+            return self._take_rows(slice(lo,hi))
+        return self._take_rows(np.sort(sorter[lo:hi]))
+
+    @property
+    def is_sorted(self):
+        """
+        is_sorted whether the time index is in ascending order
+        
+        the result is cached until the time index is changed
+        """
+        return self._check_sorted(True)
 
     def sort(self,ascending=True):
         """
         sort sorting data by time_index
         
-        sort data by index
+        sort data by index with a stable argsort.
+        already sorted data is not touched.
         
         Parameters
         ----------
@@ -259,13 +585,16 @@ class Time_Series_Data(object):
         self
             it will return a sorted self
         """
-        sortingList = list(self.time_index.values())[0]
-        for data in self.data:
-            self.data[data] = self._reorder_list(sortingList,self.data[data],ascending)
-        for label in self.labels:
-            self.labels[label] = self._reorder_list(sortingList,self.labels[label],ascending)
-        for time in self.time_index:
-            self.time_index[time] = self._reorder_list(sortingList,self.time_index[time],ascending)
+        if self._check_sorted(ascending):
+            return self
+        sortingList = self.time_index[self.time_seriesIx]
+        if ascending:
+            permutation = np.argsort(sortingList,kind='stable')
+        else:
+            # keep the original order of equal time index as sorted(reverse=True)
+            permutation = len(sortingList)-1-np.argsort(sortingList[::-1],kind='stable')[::-1]
+        self._apply_rows(permutation)
+        self._isSorted = {ascending:True}
         return self
 
     def _single_transform(self,colName,func,*args,**kwargs):
@@ -279,20 +608,48 @@ class Time_Series_Data(object):
         arrDict = {}
         outputType = 'label'
         for col in inputList:
+            # the repeated column gets a deterministic suffix (col_1, col_2 ...)
+            key,n = col,0
+            while key in arrDict:
+                n += 1
+                key = f"{col}_{n}"
             if col in self.data:
-                if col not in arrDict:
-                    arrDict[col] = self.data[col]
-                else:
-                    arrDict[f"{col}_{str(uuid.uuid4())}"] = self.data[col]
+                arrDict[key] = self.data[col]
                 outputType='data'
             else:
-                if col not in arrDict:
-                    arrDict[col] = self.labels[col]
-                else:
-                    arrDict[f"{col}_{str(uuid.uuid4())}"] = self.labels[col]
+                arrDict[key] = self.labels[col]
         arrDict = func(arrDict,*args,**kwargs)
         return arrDict,outputType
 
+    def _organize_output(self,arr,newName):
+        # the output of transform function into dictionary of arrays,
+        # the columns are taken as arrays without converting into lists
+        if isinstance(arr,dict):
+            return {
+                k: v if isinstance(v,(np.ndarray,Window_Array)) else np.asarray(v)
+                for k,v in arr.items()
+                }
+        if isinstance(arr,pd.DataFrame):
+            return {f"{newName}_{k}": arr.iloc[:,ix].to_numpy() for ix,k in enumerate(arr.columns)}
+        if isinstance(arr,(pa.Table,pa.RecordBatch)):
+            return {f"{newName}_{k}": arr.column(ix).to_numpy(zero_copy_only=False) for ix,k in enumerate(arr.column_names)}
+        if isinstance(arr,np.ndarray) and arr.dtype.names is not None:
+            # structured array, one column per field
+            return {f"{newName}_{k}": arr[k] for k in arr.dtype.names}
+        if isinstance(arr,(list,np.ndarray,Window_Array)):
+            return {newName:self._as_array(arr)}
+        if isinstance(arr,pd.Series):
+            return {newName:arr.to_numpy()}
+        return arr
+
+    def _transform_output(self,inputLabels,newName,func,*args,**kwargs):
+        # the output columns of transform (dictionary and output type) without setting them
+        if isinstance(inputLabels,list):
+            arr,outputType = self._list_transform(inputLabels,func,*args,**kwargs)
+        else:
+            arr,outputType = self._single_transform(inputLabels,func,*args,**kwargs)
+        return self._organize_output(arr,newName),outputType
+
     def transform(self,inputLabels,newName,func,*args,**kwargs):
         """
         transform the way of manipulating data
@@ -302,36 +659,26 @@ class Time_Series_Data(object):
         Parameters
         ----------
         inputLabels : str or list of string
-            the input data pass into functions
+            the input data pass into functions.
+            the list of string is passed as dictionary, the repeated
+            label is renamed as label_1, label_2 ...
         newName : str
             the new name or prefix for the output data
             if the function has specify the output name, it will become
             prefix
         func : function
             the function for data manipulation.
-            the output of function requires to be dictiony of list,
-            numpy array or pandas dataFrame.
+            the output of function can be list, numpy array, pandas Series
+            (named as newName), dictionary of arrays (named as the keys),
+            pandas DataFrame, pyarrow Table or numpy structured array
+            (named as newName_column).
             The final output should also have the same length as time_index
         
         Returns
         -------
         self
         """
-        # transform
-        if isinstance(inputLabels,list):
-            arr,outputType = self._list_transform(inputLabels,func,*args,**kwargs)
-        else:
-            arr,outputType = self._single_transform(inputLabels,func,*args,**kwargs)
-
-        # organize into dict
-        if isinstance(arr,pd.DataFrame):
-            arr = arr.to_dict(orient='list')
-            arr = { f"{newName}_{k}": v for k, v in arr.items() }
-        elif isinstance(arr,(list,np.ndarray)):
-            arr = {newName:np.array(arr)}   
-        elif isinstance(arr,pd.Series):
-            arr = {newName:arr.values}
-
+        arr,outputType = self._transform_output(inputLabels,newName,func,*args,**kwargs)
         if outputType == 'data':
             self._data.update(arr)
         else:
@@ -362,23 +709,23 @@ class Time_Series_Data(object):
         return left == right
 
     def __getitem__(self,ix):
-        tmpInfo = self.data
-        tmpInfo.update(self.labels)
         info = {}
         if isinstance(ix,tuple):
             t = ix[0]
             info.update(self._get_dictionary_list_info(self.time_index,t,None))
             for q in ix[1]:
-                info.update(self._get_dictionary_list_info(tmpInfo,t,q))
+                source = self.labels if q in self.labels else self.data
+                info.update(self._get_dictionary_list_info(source,t,q))
         else:
             info.update(self._get_dictionary_list_info(self.time_index,ix,None))
-            info.update(self._get_dictionary_list_info(tmpInfo,ix,None))
+            info.update(self._get_dictionary_list_info(self.data,ix,None))
+            info.update(self._get_dictionary_list_info(self.labels,ix,None))
         return info
         
 
         
 class Time_Series_Data_Collection(object):
-    def __init__(self,time_series_data,time_seriesIx,categoryIx):
+    def __init__(self,time_series_data,time_seriesIx,categoryIx,copy=True):
         """
         Time_Series_Data_Collection The dictionary version of Time_Series_Data
         
@@ -394,13 +741,16 @@ class Time_Series_Data_Collection(object):
             the name of time_seriesIx
         categoryIx : str
             the name of categoryIx
+        copy : bool, optional
+            whether to copy the input data, by default True
         
         Raises
         ------
         ValueError
             invalid input data type
         """
-        time_series_data = copy.deepcopy(time_series_data)
+        if copy:
+            time_series_data = deepcopy(time_series_data)
         super().__init__()
         if isinstance(time_series_data,dict):
             if self._check_dict_type(time_series_data):
@@ -431,6 +781,28 @@ class Time_Series_Data_Collection(object):
     def time_series_data_collection(self):
         return self._time_series_data_collection
 
+    def copy(self,deep=True):
+        """
+        copy copy the Time_Series_Data_Collection
+        
+        Parameters
+        ----------
+        deep : bool, optional
+            if False, each Time_Series_Data is copied with deep=False, 
+            which shares the underlying arrays, by default True
+        
+        Returns
+        -------
+        Time_Series_Data_Collection
+        """
+        if deep:
+            return deepcopy(self)
+        res = copy.copy(self)
+        res._time_series_data_collection = {
+            k:v.copy(deep=False) for k,v in self._time_series_data_collection.items()
+            }
+        return res
+
     def set_time_series_data_collection(self,ix,time_series_data):
         """
         set_time_series_data_collection alternative of setting time_series_collection data
@@ -475,33 +847,97 @@ class Time_Series_Data_Collection(object):
             self._time_series_data_collection.pop(key)
         return self
 
+    def _factorize(self,categories):
+        try:
+            return np.unique(categories,return_inverse=True)
+        except TypeError:
+            # unorderable categories (e.g. mixed types)
+            inverse,uniques = pd.factorize(categories)
+            return uniques,inverse
+
     def _expand_time_series_data(self,time_series_data,categoryIx):
+        categories = time_series_data[:,[categoryIx]][categoryIx]
+        uniques,inverse = self._factorize(categories)
+        inverse = np.asarray(inverse).reshape(-1)
+        order = np.argsort(inverse,kind='stable')
+        bounds = np.zeros(len(uniques)+1,dtype=int)
+        np.cumsum(np.bincount(inverse,minlength=len(uniques)),out=bounds[1:])
+        # each column is sorted once, every category becomes a view of the sorted buffer
+        timeDict = {k:v[order] for k,v in time_series_data.time_index.items()}
+        dataDict = {k:v[order] for k,v in time_series_data.data.items() if k != categoryIx}
+        labelDict = {k:v[order] for k,v in time_series_data.labels.items() if k != categoryIx}
         dct = {}
-        for i in list(set(time_series_data[:,[categoryIx]][categoryIx])):
-            ixList = np.where(time_series_data[:,[categoryIx]][categoryIx]==i)
-            tmp = {}
-            tmp = Time_Series_Data()
-            for t in time_series_data.time_index:
-                tmp.set_time_index(time_series_data.time_index[t][ixList],t)
-            for d in time_series_data.data:
-                tmp.set_data(time_series_data.data[d][ixList],d)
-            for l in time_series_data.labels:
-                tmp.set_labels(time_series_data.labels[l][ixList],l)
-            tmp = tmp.remove(categoryIx)
-            dct[i] = tmp
+        for ix,category in enumerate(uniques):
+            pos = slice(bounds[ix],bounds[ix+1])
+            tmp = Time_Series_Data(blockStorage=time_series_data.block_storage)
+            for t in timeDict:
+                tmp.set_time_index(timeDict[t][pos],t)
+            for d in dataDict:
+                tmp._data[d] = dataDict[d][pos]
+            for l in labelDict:
+                tmp._labels[l] = labelDict[l][pos]
+            dct[category] = tmp
         return dct
 
 
-    def _parallel_transform(self,category,time_series_data,inputLabels,newName,func,*args,**kwargs):
-        return {category:time_series_data.transform(inputLabels,newName,func,*args,**kwargs)}
+    def _empty_like(self,rows):
+        template = next(iter(self._time_series_data_collection.values()),None)
+        if template is None:
+            tmp = Time_Series_Data()
+            tmp.set_time_index(np.asarray(rows[self._time_series_Ix])[:0],self._time_series_Ix)
+            for k in rows:
+                if k != self._time_series_Ix:
+                    tmp._data[k] = np.asarray(rows[k])[:0]
+            return tmp
+        tmp = Time_Series_Data(blockStorage=template.block_storage)
+        for t in template.time_index:
+            tmp.set_time_index(template.time_index[t][:0],t)
+        for d in template.data:
+            tmp._data[d] = np.asarray(template.data[d][:0])
+        for l in template.labels:
+            tmp._labels[l] = np.asarray(template.labels[l][:0])
+        return tmp
+
+    def append(self,rows,fillMissing=np.nan):
+        """
+        append adding new rows to each category
+        
+        the rows are split by categoryIx and appended to the 
+        Time_Series_Data of each category (see Time_Series_Data.append),
+        the new category is created with the same data and labels.
+        
+        Parameters
+        ----------
+        rows : dict of list
+            the new values of time index, category, data and labels
+        fillMissing : object, optional
+            the value of the data and labels not in rows, by default np.nan
+        
+        Returns
+        -------
+        self
+        """
+        categories = np.asarray(rows[self._categoryIx])
+        uniques,inverse = self._factorize(categories)
+        inverse = np.asarray(inverse).reshape(-1)
+        rows = {k:np.asarray(v) for k,v in rows.items() if k != self._categoryIx}
+        for ix,category in enumerate(uniques):
+            pos = inverse == ix
+            if category not in self._time_series_data_collection:
+                self._time_series_data_collection[category] = self._empty_like(rows)
+            self._time_series_data_collection[category].append({k:v[pos] for k,v in rows.items()},fillMissing)
+        self.timeLengthList = self._get_time_lengthList()
+        return self
 
 
     def transform(self,inputLabels,newName,func,n_jobs =1,verbose = 0,backend='loky',*args,**kwargs):
         """
         transform the function of manipulating data for each keys.
         
-        this function implments joblib parallel execution. Hence, each key of data
-        can be compute in the parallel fashion.
+        this function implments joblib parallel execution (see Category_Executor).
+        Hence, each key of data can be compute in the parallel fashion; the
+        categories are sent in batches with their input columns only and
+        the new columns are merged back.
         
         Parameters
         ----------
@@ -521,98 +957,218 @@ class Time_Series_Data_Collection(object):
         verbose : int, optional
             log level (joblib), by default 0
         backend : str, optional
-            backend type (joblib), by default 'loky'
+            backend type (joblib), 'thread_pool' or 'memmap'. thread_pool
+            runs in a persistent thread pool (numpy kernels releasing the GIL),
+            memmap writes the input and output columns into memory mapped
+            files shared by loky processes instead of pickling them, by default 'loky'
         
         Returns
         -------
         self
         """
-        dctList= Parallel(n_jobs=n_jobs,verbose = verbose, backend=backend)(delayed(self._parallel_transform)(
-            c,self._time_series_data_collection[c],inputLabels,newName,func,*args,**kwargs
-            ) for c in self.time_series_data_collection)
-        results = {}
-        for i in dctList:
-            results.update(i)
-        self._time_series_data_collection = results
+        executor = Category_Executor(n_jobs=n_jobs,verbose=verbose,backend=backend)
+        executor.transform(self,inputLabels,newName,func,*args,**kwargs)
         return self
 
-    def remove_different_time_index(self):
+    def cross_sectional_transform(self,inputLabels,newName,func,*args,**kwargs):
         """
-        remove_different_time_index remove the time period which does not exisit in other Time_Series_Data
+        cross_sectional_transform manipulating data across categories
+        
+        the data of every category is aligned to the union of time index
+        (missing time is nan) and passed into the function in one batch,
+        the result of each category is taken back at its own time index.
+        
+        Parameters
+        ----------
+        inputLabels : str or list of string
+            the input data pass into functions. the function receives
+            a (time, category) array for str or a (time, category, feature)
+            array for list of string
+        newName : str
+            the new name or prefix for the output data
+        func : function
+            the function for data manipulation, e.g. ranking along axis 1.
+            the output can be (time, category) array, (time, category, n) array
+            (named as newName_0 ... newName_n) or dictionary of (time, category) arrays
+            (named as newName_key)
         
         Returns
         -------
         self
         """
-        timeix = []
-        for i in self._time_series_data_collection:
-            timeix.extend(self._time_series_data_collection[i][:][self._time_series_Ix])
-        timeix = Counter(timeix)
-        timeCol = [k for k,v in timeix.items() if v == len(self._time_series_data_collection)]    
-        for i in self._time_series_data_collection:
-            tmp_time = Time_Series_Data()
-            ix = np.isin(self._time_series_data_collection[i][:][self._time_series_Ix],timeCol)
-            for t in self._time_series_data_collection[i].time_index:
-                tmp = self._time_series_data_collection[i].time_index[t][ix]
-                tmp_time.set_time_index(tmp,t)
-            for d in self._time_series_data_collection[i].data:
-                tmp = self._time_series_data_collection[i].data[d][ix]
-                tmp_time.set_data(tmp,d)
-            for l in self._time_series_data_collection[i].labels:
-                tmp = self._time_series_data_collection[i].labels[l][ix]
-                tmp_time.set_labels(tmp,l)               
-            self._time_series_data_collection[i] = tmp_time
+        categories = list(self._time_series_data_collection.keys())
+        if len(categories) == 0:
+            return self
+        timeline = union_time_index(self._time_index_list())
+        aligned = [
+            align_positions(timeline,self._time_series_data_collection[c].time_index[self._time_series_Ix])
+            for c in categories
+            ]
+        first = self._time_series_data_collection[categories[0]]
+        labelList = inputLabels if isinstance(inputLabels,list) else [inputLabels]
+        outputType = 'data' if any(l in first.data for l in labelList) else 'labels'
+        batch = np.stack([self._cross_section(l,categories,aligned,len(timeline)) for l in labelList],axis=-1)
+        if not isinstance(inputLabels,list):
+            batch = batch[:,:,0]
+        res = func(batch,*args,**kwargs)
+        if isinstance(res,dict):
+            res = {f"{newName}_{k}":np.asarray(v) for k,v in res.items()}
+        else:
+            res = np.asarray(res)
+            if res.ndim == 3:
+                res = {f"{newName}_{ix}":res[:,:,ix] for ix in range(res.shape[2])}
+            else:
+                res = {newName:res}
+        for ix,c in enumerate(categories):
+            tmp = self._time_series_data_collection[c]
+            _,positions = aligned[ix]
+            for k,v in res.items():
+                if outputType == 'data':
+                    tmp.set_data(v[positions,ix],k)
+                else:
+                    tmp.set_labels(v[positions,ix],k)
         return self
 
+    def _cross_section(self,label,categories,aligned,length):
+        arrList = []
+        for c in categories:
+            tmp = self._time_series_data_collection[c]
+            arrList.append(tmp.data[label] if label in tmp.data else tmp.labels[label])
+        res = np.empty((length,len(categories)),dtype=_fill_dtype(_panel_dtype(arrList),np.nan))
+        for ix,arr in enumerate(arrList):
+            rowMask,positions = aligned[ix]
+            res[:,ix] = align_array(arr,rowMask,positions,length)
+        return res
 
-    def _numpy_fill_missing(self,orgArray,posList,fillMissing):
-        nanList = np.empty(len(posList),object)
-        nanList[:] = fillMissing
-        if orgArray.ndim == 1:
-            nanList[posList] = orgArray
-            return nanList
-        nanList[:len(orgArray)] = orgArray.tolist()
-        ixList = np.append(np.where(posList==1),np.where(posList==0))
-        ixList = ixList.tolist()
-        idx = np.empty_like(ixList)
-        idx[ixList] = np.arange(len(ixList))
-        return nanList[idx]
+    def _time_index_list(self):
+        return [
+            self._time_series_data_collection[i].time_index[self._time_series_Ix]
+            for i in self._time_series_data_collection
+            ]
 
+    def remove_different_time_index(self,calendar=None):
+        """
+        remove_different_time_index remove the time period which does not exisit in other Time_Series_Data
+        
+        Parameters
+        ----------
+        calendar : list, optional
+            if not None, the time index outside of the calendar is removed as well, by default None
+        
+        Returns
+        -------
+        self
+        """
+        timeList = self._time_index_list()
+        if calendar is not None:
+            timeList.append(calendar)
+        timeline = intersect_time_index(timeList)
+        for i in self._time_series_data_collection:
+            tmp = self._time_series_data_collection[i]
+            rowMask,_ = align_positions(timeline,tmp.time_index[self._time_series_Ix])
+            if not rowMask.all():
+                self._time_series_data_collection[i] = tmp._take_rows(rowMask)
+        return self
 
-    def pad_time_index(self,fillMissing=np.nan):
+    def pad_time_index(self,fillMissing=np.nan,calendar=None):
         """
         pad_time_index 
         fill certain values for each missing time_index for the Time_Series_Data
         comparing to different keys
         
+        every Time_Series_Data is aligned to the sorted union of time index.
+        numeric data keeps its dtype (promoted with fillMissing, e.g. int becomes float for nan).
+        
         Parameters
         ----------
         fillMissing : object, optional
             the filling values, by default np.nan
+        calendar : list, optional
+            if not None, every Time_Series_Data is aligned to this calendar
+            instead of the union of time index, and the time outside of the
+            calendar is removed, by default None
         
         Returns
         -------
         self
         """
-        timeix = []
-        for i in self._time_series_data_collection:
-            timeix.extend(self._time_series_data_collection[i][:][self._time_series_Ix]) 
-        timeix = sorted(list(set(timeix)))
+        if calendar is None:
+            timeline = union_time_index(self._time_index_list())
+        else:
+            timeline = np.unique(calendar)
         for i in self._time_series_data_collection:
-            tmp_time = Time_Series_Data()
-            tmp_time.set_time_index(timeix,self._time_series_Ix)
             tmp = self._time_series_data_collection[i]
-            for t in tmp.time_index:
-                posList= np.isin(timeix,tmp.time_index[t])
+            rowMask,positions = align_positions(timeline,tmp.time_index[self._time_series_Ix])
+            tmp_time = Time_Series_Data(blockStorage=tmp.block_storage)
+            tmp_time.set_time_index(timeline,self._time_series_Ix)
             for d in tmp.data:
-                nanList = self._numpy_fill_missing(tmp.data[d],posList,fillMissing)
-                tmp_time.set_data(nanList,d)
+                tmp_time._data[d] = align_array(tmp.data[d],rowMask,positions,len(timeline),fillMissing)
             for l in tmp.labels:
-                nanList = self._numpy_fill_missing(tmp.labels[l],posList,fillMissing)
-                tmp_time.set_labels(nanList,l)
+                tmp_time._labels[l] = align_array(tmp.labels[l],rowMask,positions,len(timeline),fillMissing)
             self._time_series_data_collection[i] = tmp_time
         return self
 
+    def to_panel(self):
+        """
+        to_panel convert the aligned collection into Time_Series_Panel
+        
+        every Time_Series_Data must have the same time index
+        (see pad_time_index or remove_different_time_index),
+        the same data and labels and one dimensional data and labels.
+        
+        Returns
+        -------
+        Time_Series_Panel
+        
+        Raises
+        ------
+        ValueError
+            empty collection, the time index is not aligned
+            or the data and labels differ between categories
+        """
+        categories = list(self._time_series_data_collection.keys())
+        if len(categories) == 0:
+            raise ValueError('empty Time_Series_Data_Collection')
+        first = self._time_series_data_collection[categories[0]]
+        timeix = first.time_index[self._time_series_Ix]
+        for i in categories[1:]:
+            if not np.array_equal(self._time_series_data_collection[i].time_index[self._time_series_Ix],timeix):
+                raise ValueError('time index is not aligned, use pad_time_index or remove_different_time_index first')
+        features = self._panel_features(categories,'data')
+        labelFeatures = self._panel_features(categories,'labels')
+        values = self._stack_panel(categories,features,'data',len(timeix))
+        labels = self._stack_panel(categories,labelFeatures,'labels',len(timeix))
+        return Time_Series_Panel(
+            values,categories,timeix,features,
+            labels,labelFeatures,
+            self._time_series_Ix,self._categoryIx
+            )
+
+    def _panel_features(self,categories,outputType):
+        # the features of first category, the other categories must have the same
+        features = list(getattr(self._time_series_data_collection[categories[0]],outputType).keys())
+        for c in categories[1:]:
+            other = getattr(self._time_series_data_collection[c],outputType)
+            for f in features:
+                if f not in other:
+                    raise ValueError(f'{outputType} {f} does not exist in category {c}')
+            for f in other:
+                if f not in features:
+                    raise ValueError(f'{outputType} {f} of category {c} does not exist in category {categories[0]}')
+        return features
+
+    def _stack_panel(self,categories,features,outputType,length):
+        arrList = [
+            getattr(self._time_series_data_collection[c],outputType)[f]
+            for c in categories for f in features
+            ]
+        if any(arr.ndim != 1 for arr in arrList):
+            raise ValueError('Time_Series_Panel only supports one dimensional data')
+        res = np.empty((len(categories),length,len(features)),dtype=_panel_dtype(arrList))
+        for ix,arr in enumerate(arrList):
+            res[ix//len(features),:,ix%len(features)] = arr
+        return res
+
     def sort(self,ascending=True,categoryList=None):
         """
         sort sort the Time_Series_Data for specific keys or all keys
@@ -655,7 +1211,7 @@ class Time_Series_Data_Collection(object):
                 return False
         return True
         
-    def dropna(self,categoryKey = None):
+    def dropna(self,categoryKey = None,how='any',subset=None,thresh=None):
         """
         dropna drop null values by a specific key or all
         
@@ -665,6 +1221,13 @@ class Time_Series_Data_Collection(object):
         ----------
         categoryKey : str or numeric data, optional
             the key of target data, by default None
+        how : {'any','all'}, optional
+            drop the time index if any or all of the columns are null, by default 'any'
+        subset : list of str, optional
+            the data or labels to be checked, if None all are checked, by default None
+        thresh : int, optional
+            keep the time index with at least thresh non null columns, 
+            it overrides how, by default None
         
         Returns
         -------
@@ -672,5 +1235,228 @@ class Time_Series_Data_Collection(object):
         """
         for i in self.time_series_data_collection:
             if categoryKey is None or i == categoryKey:
-                self._time_series_data_collection[i] = self._time_series_data_collection[i].dropna()
+                self._time_series_data_collection[i] = self._time_series_data_collection[i].dropna(how,subset,thresh)
         return self
+
+def _panel_dtype(arrList):
+    if len(arrList) == 0:
+        return np.dtype(float)
+    try:
+        return np.result_type(*arrList)
+    except TypeError:
+        return np.dtype(object)
+
+
+class Time_Series_Panel(object):
+    def __init__(self,values,category_index,time_index,data_index,labels=None,label_index=None,time_seriesIx='time',categoryIx='category'):
+        """
+        Time_Series_Panel the dense version of aligned Time_Series_Data_Collection
+        
+        data and labels are stored as (category, time, feature) arrays sharing
+        one time index. Hence, cross sectional operations (e.g. ranking or
+        normalizing across categories) run once over the whole panel
+        instead of looping over categories.
+        
+        Parameters
+        ----------
+        values : numpy array
+            the data with shape (category, time, feature)
+        category_index : list
+            the category of first axis
+        time_index : list
+            the time index of second axis
+        data_index : list of str
+            the data names of last axis
+        labels : numpy array, optional
+            the labels with shape (category, time, label), by default None
+        label_index : list of str, optional
+            the label names of last axis of labels, by default None
+        time_seriesIx : str, optional
+            the name of time index, by default 'time'
+        categoryIx : str, optional
+            the name of category, by default 'category'
+        
+        Raises
+        ------
+        ValueError
+            the shape does not match the indexes
+        """
+        self._category_index = list(category_index)
+        self._time_index = np.asarray(time_index)
+        self._time_seriesIx = time_seriesIx
+        self._categoryIx = categoryIx
+        self._values = self._validate(values,data_index)
+        self._data_index = list(data_index)
+        if labels is None:
+            label_index = []
+            labels = np.empty((len(self._category_index),len(self._time_index),0))
+        self._labels = self._validate(labels,label_index)
+        self._label_index = list(label_index)
+        # the (category, time, capacity) buffers of added features
+        self._buffers = {}
+
+    def _validate(self,arr,featureIndex):
+        arr = np.asarray(arr)
+        shape = (len(self._category_index),len(self._time_index),len(featureIndex))
+        if arr.shape != shape:
+            raise ValueError(f'the shape of panel {arr.shape} does not match the index {shape}')
+        return arr
+
+    @property
+    def values(self):
+        return self._values
+
+    @property
+    def labels(self):
+        return self._labels
+
+    @property
+    def category_index(self):
+        return self._category_index
+
+    @property
+    def time_index(self):
+        return self._time_index
+
+    @property
+    def data_index(self):
+        return self._data_index
+
+    @property
+    def label_index(self):
+        return self._label_index
+
+    @property
+    def shape(self):
+        return self._values.shape
+
+    def _locate(self,label):
+        if label in self._data_index:
+            return 'data',self._data_index.index(label)
+        if label in self._label_index:
+            return 'labels',self._label_index.index(label)
+        raise KeyError(label)
+
+    def __getitem__(self,label):
+        outputType,pos = self._locate(label)
+        if outputType == 'data':
+            return self._values[:,:,pos]
+        return self._labels[:,:,pos]
+
+    def set_feature(self,inputData,label,outputType='data'):
+        """
+        set_feature add or replace a (category, time) array
+        
+        Parameters
+        ----------
+        inputData : numpy array
+            the values with shape (category, time)
+        label : str
+            the name of feature
+        outputType : {'data','labels'}, optional
+            whether to store as data or labels, by default 'data'
+        
+        Returns
+        -------
+        self
+        """
+        inputData = np.asarray(inputData)
+        shape = (len(self._category_index),len(self._time_index))
+        if inputData.shape != shape:
+            raise ValueError(f'input shape {inputData.shape} does not match the panel {shape}')
+        if outputType == 'data':
+            self._values,self._data_index = self._set_array('data',self._values,self._data_index,inputData,label)
+        else:
+            self._labels,self._label_index = self._set_array('labels',self._labels,self._label_index,inputData,label)
+        return self
+
+    def _set_array(self,outputType,arr,featureIndex,inputData,label):
+        dtype = _panel_dtype([arr,inputData]) if len(featureIndex) > 0 else inputData.dtype
+        if label in featureIndex:
+            arr = arr.astype(dtype,copy=False)
+            arr[:,:,featureIndex.index(label)] = inputData
+            return arr,featureIndex
+        # the feature axis grows geometrically, so adding k features
+        # copies the panel O(log k) times instead of k times
+        n = arr.shape[2]
+        buffer = self._buffers.get(outputType)
+        if buffer is None or buffer.dtype != dtype or buffer.shape[2] <= n or arr.base is not buffer:
+            buffer = np.empty(arr.shape[:2]+(max(2*n,4),),dtype=dtype)
+            buffer[:,:,:n] = arr
+            self._buffers[outputType] = buffer
+        buffer[:,:,n] = inputData
+        return buffer[:,:,:n+1],featureIndex+[label]
+
+    def transform(self,inputLabels,newName,func,axis=None,*args,**kwargs):
+        """
+        transform run a function once over the whole panel
+        
+        Parameters
+        ----------
+        inputLabels : str or list of string
+            the input data pass into functions. the function receives
+            a (category, time) array for str or a (category, time, feature)
+            array for list of string
+        newName : str
+            the new name or prefix for the output data
+        func : function
+            the function for data manipulation.
+            the output can be (category, time) array, (category, time, n) array
+            (named as newName_0 ... newName_n) or dictionary of (category, time) arrays
+            (named as newName_key)
+        axis : int, optional
+            if not None, it is passed to the function as axis keyword, 
+            e.g. axis=0 for cross sectional operations, by default None
+        
+        Returns
+        -------
+        self
+        """
+        if isinstance(inputLabels,list):
+            located = [self._locate(i) for i in inputLabels]
+            arr = np.stack([self[i] for i in inputLabels],axis=-1)
+        else:
+            located = [self._locate(inputLabels)]
+            arr = self[inputLabels]
+        outputType = 'data' if any(t == 'data' for t,_ in located) else 'labels'
+        if axis is not None:
+            kwargs['axis'] = axis
+        res = func(arr,*args,**kwargs)
+        if isinstance(res,dict):
+            for k,v in res.items():
+                self.set_feature(v,f"{newName}_{k}",outputType)
+            return self
+        res = np.asarray(res)
+        if res.ndim == 3:
+            for ix in range(res.shape[2]):
+                self.set_feature(res[:,:,ix],f"{newName}_{ix}",outputType)
+            return self
+        return self.set_feature(res,newName,outputType)
+
+    def to_collection(self):
+        """
+        to_collection convert into Time_Series_Data_Collection
+        
+        the data of each category are read-only views of the panel
+        (copy-on-write, see Time_Series_Data.make_writable).
+        
+        Returns
+        -------
+        Time_Series_Data_Collection
+        """
+        dct = {}
+        for ix,category in enumerate(self._category_index):
+            tmp = Time_Series_Data(copy=False)
+            tmp.set_time_index(self._time_index,self._time_seriesIx)
+            for pos,d in enumerate(self._data_index):
+                tmp.set_data(self._values[ix,:,pos],d)
+            for pos,l in enumerate(self._label_index):
+                tmp.set_labels(self._labels[ix,:,pos],l)
+            dct[category] = tmp
+        return Time_Series_Data_Collection(dct,self._time_seriesIx,self._categoryIx,copy=False)
+
+    def __repr__(self):
+        return (
+            f"Time_Series_Panel(category={len(self._category_index)}, "
+            f"time={len(self._time_index)}, data={self._data_index}, labels={self._label_index})"
+            )
@@ -0,0 +1,321 @@
+import numpy as np
+from collections.abc import MutableMapping
+from time_series_transform.transform_core_api.window import Window_Array
+from time_series_transform.transform_core_api.growable import Growable_Array
+
+
+class Block_Manager(MutableMapping):
+
+    def __init__(self,columns=None):
+        """
+        Block_Manager columnar block storage for Time_Series_Data
+
+        It behaves like the dictionary of numpy arrays used by Time_Series_Data,
+        but one dimensional columns sharing the same dtype are consolidated
+        into one contiguous 2-D block (column, time). Hence, slicing rows
+        becomes one fancy-index per dtype block instead of one per column.
+        Columns with higher dimension (e.g. sequence data) are kept as
+        standalone blocks.
+
+        Parameters
+        ----------
+        columns : dict of list, optional
+            initial columns, by default None
+        """
+        self._blocks = {}
+        self._items = {}
+        # the growable buffer (time major) of extended blocks, and the blocks
+        # shared with the shallow copies
+        self._buffers = {}
+        self._shared = set()
+        self._nextBlockId = 0
+        self._consolidated = True
+        if columns is not None:
+            for i in columns:
+                self[i] = columns[i]
+
+    def _add_block(self,block):
+        blockId = self._nextBlockId
+        self._blocks[blockId] = block
+        self._nextBlockId += 1
+        return blockId
+
+    def __getitem__(self,key):
+        blockId,pos = self._items[key]
+        if pos is None:
+            return self._blocks[blockId]
+        return self._blocks[blockId][pos]
+
+    def __setitem__(self,key,value):
+        if key in self._items:
+            del self[key]
+        if not isinstance(value,Window_Array):
+            value = np.asarray(value)
+        if value.ndim != 1:
+            self._items[key] = (self._add_block(value),None)
+            return
+        self._items[key] = (self._add_block(value[np.newaxis]),0)
+        self._consolidated = False
+
+    def __delitem__(self,key):
+        blockId,_ = self._items.pop(key)
+        if any(b == blockId for b,_ in self._items.values()):
+            # the dead column is dropped on the next consolidation
+            self._consolidated = False
+            return
+        self._drop_block(blockId)
+
+    def _drop_block(self,blockId):
+        self._blocks.pop(blockId)
+        self._buffers.pop(blockId,None)
+        self._shared.discard(blockId)
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __repr__(self):
+        return str(dict(self))
+
+    def copy(self):
+        """
+        copy shallow copy sharing the underlying blocks
+
+        Returns
+        -------
+        Block_Manager
+        """
+        res = Block_Manager()
+        res._blocks = dict(self._blocks)
+        res._items = dict(self._items)
+        res._buffers = dict(self._buffers)
+        # both sides copy the block before writing into it
+        self._shared.update(self._blocks)
+        res._shared = set(self._shared)
+        res._nextBlockId = self._nextBlockId
+        res._consolidated = self._consolidated
+        return res
+
+    def move_to_end(self,key):
+        """
+        move_to_end move the column to the end of column order
+
+        the block is not changed, so it stays consolidated
+
+        Parameters
+        ----------
+        key : str
+            the column name
+        """
+        self._items[key] = self._items.pop(key)
+
+    @property
+    def nblocks(self):
+        return len(self._blocks)
+
+    def consolidate(self):
+        """
+        consolidate group one dimensional columns by dtype
+
+        each dtype ends up in one contiguous 2-D block
+
+        Returns
+        -------
+        self
+        """
+        if self._consolidated:
+            return self
+        groups = {}
+        for key,(blockId,pos) in self._items.items():
+            if pos is None:
+                continue
+            groups.setdefault(self._blocks[blockId].dtype,[]).append(key)
+        standalone = {k:v for k,v in self._items.items() if v[1] is None}
+        blocks = {b:self._blocks[b] for b,_ in standalone.values()}
+        items = {}
+        for dtype,keys in groups.items():
+            block = np.empty((len(keys),self[keys[0]].shape[0]),dtype=dtype)
+            for pos,key in enumerate(keys):
+                block[pos] = self[key]
+            blockId = self._nextBlockId
+            self._nextBlockId += 1
+            blocks[blockId] = block
+            for pos,key in enumerate(keys):
+                items[key] = (blockId,pos)
+        # keep the insertion order of columns
+        self._items = {k:items.get(k,standalone.get(k)) for k in self._items}
+        self._blocks = blocks
+        self._buffers = {b:v for b,v in self._buffers.items() if b in blocks}
+        self._shared.intersection_update(blocks)
+        self._consolidated = True
+        return self
+
+    def _time_major(self,blockId):
+        # the block as (time, ...) array, the 1-D columns are the rows of their block
+        block = self._blocks[blockId]
+        if any(b == blockId and pos is not None for b,pos in self._items.values()):
+            return block.T
+        return block
+
+    def _owns(self,blockId):
+        # the block is only written in place if no other array or Block_Manager shares it
+        if blockId in self._shared:
+            return False
+        if blockId in self._buffers:
+            return self._buffers[blockId].owns(self._time_major(blockId))
+        block = self._blocks[blockId]
+        return isinstance(block,np.ndarray) and block.base is None and block.flags.writeable
+
+    def writable(self,key):
+        """
+        writable copy-on-write access of one column
+
+        the columns are consolidated first, then the block of column is
+        copied once if it is shared (shallow copy, taken rows or read-only
+        input), the later writes stay in place. the returned row view is
+        the stored data until the next consolidation (setting or removing
+        a column), so call it again after that.
+
+        Parameters
+        ----------
+        key : str
+            the column name
+
+        Returns
+        -------
+        numpy array
+            the writable column stored in the block
+        """
+        self.consolidate()
+        blockId,_ = self._items[key]
+        if not self._owns(blockId):
+            if blockId in self._buffers:
+                # the appended block is copied into a new buffer, so it keeps growing in place
+                self._buffers.pop(blockId)
+                self._extend_block(blockId,self._time_major(blockId)[:0])
+            else:
+                self._blocks[blockId] = np.array(self._blocks[blockId])
+            self._shared.discard(blockId)
+        return self[key]
+
+    def _extend_block(self,blockId,values):
+        array = self._time_major(blockId)
+        buffer = self._buffers.get(blockId)
+        if buffer is None or not buffer.owns(array):
+            # the rows of block are kept contiguous
+            buffer = Growable_Array(array,order='F' if array is not self._blocks[blockId] else 'C')
+            self._buffers[blockId] = buffer
+            self._shared.discard(blockId)
+        view = buffer.extend(values)
+        self._blocks[blockId] = view if array is self._blocks[blockId] else view.T
+
+    def extend(self,rows):
+        """
+        extend append rows at the end of every column
+
+        each block is kept in a growable buffer (see Growable_Array) whose
+        capacity grows geometrically along the time axis, so appending is
+        amortized O(1) per row and the blocks stay consolidated.
+        the block shared with a shallow copy is only extended in place by
+        one of them (the rows of the other are never overwritten).
+
+        Parameters
+        ----------
+        rows : dict of numpy array
+            the new rows of every column
+
+        Returns
+        -------
+        self
+        """
+        self.consolidate()
+        byBlock = {}
+        for key,(blockId,pos) in self._items.items():
+            byBlock.setdefault(blockId,[]).append((key,pos))
+        for blockId,cols in byBlock.items():
+            if cols[0][1] is None:
+                self._extend_block(blockId,rows[cols[0][0]])
+                continue
+            block = self._blocks[blockId]
+            casting = 'same_kind' if block.dtype.kind in 'iufc' else 'safe'
+            values = {k:np.asarray(rows[k]) for k,_ in cols}
+            moved = [k for k,_ in cols if not np.can_cast(values[k].dtype,block.dtype,casting)]
+            kept = [(k,pos) for k,pos in cols if k not in moved]
+            if kept:
+                length = len(values[kept[0][0]])
+                new = np.zeros((length,block.shape[0]),dtype=block.dtype)
+                for k,pos in kept:
+                    new[:,pos] = values[k]
+                self._extend_block(blockId,new)
+            for k in moved:
+                # the values do not fit the dtype (e.g. int column with float values),
+                # the promoted column joins its dtype block on the next consolidation
+                self[k] = Growable_Array(self[k]).extend(values[k])
+        return self
+
+    def _take_blocks(self,indexer,keys):
+        # the taken blocks and (blockId, pos) of each selected column
+        self.consolidate()
+        byBlock = {}
+        for key in keys:
+            blockId,pos = self._items[key]
+            byBlock.setdefault(blockId,[]).append((key,pos))
+        blocks = {}
+        items = {}
+        for blockId,cols in byBlock.items():
+            block = self._blocks[blockId]
+            if cols[0][1] is None:
+                blocks[blockId] = block[indexer]
+                items[cols[0][0]] = (blockId,None)
+                continue
+            if len(cols) == block.shape[0]:
+                blocks[blockId] = block[:,indexer]
+                items.update({key:(blockId,pos) for key,pos in cols})
+                continue
+            blocks[blockId] = block[[pos for _,pos in cols]][:,indexer]
+            items.update({key:(blockId,ix) for ix,(key,_) in enumerate(cols)})
+        return blocks,{k:items[k] for k in keys}
+
+    def take(self,indexer,keys=None):
+        """
+        take slicing rows of every (or selected) columns
+
+        Parameters
+        ----------
+        indexer : slice, list of int, list of bool or numpy array
+            the row indexer
+        keys : list, optional
+            the selected columns, if None all columns are selected, by default None
+
+        Returns
+        -------
+        dict of numpy array
+        """
+        if keys is None:
+            keys = list(self._items.keys())
+        blocks,items = self._take_blocks(indexer,keys)
+        return {k:blocks[b] if pos is None else blocks[b][pos] for k,(b,pos) in items.items()}
+
+    def take_manager(self,indexer):
+        """
+        take_manager slicing rows of every column into a new Block_Manager
+
+        the taken blocks are kept as they are, so the result stays consolidated
+
+        Parameters
+        ----------
+        indexer : slice, list of int, list of bool or numpy array
+            the row indexer
+
+        Returns
+        -------
+        Block_Manager
+        """
+        blocks,items = self._take_blocks(indexer,list(self._items.keys()))
+        res = Block_Manager()
+        res._blocks = blocks
+        res._items = items
+        res._nextBlockId = self._nextBlockId
+        return res
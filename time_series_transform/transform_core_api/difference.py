@@ -0,0 +1,186 @@
+import numpy as np
+from functools import lru_cache
+import pandas as pd
+from scipy.signal import lfilter
+from time_series_transform.transform_core_api.acceleration import get_kernel
+
+
+@lru_cache(maxsize=64)
+def difference_weights(order=1):
+    """
+    difference_weights the weights of integer differencing
+
+    the coefficients of (1-B)^order, e.g. [1, -2, 1] for order 2,
+    the k-th weight is applied to the value k lags before.
+
+    Parameters
+    ----------
+    order : int, optional
+        number of differencing, by default 1
+
+    Returns
+    -------
+    numpy array
+        order+1 weights (read only)
+    """
+    if order < 0 or int(order) != order:
+        raise ValueError('order must be a non negative integer')
+    weights = fractional_weights(int(order),threshold=None,window=int(order)+1)
+    # cached, so it is shared by the callers
+    weights.setflags(write=False)
+    return weights
+
+
+def fractional_weights(d,threshold=1e-5,window=None):
+    """
+    fractional_weights the weights of fixed window fractional differencing
+
+    the coefficients of (1-B)^d by the recursion w_k = -w_{k-1}(d-k+1)/k,
+    they are cut when the absolute weight is less than threshold
+    or the number of weights reaches window.
+
+    Parameters
+    ----------
+    d : float
+        the differencing order, e.g. 0.4
+    threshold : float, optional
+        the minimum absolute weight, by default 1e-5
+    window : int, optional
+        the maximum number of weights, by default None
+
+    Returns
+    -------
+    numpy array
+    """
+    if d < 0:
+        raise ValueError('d must be non negative')
+    if threshold is None and window is None:
+        raise ValueError('either threshold or window is required')
+    weights = [1.]
+    k = 1
+    while window is None or k < window:
+        w = -weights[-1]*(d-k+1)/k
+        if threshold is not None and abs(w) < threshold:
+            break
+        weights.append(w)
+        k += 1
+    return np.array(weights)
+
+
+def _block(arr,axis):
+    # (time, series) block, the dictionary (list of inputLabels) is one column per key
+    if isinstance(arr,dict):
+        keys = list(arr.keys())
+        return np.column_stack([np.asarray(arr[k],dtype=float) for k in keys]),keys
+    arr = np.asarray(arr,dtype=float)
+    return (arr if axis == 0 else np.moveaxis(arr,axis,0)),None
+
+
+def _unblock(res,keys,axis):
+    if keys is not None:
+        return pd.DataFrame(dict(zip(keys,res.T)))
+    return res if axis == 0 else np.moveaxis(res,0,axis)
+
+
+def _apply_weights(values,weights,lag):
+    # res[t] = sum_k weights[k]*values[t-k*lag], written into the nan padded output
+    res = np.full(values.shape,np.nan)
+    span = (len(weights)-1)*lag
+    if span >= len(values):
+        return res
+    out = res[span:]
+    np.multiply(values[span:],weights[0],out=out)
+    scratch = None
+    for k in range(1,len(weights)):
+        shifted = values[span-k*lag:len(values)-k*lag]
+        if weights[k] == 1:
+            out += shifted
+        elif weights[k] == -1:
+            out -= shifted
+        elif weights[k] != 0:
+            if scratch is None:
+                scratch = np.empty(out.shape)
+            out += np.multiply(shifted,weights[k],out=scratch)
+    return res
+
+
+def _apply_filter(values,weights):
+    # dense weights (fractional) as one FIR filter
+    res = np.full(values.shape,np.nan)
+    span = len(weights)-1
+    if span < len(values):
+        res[span:] = lfilter(weights,[1.],values,axis=0)[span:]
+    return res
+
+
+def difference(arr,order=1,lag=1,axis=0):
+    """
+    difference integer and seasonal differencing in one pass
+
+    the differencing of given order is computed by the binomial weights,
+    so there is no intermediate array per order. with lag k it is the
+    seasonal differencing, e.g. X_t - X_t-k for order 1.
+    the first order*lag rows are nan.
+
+    Parameters
+    ----------
+    arr : numpy array or dict
+        input array (the time is the given axis) or dictionary of 1D arrays
+        (the list of inputLabels of Time_Series_Data), the output is DataFrame
+        of the same keys
+    order : int, optional
+        number of differencing, by default 1
+    lag : int, optional
+        the seasonal lag, by default 1
+    axis : int, optional
+        the time axis, by default 0
+
+    Returns
+    -------
+    numpy array or pandas DataFrame
+        the same shape as arr
+    """
+    if lag < 1:
+        raise ValueError('lag must be positive')
+    weights = difference_weights(order)
+    values,keys = _block(arr,axis)
+    kernel = get_kernel('differencing')
+    if kernel is not None:
+        shape = values.shape
+        res = kernel(np.ascontiguousarray(values.reshape(len(values),-1)),weights,int(lag)).reshape(shape)
+    else:
+        res = _apply_weights(values,weights,int(lag))
+    return _unblock(res,keys,axis)
+
+
+def fractional_difference(arr,d,threshold=1e-5,window=None,axis=0):
+    """
+    fractional_difference fixed window fractional differencing
+
+    it keeps the memory of series while making it stationary (d between 0 and 1).
+    the weights are computed by fractional_weights and applied as one
+    convolution, the first len(weights)-1 rows are nan.
+
+    Parameters
+    ----------
+    arr : numpy array or dict
+        input array (the time is the given axis) or dictionary of 1D arrays
+        (the list of inputLabels of Time_Series_Data), the output is DataFrame
+        of the same keys
+    d : float
+        the differencing order
+    threshold : float, optional
+        the minimum absolute weight, by default 1e-5
+    window : int, optional
+        the maximum number of weights, by default None
+    axis : int, optional
+        the time axis, by default 0
+
+    Returns
+    -------
+    numpy array or pandas DataFrame
+        the same shape as arr
+    """
+    weights = fractional_weights(d,threshold,window)
+    values,keys = _block(arr,axis)
+    return _unblock(_apply_filter(values,weights),keys,axis)
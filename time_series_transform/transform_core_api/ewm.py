@@ -0,0 +1,167 @@
+import numpy as np
+from scipy.signal import lfilter
+from time_series_transform.transform_core_api.acceleration import get_kernel
+
+
+def ewm_alpha(com=None,span=None,halflife=None,alpha=None):
+    """
+    ewm_alpha the smoothing factor of pandas ewm parameters
+
+    Parameters
+    ----------
+    com : float, optional
+        center of mass, by default None
+    span : float, optional
+        span, by default None
+    halflife : float, optional
+        half-life, by default None
+    alpha : float, optional
+        smoothing factor, by default None
+
+    Returns
+    -------
+    float
+
+    Raises
+    ------
+    ValueError
+        not exactly one of com, span, halflife and alpha, or out of range
+    """
+    params = [com,span,halflife,alpha]
+    if sum(p is not None for p in params) != 1:
+        raise ValueError('one of com, span, halflife and alpha is required')
+    if com is not None:
+        if com < 0:
+            raise ValueError('com must satisfy: com >= 0')
+    elif span is not None:
+        if span < 1:
+            raise ValueError('span must satisfy: span >= 1')
+        com = (span-1)/2
+    elif halflife is not None:
+        if halflife <= 0:
+            raise ValueError('halflife must satisfy: halflife > 0')
+        com = 1/(1-np.exp(np.log(0.5)/halflife))-1
+    else:
+        if alpha <= 0 or alpha > 1:
+            raise ValueError('alpha must satisfy: 0 < alpha <= 1')
+        com = (1-alpha)/alpha
+    return 1./(1.+com)
+
+
+def _ewm_recurrence(values,alpha,adjust,ignore_na):
+    # the recurrence of pandas (ewma of pandas window aggregations),
+    # time is the first axis and the series are updated together
+    kernel = get_kernel('ewm')
+    if kernel is not None:
+        return kernel(np.ascontiguousarray(values),alpha,adjust,ignore_na)
+    res = np.empty(values.shape)
+    weighted = values[0].copy()
+    oldWeight = np.ones(values.shape[1])
+    newWeight = 1. if adjust else alpha
+    res[0] = weighted
+    for i in range(1,len(values)):
+        cur = values[i]
+        isObservation = ~np.isnan(cur)
+        started = ~np.isnan(weighted)
+        decay = started & (isObservation | (not ignore_na))
+        oldWeight[decay] *= 1.-alpha
+        update = started & isObservation & (weighted != cur)
+        weighted[update] = (oldWeight[update]*weighted[update]+newWeight*cur[update])/(oldWeight[update]+newWeight)
+        observed = started & isObservation
+        oldWeight[observed] = oldWeight[observed]+newWeight if adjust else 1.
+        first = ~started & isObservation
+        weighted[first] = cur[first]
+        res[i] = weighted
+    return res
+
+
+def _ewm_filter(values,alpha,adjust):
+    # weighted sum of observations and sum of weights as two linear filters,
+    # the first observation weights 1 and the others newWeight
+    valid = ~np.isnan(values)
+    complete = valid.all()
+    decay = [1.,-(1.-alpha)]
+    if complete and not adjust:
+        # the sum of weights is always 1, the initial state makes the first mean x0
+        return lfilter([alpha],decay,values,axis=0,zi=(1.-alpha)*values[:1])[0]
+    if complete:
+        # the weights of complete series are the same, so they are filtered once
+        return lfilter([1.],decay,values,axis=0)/lfilter([1.],decay,np.ones((len(values),1)),axis=0)
+    weights = valid.astype(float)
+    if not adjust:
+        weights *= alpha
+        first = np.argmax(valid,axis=0)
+        series = np.arange(values.shape[1])
+        weights[first,series] = valid[first,series]
+    numerator = lfilter([1.],decay,np.where(valid,values,0.)*weights,axis=0)
+    denominator = lfilter([1.],decay,weights,axis=0)
+    with np.errstate(divide='ignore',invalid='ignore'):
+        res = numerator/denominator
+    # missing rows keep the last mean (the weights may underflow in long gaps)
+    rows = np.maximum.accumulate(np.where(valid,np.arange(len(values))[:,None],0),axis=0)
+    return np.take_along_axis(res,rows,axis=0)
+
+
+def _has_gap(valid):
+    # any nan after the first observation
+    started = np.maximum.accumulate(valid,axis=0)
+    return (started & ~valid).any(axis=0)
+
+
+def ewm_mean(arr,com=None,span=None,halflife=None,alpha=None,adjust=True,min_periods=0,ignore_na=False,axis=0):
+    """
+    ewm_mean exponentially weighted mean without building DataFrame
+
+    the result is the same as pandas ewm().mean(). series are computed
+    together by two linear filters (scipy lfilter) of the weighted
+    observations and the weights, series having gaps with adjust=False
+    or ignore_na=True use the pandas recurrence.
+
+    Parameters
+    ----------
+    arr : numpy array
+        input array, 1D or 2D
+    com : float, optional
+        center of mass, by default None
+    span : float, optional
+        span, by default None
+    halflife : float, optional
+        half-life, by default None
+    alpha : float, optional
+        smoothing factor, by default None
+    adjust : bool, optional
+        whether to divide by the decaying adjustment factor, by default True
+    min_periods : int, optional
+        minimum number of observations, by default 0
+    ignore_na : bool, optional
+        whether to ignore missing values when calculating weights, by default False
+    axis : int, optional
+        the time axis, by default 0
+
+    Returns
+    -------
+    numpy array
+        the same shape as arr
+    """
+    alpha = ewm_alpha(com,span,halflife,alpha)
+    arr = np.moveaxis(np.asarray(arr,dtype=float),axis,0)
+    shape = arr.shape
+    values = arr.reshape(len(arr),-1)
+    res = np.full(values.shape,np.nan)
+    if len(values) == 0:
+        return np.moveaxis(res.reshape(shape),0,axis)
+    valid = ~np.isnan(values)
+    if adjust and not ignore_na:
+        recurrence = np.zeros(values.shape[1],dtype=bool)
+    else:
+        recurrence = _has_gap(valid)
+    if not recurrence.any():
+        res = _ewm_filter(values,alpha,adjust)
+    else:
+        if (~recurrence).any():
+            res[:,~recurrence] = _ewm_filter(values[:,~recurrence],alpha,adjust)
+        res[:,recurrence] = _ewm_recurrence(values[:,recurrence],alpha,adjust,ignore_na)
+    minPeriods = max(int(min_periods),1)
+    if minPeriods > 1 or not valid.all():
+        res[np.cumsum(valid,axis=0) < minPeriods] = np.nan
+    return np.moveaxis(res.reshape(shape),0,axis)
@@ -0,0 +1,288 @@
+import os
+import shutil
+import tempfile
+import threading
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from joblib import Parallel, delayed, effective_n_jobs
+
+
+_THREAD_POOLS = {}
+_THREAD_POOLS_LOCK = threading.Lock()
+
+
+def get_thread_pool(n_jobs=-1):
+    """
+    get_thread_pool the persistent thread pool of given size
+
+    the pool is created on the first call and reused by the later calls,
+    so there is no startup cost per transform.
+
+    Parameters
+    ----------
+    n_jobs : int, optional
+        number of threads (joblib convention, -1 means all cpus), by default -1
+
+    Returns
+    -------
+    concurrent.futures.ThreadPoolExecutor
+    """
+    nWorkers = effective_n_jobs(n_jobs)
+    with _THREAD_POOLS_LOCK:
+        if nWorkers not in _THREAD_POOLS:
+            _THREAD_POOLS[nWorkers] = ThreadPoolExecutor(
+                max_workers=nWorkers,thread_name_prefix='time_series_transform'
+                )
+        return _THREAD_POOLS[nWorkers]
+
+
+def thread_map(func,items,n_jobs=-1):
+    """
+    thread_map apply the function to every item in the persistent thread pool
+
+    it fits numpy kernels releasing the GIL, the data is shared instead of pickled.
+
+    Parameters
+    ----------
+    func : function
+        the function of one item
+    items : iterable
+        the inputs
+    n_jobs : int, optional
+        number of threads, by default -1
+
+    Returns
+    -------
+    list
+        the outputs in the order of items
+    """
+    return list(get_thread_pool(n_jobs).map(func,items))
+
+
+def _column_updates(time_series_data,before):
+    updates = {'data':{},'labels':{}}
+    for outputType in updates:
+        dictionary = getattr(time_series_data,outputType)
+        for k in dictionary:
+            if before.get(k) is not dictionary[k]:
+                updates[outputType][k] = dictionary[k]
+    return updates
+
+
+def _transform_updates(time_series_data,inputLabels,newName,func,args,kwargs):
+    # the changed columns are the outputs of func (by label), the row views
+    # of block storage are new objects on every lookup, so identity can not tell them
+    arr,outputType = time_series_data._transform_output(inputLabels,newName,func,*args,**kwargs)
+    getattr(time_series_data,'_'+outputType).update(arr)
+    updates = {'data':{},'labels':{}}
+    updates[outputType].update(arr)
+    return updates
+
+
+def _transform_batch(batch,inputLabels,newName,func,args,kwargs):
+    res = {}
+    for category,time_series_data in batch:
+        res[category] = _transform_updates(time_series_data,inputLabels,newName,func,args,kwargs)
+    return res
+
+
+def _memmap_batch(inputPaths,outputSpec,outputPaths,batch,inputLabels,newName,func,args,kwargs):
+    from time_series_transform.transform_core_api.base import Time_Series_Data
+    inputs = {k:np.load(v,mmap_mode='r') for k,v in inputPaths.items()}
+    outputs = {k:np.load(v,mmap_mode='r+') for k,v in outputPaths.items()}
+    res = {}
+    for category,offset,length in batch:
+        time_series_data = Time_Series_Data(copy=False)
+        time_series_data.time_length = length
+        for (outputType,k),arr in inputs.items():
+            getattr(time_series_data,'_'+outputType)[k] = arr[offset:offset+length]
+        updates = _transform_updates(time_series_data,inputLabels,newName,func,args,kwargs)
+        # columns matching the probed spec are written into the shared buffers,
+        # the others (e.g. different dtype) are sent back as usual
+        for outputType in updates:
+            for k in list(updates[outputType].keys()):
+                arr = updates[outputType][k]
+                if outputSpec.get((outputType,k)) == _column_spec(arr):
+                    outputs[(outputType,k)][offset:offset+length] = arr
+                    del updates[outputType][k]
+        res[category] = updates
+    for arr in outputs.values():
+        arr.flush()
+    return res
+
+
+def _column_spec(arr):
+    if not isinstance(arr,np.ndarray) or arr.dtype.kind in 'OV':
+        return None
+    return (arr.dtype.str,arr.shape[1:])
+
+
+class Category_Executor(object):
+    def __init__(self,n_jobs=1,verbose=0,backend='loky',batchSize=None,tempFolder=None):
+        """
+        Category_Executor per category execution of Time_Series_Data.transform
+
+        workers only receive the input columns of each category, the
+        categories are sent in batches (one task per batch instead of one
+        per category) and the new columns are sent back as column updates.
+        if n_jobs is 1, it runs in a serial loop without joblib.
+
+        with the thread_pool backend, the batches run in a persistent thread
+        pool (see get_thread_pool) and transform the categories in place.
+        with the memmap backend, the input columns of all categories are
+        written once into memory mapped files and the workers only receive
+        (category, offset, length). the output columns are probed on the
+        first category and preallocated as memory mapped files, so workers
+        write the results in place instead of pickling them back.
+
+        Parameters
+        ----------
+        n_jobs : int, optional
+            number of processes (joblib), by default 1
+        verbose : int, optional
+            log level (joblib), by default 0
+        backend : str, optional
+            backend type (joblib), 'thread_pool' (persistent threads) or
+            'memmap' (loky processes with memory mapped inputs and outputs),
+            by default 'loky'
+        batchSize : int, optional
+            number of categories per task, if None the categories are
+            split into 4 batches per worker, by default None
+        tempFolder : str, optional
+            the folder of memory mapped files, if None the system
+            temporary folder is used, by default None
+        """
+        self.n_jobs = n_jobs
+        self.verbose = verbose
+        self.backend = backend
+        self.batchSize = batchSize
+        self.tempFolder = tempFolder
+
+    def _input_only(self,time_series_data,inputLabels):
+        from time_series_transform.transform_core_api.base import Time_Series_Data
+        # plain dictionaries, so block storage does not ship whole blocks
+        res = Time_Series_Data(copy=time_series_data._copy)
+        res.time_length = time_series_data.time_length
+        for k in inputLabels:
+            if k in time_series_data.data:
+                res._data[k] = time_series_data.data[k]
+            else:
+                res._labels[k] = time_series_data.labels[k]
+        return res
+
+    def _batches(self,categories,nWorkers):
+        if self.batchSize is not None:
+            nBatches = int(np.ceil(len(categories)/self.batchSize))
+        else:
+            nBatches = nWorkers*4
+        nBatches = max(min(nBatches,len(categories)),1)
+        return [list(i) for i in np.array_split(np.arange(len(categories)),nBatches)]
+
+    def _apply(self,collection,results):
+        for category,updates in results.items():
+            time_series_data = collection[category]
+            time_series_data._data.update(updates['data'])
+            time_series_data._labels.update(updates['labels'])
+
+    def _input_spec(self,collection,categories,labelList):
+        res = {}
+        for k in labelList:
+            outputType = 'data' if k in collection[categories[0]].data else 'labels'
+            specs = {_column_spec(getattr(collection[c],outputType).get(k)) for c in categories}
+            if len(specs) != 1 or None in specs:
+                return None
+            res[(outputType,k)] = specs.pop()
+        return res
+
+    def _open_buffer(self,folder,name,spec,length):
+        path = os.path.join(folder,f'{name}.npy')
+        return path,np.lib.format.open_memmap(path,mode='w+',dtype=spec[0],shape=(int(length),)+spec[1])
+
+    def _memmap_transform(self,collection,categories,labelList,nWorkers,probe,inputLabels,newName,func,args,kwargs):
+        inputSpec = self._input_spec(collection,categories,labelList)
+        if inputSpec is None:
+            # object or ragged inputs can not be memory mapped
+            return self._parallel_transform(collection,categories,labelList,nWorkers,'loky',inputLabels,newName,func,args,kwargs)
+        lengths = [collection[c].time_length for c in categories]
+        offsets = np.concatenate([[0],np.cumsum(lengths)]).astype(int)
+        folder = tempfile.mkdtemp(prefix='time_series_transform_',dir=self.tempFolder)
+        try:
+            inputPaths = {}
+            for n,(key,spec) in enumerate(inputSpec.items()):
+                inputPaths[key],arr = self._open_buffer(folder,f'input_{n}',spec,offsets[-1])
+                for ix,c in enumerate(categories):
+                    arr[offsets[ix]:offsets[ix+1]] = getattr(collection[c],key[0])[key[1]]
+                arr.flush()
+                del arr
+            outputSpec = {}
+            outputPaths = {}
+            for outputType,updates in probe.items():
+                for k,arr in updates.items():
+                    spec = _column_spec(arr)
+                    if spec is not None:
+                        outputSpec[(outputType,k)] = spec
+                        outputPaths[(outputType,k)],_ = self._open_buffer(folder,f'output_{len(outputPaths)}',spec,offsets[-1])
+            tasks = []
+            for batch in self._batches(categories,nWorkers):
+                batch = [(categories[ix],offsets[ix],lengths[ix]) for ix in batch]
+                tasks.append(delayed(_memmap_batch)(inputPaths,outputSpec,outputPaths,batch,inputLabels,newName,func,args,kwargs))
+            results = {}
+            for res in Parallel(n_jobs=self.n_jobs,verbose=self.verbose,backend='loky')(tasks):
+                results.update(res)
+            for (outputType,k),path in outputPaths.items():
+                out = np.array(np.load(path,mmap_mode='r'))
+                for ix,c in enumerate(categories):
+                    if k not in results[c][outputType]:
+                        results[c][outputType][k] = out[offsets[ix]:offsets[ix+1]]
+            self._apply(collection,results)
+        finally:
+            shutil.rmtree(folder,ignore_errors=True)
+        return collection
+
+    def _parallel_transform(self,collection,categories,labelList,nWorkers,backend,inputLabels,newName,func,args,kwargs):
+        tasks = []
+        for batch in self._batches(categories,nWorkers):
+            batch = [(categories[ix],self._input_only(collection[categories[ix]],labelList)) for ix in batch]
+            tasks.append(delayed(_transform_batch)(batch,inputLabels,newName,func,args,kwargs))
+        for results in Parallel(n_jobs=self.n_jobs,verbose=self.verbose,backend=backend)(tasks):
+            self._apply(collection,results)
+        return collection
+
+    def transform(self,collection,inputLabels,newName,func,*args,**kwargs):
+        """
+        transform apply Time_Series_Data.transform for each category
+
+        Parameters
+        ----------
+        collection : Time_Series_Data_Collection
+            the target collection, it is updated in place
+        inputLabels : str or list of string
+            the input data pass into functions
+        newName : str
+            the new name or prefix for the output data
+        func : function
+            the function for data manipulation
+
+        Returns
+        -------
+        Time_Series_Data_Collection
+        """
+        categories = list(collection.time_series_data_collection.keys())
+        nWorkers = effective_n_jobs(self.n_jobs)
+        if nWorkers == 1 or len(categories) <= 1:
+            for c in categories:
+                collection[c].transform(inputLabels,newName,func,*args,**kwargs)
+            return collection
+        if self.backend == 'thread_pool':
+            # threads share the data, so each category is transformed in place
+            def run(batch):
+                for ix in batch:
+                    collection[categories[ix]].transform(inputLabels,newName,func,*args,**kwargs)
+            thread_map(run,self._batches(categories,nWorkers),self.n_jobs)
+            return collection
+        labelList = inputLabels if isinstance(inputLabels,list) else [inputLabels]
+        if self.backend != 'memmap':
+            return self._parallel_transform(collection,categories,labelList,nWorkers,self.backend,inputLabels,newName,func,args,kwargs)
+        # the first category is computed here to probe the output columns
+        probe = _transform_batch([(categories[0],collection[categories[0]])],inputLabels,newName,func,args,kwargs)[categories[0]]
+        return self._memmap_transform(collection,categories[1:],labelList,nWorkers,probe,inputLabels,newName,func,args,kwargs)
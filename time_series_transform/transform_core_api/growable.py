@@ -0,0 +1,100 @@
+import numpy as np
+
+
+class Growable_Array(object):
+    def __init__(self,array,growth=2,order='C'):
+        """
+        Growable_Array the append-only buffer of one column
+
+        the buffer keeps spare capacity which grows geometrically,
+        so appending rows is amortized O(1) per row. the column is the
+        view of the first rows of the buffer.
+
+        Parameters
+        ----------
+        array : numpy array
+            the initial values
+        growth : int, optional
+            the factor of capacity growth, by default 2
+        order : {'C','F'}, optional
+            the memory layout of buffer, 'F' keeps each column of 2-D buffer
+            contiguous (e.g. the rows of Block_Manager block), by default 'C'
+        """
+        array = np.asarray(array)
+        self._growth = growth
+        self._order = order
+        # the buffer is made to be extended, so it starts with spare capacity
+        self._buffer = np.empty((max(int(len(array)*growth),8),)+array.shape[1:],dtype=array.dtype,order=order)
+        self._buffer[:len(array)] = array
+        self._length = len(array)
+        self._view = self._buffer[:self._length]
+
+    @property
+    def array(self):
+        return self._view
+
+    @property
+    def capacity(self):
+        return len(self._buffer)
+
+    def owns(self,array):
+        """
+        owns whether the array is the current view of the buffer
+
+        the view returned before the latest extend (or held by a shallow copy)
+        is not owned, so extending it never overwrites others' rows.
+        an equal view of the buffer (e.g. a row of Block_Manager block
+        wrapping the view) is owned as well.
+
+        Parameters
+        ----------
+        array : numpy array
+
+        Returns
+        -------
+        bool
+        """
+        view = self._view
+        if array is view:
+            return True
+        return (
+            isinstance(array,np.ndarray) and array.base is self._buffer
+            and array.dtype == view.dtype and array.shape == view.shape
+            and array.strides == view.strides
+            and array.__array_interface__['data'][0] == view.__array_interface__['data'][0]
+            )
+
+    def extend(self,values):
+        """
+        extend append values at the end of buffer
+
+        the dtype is promoted if the values do not fit into it
+        (e.g. int column with float values).
+
+        Parameters
+        ----------
+        values : numpy array
+            the new rows
+
+        Returns
+        -------
+        numpy array
+            the new view of the buffer
+        """
+        values = np.asarray(values)
+        dtype = self._buffer.dtype
+        casting = 'same_kind' if dtype.kind in 'iufc' else 'safe'
+        if values.dtype != dtype and not np.can_cast(values.dtype,dtype,casting):
+            try:
+                dtype = np.result_type(dtype,values.dtype)
+            except TypeError:
+                dtype = np.dtype(object)
+        need = self._length+len(values)
+        if need > len(self._buffer) or dtype != self._buffer.dtype:
+            buffer = np.empty((max(need,int(len(self._buffer)*self._growth)),)+self._buffer.shape[1:],dtype=dtype,order=self._order)
+            buffer[:self._length] = self._buffer[:self._length]
+            self._buffer = buffer
+        self._buffer[self._length:need] = values
+        self._length = need
+        self._view = self._buffer[:self._length]
+        return self._view
@@ -0,0 +1,218 @@
+FUSABLE_OPS = {
+    'lag':'shift',
+    'lead':'shift',
+    'lag_sequence':'window',
+    'lead_sequence':'window'
+    }
+
+
+class Plan_Node(object):
+    def __init__(self,op,inputs,outputs,method,kwargs=None,args=(),opaque=False):
+        """
+        Plan_Node one column derivation of the lazy plan
+
+        Parameters
+        ----------
+        op : str
+            the operation type, e.g. lag, lead, lag_sequence, lead_sequence,
+            identity, stack, transform or remove
+        inputs : list
+            the labels read by the operation
+        outputs : list
+            the labels written (or removed) by the operation
+        method : str
+            the Time_Series_Transformer method replaying the operation
+        kwargs : dict, optional
+            keyword arguments of method, by default None
+        args : tuple, optional
+            positional arguments of method, by default ()
+        opaque : bool, optional
+            whether the outputs are unknown before execution
+            (e.g. a customized transform), opaque node is never pruned, by default False
+        """
+        self.op = op
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.method = method
+        self.kwargs = {} if kwargs is None else kwargs
+        self.args = args
+        self.opaque = opaque
+        self.order = None
+
+    def __repr__(self):
+        return f"{self.op}({', '.join(map(str,self.inputs))}) -> {', '.join(map(str,self.outputs))}"
+
+
+class Plan_Group(object):
+    def __init__(self,kind,inputLabel,params,nodes):
+        """
+        Plan_Group fused operations sharing one input
+
+        shift groups compute every lag and lead in one 2-D buffer,
+        window groups compute every lag and lead sequence from one window view.
+
+        Parameters
+        ----------
+        kind : {'shift','window'}
+            the group type
+        inputLabel : str
+            the shared input label
+        params : dict
+            the shared parameters (e.g. fillMissing, windowSize)
+        nodes : list of Plan_Node
+            the fused nodes
+        """
+        self.kind = kind
+        self.inputLabel = inputLabel
+        self.params = params
+        self.nodes = nodes
+
+    @property
+    def outputs(self):
+        return [o for n in self.nodes for o in n.outputs]
+
+    def __repr__(self):
+        return f"fused_{self.kind}({self.inputLabel}) -> {', '.join(map(str,self.outputs))}"
+
+
+class Plan(object):
+    def __init__(self):
+        """
+        Plan the logical plan (DAG of column derivations) of lazy Time_Series_Transformer
+
+        operations are recorded in order, optimize prunes the dead columns
+        and fuses consecutive lag, lead and sequence operations.
+        """
+        self._nodes = []
+
+    @property
+    def nodes(self):
+        return self._nodes
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def add(self,node):
+        node.order = len(self._nodes)
+        self._nodes.append(node)
+        return self
+
+    def clear(self):
+        self._nodes = []
+        return self
+
+    def positions(self):
+        """
+        positions the first insertion order of each output
+
+        eager execution inserts the output at its first writer (the later
+        writers overwrite it in place), the removal makes the next writer
+        insert it again. opaque outputs are unknown, so they are not included.
+
+        Returns
+        -------
+        dict
+            the output label and the order of its inserting node
+        """
+        res = {}
+        for node in self._nodes:
+            for o in node.outputs:
+                if node.op == 'remove':
+                    res.pop(o,None)
+                elif not node.opaque:
+                    res.setdefault(o,node.order)
+        return res
+
+    def prune(self):
+        """
+        prune remove the nodes whose outputs are never read
+
+        the output is dead if it is removed or overwritten before
+        any other node reads it.
+
+        Returns
+        -------
+        list of Plan_Node
+        """
+        dead = set()
+        res = []
+        for node in reversed(self._nodes):
+            if node.op == 'remove':
+                dead.update(node.outputs)
+                res.append(node)
+                continue
+            if not node.opaque:
+                if all(o in dead for o in node.outputs):
+                    continue
+                dead.update(node.outputs)
+            dead.difference_update(node.inputs)
+            res.append(node)
+        return res[::-1]
+
+    def _fusion_key(self,node):
+        kind = FUSABLE_OPS.get(node.op)
+        if kind is None:
+            return None
+        params = {
+            'fillMissing':node.kwargs.get('fillMissing'),
+            'n_jobs':node.kwargs.get('n_jobs'),
+            'verbose':node.kwargs.get('verbose')
+            }
+        if kind == 'window':
+            params['windowSize'] = node.kwargs['windowSize']
+        return (kind,node.inputs[0],tuple(sorted((k,repr(v)) for k,v in params.items()))),params
+
+    def _conflict(self,node,run):
+        written = {o for n in run for o in n.outputs}
+        read = {i for n in run for i in n.inputs}
+        return bool(written.intersection(node.inputs) or written.intersection(node.outputs) or read.intersection(node.outputs))
+
+    def _fuse_run(self,run):
+        groups = {}
+        for node in run:
+            key,params = self._fusion_key(node)
+            if key not in groups:
+                groups[key] = Plan_Group(key[0],key[1],params,[])
+            groups[key].nodes.append(node)
+        return [g if len(g.nodes) > 1 else g.nodes[0] for g in groups.values()]
+
+    def optimize(self):
+        """
+        optimize prune dead columns and fuse consecutive lag, lead and sequence operations
+
+        Returns
+        -------
+        list of steps
+            each step is Plan_Node, Plan_Group or list of them (one fused run),
+            the column order is restored by positions after execution
+        """
+        steps = []
+        run = []
+        for node in self.prune():
+            fusable = self._fusion_key(node) is not None
+            if run and (not fusable or self._conflict(node,run)):
+                steps.append(self._fuse_run(run))
+                run = []
+            if fusable:
+                run.append(node)
+            else:
+                steps.append(node)
+        if run:
+            steps.append(self._fuse_run(run))
+        return steps
+
+    def explain(self):
+        """
+        explain the description of optimized plan
+
+        Returns
+        -------
+        str
+        """
+        lines = []
+        for step in self.optimize():
+            if isinstance(step,list):
+                lines.extend(repr(s) for s in step)
+            else:
+                lines.append(repr(step))
+        return '\n'.join(lines)
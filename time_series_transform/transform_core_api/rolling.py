@@ -0,0 +1,327 @@
+import numpy as np
+import pandas as pd
+from time_series_transform.transform_core_api.acceleration import get_kernel
+
+
+def _prepare(arr,window,min_periods):
+    arr = np.asarray(arr,dtype=float)
+    if window < 1:
+        raise ValueError('window must be positive')
+    min_periods = window if min_periods is None else min_periods
+    return arr,max(min_periods,1)
+
+
+def _window_diff(cumulative,window):
+    # cumulative value of window ending at each row (cumsum difference)
+    res = cumulative.copy()
+    res[window:] = cumulative[window:]-cumulative[:-window]
+    return res
+
+
+def _window_sum(values,window):
+    # sum of window ending at each row by the prefix and suffix sums of window
+    # sized blocks (van Herk/Gil-Werman with addition), nothing is subtracted,
+    # so the rounding error is bounded by the window rather than the series
+    n = len(values)
+    blocks = -(-n//window)
+    shape = values.shape[1:]
+    padded = np.zeros((blocks*window,)+shape)
+    padded[:n] = values
+    padded = padded.reshape((blocks,window)+shape)
+    res = np.cumsum(padded,axis=1).reshape((blocks*window,)+shape)[:n]
+    suffix = np.cumsum(padded[:,::-1],axis=1)[:,::-1].reshape((blocks*window,)+shape)
+    # the window [i-window+1, i] is the suffix of one block and the prefix of the next,
+    # or the prefix of one block if it starts at the block boundary
+    start = np.arange(window,n)-window+1
+    start = start[start % window != 0]
+    res[start+window-1] += suffix[start]
+    return res
+
+
+def _window_total(arr,window):
+    # sum of non nan values of each window, inf is counted apart
+    # so the sum recovers after it leaves the window
+    res = _window_sum(np.where(np.isfinite(arr),arr,0.),window)
+    positive = _window_diff(np.cumsum(arr == np.inf,axis=0),window) > 0
+    negative = _window_diff(np.cumsum(arr == -np.inf,axis=0),window) > 0
+    res[positive] = np.inf
+    res[negative] = -np.inf
+    res[positive & negative] = np.nan
+    return res
+
+
+def _columns(arr):
+    # 2D (time, column) view, the column count is explicit so an empty arr works too
+    return arr.reshape(len(arr),int(np.prod(arr.shape[1:])))
+
+
+def _mask_rows(res,count,min_periods):
+    # the first window-1 rows are partial windows (fewer values than window)
+    res[count < min_periods] = np.nan
+    return res
+
+
+def rolling_count(arr,window):
+    """
+    rolling_count number of non nan values in each window
+
+    Parameters
+    ----------
+    arr : numpy array
+        input array, the window slides along the first axis
+    window : int
+        the window size
+
+    Returns
+    -------
+    numpy array of int
+    """
+    valid = ~np.isnan(np.asarray(arr,dtype=float))
+    return _window_diff(np.cumsum(valid,axis=0),window)
+
+
+def rolling_sum(arr,window,min_periods=None):
+    """
+    rolling_sum O(n) sliding sum by the prefix and suffix sums of window sized blocks
+
+    nan is skipped, the window having less than min_periods
+    non nan values is nan (pandas rolling convention).
+    the window having inf is inf (nan if it has both inf and -inf).
+
+    Parameters
+    ----------
+    arr : numpy array
+        input array, the window slides along the first axis
+    window : int
+        the window size
+    min_periods : int, optional
+        minimum number of non nan values, if None it is window
+        (any nan makes the window nan), by default None
+
+    Returns
+    -------
+    numpy array
+        the same shape as arr
+    """
+    arr,min_periods = _prepare(arr,window,min_periods)
+    count = rolling_count(arr,window)
+    res = _window_total(arr,window)
+    return _mask_rows(res,count,min_periods)
+
+
+def rolling_mean(arr,window,min_periods=None):
+    """
+    rolling_mean O(n) sliding mean, see rolling_sum
+
+    Parameters
+    ----------
+    arr : numpy array
+        input array, the window slides along the first axis
+    window : int
+        the window size
+    min_periods : int, optional
+        minimum number of non nan values, if None it is window, by default None
+
+    Returns
+    -------
+    numpy array
+    """
+    arr,min_periods = _prepare(arr,window,min_periods)
+    count = rolling_count(arr,window)
+    res = _window_total(arr,window)
+    with np.errstate(divide='ignore',invalid='ignore'):
+        res = res/count
+    return _mask_rows(res,count,min_periods)
+
+
+def rolling_var(arr,window,min_periods=None,ddof=1):
+    """
+    rolling_var O(n) sliding variance by window sums of values and squares
+
+    the values are centered by the overall mean before summing
+    to reduce the cancellation error, the window having inf is nan.
+
+    Parameters
+    ----------
+    arr : numpy array
+        input array, the window slides along the first axis
+    window : int
+        the window size
+    min_periods : int, optional
+        minimum number of non nan values, if None it is window, by default None
+    ddof : int, optional
+        delta degrees of freedom, by default 1
+
+    Returns
+    -------
+    numpy array
+    """
+    arr,min_periods = _prepare(arr,window,min_periods)
+    count = rolling_count(arr,window)
+    finite = np.isfinite(arr)
+    values = np.where(finite,arr,0.)
+    if finite.any():
+        values = np.where(finite,values-values.sum(axis=0)/np.maximum(finite.sum(axis=0),1),0.)
+    total = _window_sum(values,window)
+    square = _window_sum(values**2,window)
+    with np.errstate(divide='ignore',invalid='ignore'):
+        res = (square-total**2/count)/(count-ddof)
+    res = np.maximum(res,0.)
+    res[count-ddof <= 0] = np.nan
+    res[_window_diff(np.cumsum(np.isinf(arr),axis=0),window) > 0] = np.nan
+    return _mask_rows(res,count,min_periods)
+
+
+def _rolling_extreme(arr,window,min_periods,ufunc,fill):
+    arr,min_periods = _prepare(arr,window,min_periods)
+    n = len(arr)
+    res = np.full(arr.shape,np.nan)
+    if n == 0:
+        return res
+    kernel = get_kernel('rolling_extreme')
+    if kernel is not None:
+        values = np.ascontiguousarray(arr.reshape(n,-1))
+        return kernel(values,window,min_periods,ufunc is np.maximum).reshape(arr.shape)
+    count = rolling_count(arr,window)
+    values = np.where(np.isnan(arr),fill,arr)
+    # van Herk/Gil-Werman: prefix and suffix extremes of window sized blocks
+    blocks = -(-n//window)
+    padded = np.full((blocks*window,)+arr.shape[1:],fill)
+    padded[:n] = values
+    padded = padded.reshape((blocks,window)+arr.shape[1:])
+    prefix = ufunc.accumulate(padded,axis=1).reshape((blocks*window,)+arr.shape[1:])
+    suffix = ufunc.accumulate(padded[:,::-1],axis=1)[:,::-1].reshape((blocks*window,)+arr.shape[1:])
+    # the window [i-window+1, i] is the suffix of one block and the prefix of the next
+    start = np.arange(window-1,n)-window+1
+    res[window-1:] = ufunc(suffix[start],prefix[start+window-1])
+    partial = min(window-1,n)
+    if min_periods < window and partial > 0:
+        res[:partial] = ufunc.accumulate(values[:partial],axis=0)
+    res[count < min_periods] = np.nan
+    return res
+
+
+def rolling_min(arr,window,min_periods=None):
+    """
+    rolling_min O(n) sliding minimum (van Herk/Gil-Werman algorithm)
+
+    Parameters
+    ----------
+    arr : numpy array
+        input array, the window slides along the first axis
+    window : int
+        the window size
+    min_periods : int, optional
+        minimum number of non nan values, if None it is window, by default None
+
+    Returns
+    -------
+    numpy array
+    """
+    return _rolling_extreme(arr,window,min_periods,np.minimum,np.inf)
+
+
+def rolling_max(arr,window,min_periods=None):
+    """
+    rolling_max O(n) sliding maximum (van Herk/Gil-Werman algorithm)
+
+    Parameters
+    ----------
+    arr : numpy array
+        input array, the window slides along the first axis
+    window : int
+        the window size
+    min_periods : int, optional
+        minimum number of non nan values, if None it is window, by default None
+
+    Returns
+    -------
+    numpy array
+    """
+    return _rolling_extreme(arr,window,min_periods,np.maximum,-np.inf)
+
+
+def rolling_gmean(arr,window,min_periods=None):
+    """
+    rolling_gmean O(n) sliding geometric mean by window log sums
+
+    the window having zero is 0, the window having negative value is nan
+    (same as scipy gmean).
+
+    Parameters
+    ----------
+    arr : numpy array
+        input array, the window slides along the first axis
+    window : int
+        the window size
+    min_periods : int, optional
+        minimum number of non nan values, if None it is window, by default None
+
+    Returns
+    -------
+    numpy array
+    """
+    arr,min_periods = _prepare(arr,window,min_periods)
+    count = rolling_count(arr,window)
+    valid = ~np.isnan(arr)
+    zeros = _window_diff(np.cumsum(valid & (arr == 0),axis=0),window)
+    negatives = _window_diff(np.cumsum(valid & (arr < 0),axis=0),window)
+    with np.errstate(divide='ignore',invalid='ignore'):
+        logs = np.where(valid & (arr > 0),np.log(np.where(arr > 0,arr,1.)),0.)
+        res = np.exp(_window_sum(logs,window)/count)
+    res[zeros > 0] = 0.
+    res[negatives > 0] = np.nan
+    return _mask_rows(res,count,min_periods)
+
+
+def rolling_quantile(arr,window,quantile,min_periods=None,interpolation='linear'):
+    """
+    rolling_quantile sliding quantile
+
+    it uses the skiplist of pandas rolling (O(n log window)),
+    each column of 2D array is computed separately.
+
+    Parameters
+    ----------
+    arr : numpy array
+        input array, the window slides along the first axis
+    window : int
+        the window size
+    quantile : float
+        the quantile between 0 and 1
+    min_periods : int, optional
+        minimum number of non nan values, if None it is window, by default None
+    interpolation : str, optional
+        pandas quantile interpolation, by default 'linear'
+
+    Returns
+    -------
+    numpy array
+    """
+    arr,min_periods = _prepare(arr,window,min_periods)
+    flat = _columns(arr)
+    res = pd.DataFrame(flat).rolling(window,min_periods=min_periods).quantile(quantile,interpolation=interpolation)
+    return res.to_numpy().reshape(arr.shape)
+
+
+def rolling_median(arr,window,min_periods=None):
+    """
+    rolling_median sliding median, see rolling_quantile
+
+    Parameters
+    ----------
+    arr : numpy array
+        input array, the window slides along the first axis
+    window : int
+        the window size
+    min_periods : int, optional
+        minimum number of non nan values, if None it is window, by default None
+
+    Returns
+    -------
+    numpy array
+    """
+    arr,min_periods = _prepare(arr,window,min_periods)
+    flat = _columns(arr)
+    res = pd.DataFrame(flat).rolling(window,min_periods=min_periods).median()
+    return res.to_numpy().reshape(arr.shape)
@@ -0,0 +1,237 @@
+import abc
+import numpy as np
+from time_series_transform.transform_core_api.ewm import ewm_alpha
+from time_series_transform.transform_core_api.difference import difference_weights
+
+
+class Streaming_Kernel(abc.ABC):
+    """
+    Streaming_Kernel the base class of stateful (online) kernels
+
+    the subclass implements update (one tick) and reset. update_batch
+    continues the state over many ticks, calling the kernel runs it
+    from the initial state like the batch functions of util.
+    """
+
+    @abc.abstractmethod
+    def reset(self):
+        pass
+
+    @abc.abstractmethod
+    def update(self,x):
+        pass
+
+    def update_batch(self,xs):
+        """
+        update_batch feeding multiple ticks in order
+
+        Parameters
+        ----------
+        xs : numpy 1D array
+            the new values
+
+        Returns
+        -------
+        numpy array
+            the output of each tick
+        """
+        res = np.empty(len(xs))
+        for ix,x in enumerate(xs):
+            res[ix] = self.update(x)
+        return res
+
+    def __call__(self,arr):
+        self.reset()
+        return self.update_batch(arr)
+
+
+class Streaming_Moving_Average(Streaming_Kernel):
+    def __init__(self,windowSize=3):
+        """
+        Streaming_Moving_Average the online version of util.moving_average
+
+        it carries the running sum and the last windowSize running sums,
+        so each tick is O(1) and the result is identical to the batch version
+        (both use the difference of cumulative sums).
+        nan tick is skipped and returns nan.
+
+        Parameters
+        ----------
+        windowSize : int, optional
+            the grouping size, by default 3
+        """
+        self.windowSize = windowSize
+        self.reset()
+
+    def reset(self):
+        self._sums = np.zeros(self.windowSize)
+        self._sum = 0.
+        self._count = 0
+        return self
+
+    def update(self,x):
+        if np.isnan(x):
+            return np.nan
+        self._sum += float(x)
+        ix = self._count%self.windowSize
+        previous = self._sums[ix]
+        self._sums[ix] = self._sum
+        self._count += 1
+        if self._count < self.windowSize:
+            return np.nan
+        if self._count == self.windowSize:
+            return self._sum/self.windowSize
+        return (self._sum-previous)/self.windowSize
+
+
+class Streaming_EMA(Streaming_Kernel):
+    def __init__(self,com=None,span=None,halflife=None,alpha=None,adjust=True,min_periods=0,ignore_na=False):
+        """
+        Streaming_EMA the online version of util.ema (pandas ewm mean)
+
+        it carries the weighted mean and the sum of weights of pandas
+        implementation, the result equals the batch version up to floating
+        point rounding.
+
+        Parameters
+        ----------
+        com : float, optional
+            center of mass, by default None
+        span : float, optional
+            span, by default None
+        halflife : float, optional
+            half-life, by default None
+        alpha : float, optional
+            smoothing factor, by default None
+        adjust : bool, optional
+            whether to divide by the decaying adjustment factor, by default True
+        min_periods : int, optional
+            minimum number of observations, by default 0
+        ignore_na : bool, optional
+            whether to ignore missing values when calculating weights, by default False
+
+        Raises
+        ------
+        ValueError
+            not exactly one of com, span, halflife and alpha, or out of range
+        """
+        self.alpha = ewm_alpha(com,span,halflife,alpha)
+        self.adjust = adjust
+        self.min_periods = max(int(min_periods),1)
+        self.ignore_na = ignore_na
+        self.reset()
+
+    def reset(self):
+        self._weighted = np.nan
+        self._oldWeight = 1.
+        self._nobs = 0
+        return self
+
+    def update(self,x):
+        x = float(x)
+        isObservation = not np.isnan(x)
+        self._nobs += int(isObservation)
+        if np.isnan(self._weighted):
+            if isObservation:
+                self._weighted = x
+        elif isObservation or not self.ignore_na:
+            newWeight = 1. if self.adjust else self.alpha
+            self._oldWeight *= 1.-self.alpha
+            if isObservation:
+                if self._weighted != x:
+                    self._weighted = (self._oldWeight*self._weighted+newWeight*x)/(self._oldWeight+newWeight)
+                self._oldWeight = self._oldWeight+newWeight if self.adjust else 1.
+        return self._weighted if self._nobs >= self.min_periods else np.nan
+
+
+class Streaming_Differencing(Streaming_Kernel):
+    def __init__(self,order=1,lag=1):
+        """
+        Streaming_Differencing the online version of util.differencing
+
+        it carries the last order*lag values and applies the binomial
+        weights in the same order as the batch version (with or without
+        the numba kernel), so the result is identical.
+
+        Parameters
+        ----------
+        order : int, optional
+            number of differencing, by default 1
+        lag : int, optional
+            the seasonal lag, by default 1
+        """
+        self.order = order
+        self.lag = lag
+        self._weights = difference_weights(order)
+        self.reset()
+
+    def reset(self):
+        self._values = np.zeros(self.order*self.lag+1)
+        self._count = 0
+        return self
+
+    def update(self,x):
+        size = len(self._values)
+        self._values[self._count%size] = x
+        self._count += 1
+        if self._count < size:
+            return np.nan
+        value = self._weights[0]*self._values[(self._count-1)%size]
+        for k in range(1,len(self._weights)):
+            if self._weights[k] != 0:
+                value += self._weights[k]*self._values[(self._count-1-k*self.lag)%size]
+        return value
+
+
+class Streaming_Geometric_MA(Streaming_Kernel):
+    def __init__(self,windowSize):
+        """
+        Streaming_Geometric_MA the online version of util.geometric_ma
+
+        it carries the sum of log values in the window (log-sum window),
+        the result equals the batch version up to floating point rounding.
+        the sum is recomputed from the window every windowSize ticks,
+        so the rounding error does not accumulate over a long stream.
+        the window having nan returns nan.
+
+        Parameters
+        ----------
+        windowSize : int
+            grouping size
+        """
+        self.windowSize = windowSize
+        self.reset()
+
+    def reset(self):
+        self._logs = np.zeros(self.windowSize)
+        self._logSum = 0.
+        # nan and zero (log is -inf) are counted instead of summed
+        self._nanCount = 0
+        self._zeroCount = 0
+        self._count = 0
+        return self
+
+    def _count_log(self,value,sign):
+        if np.isnan(value):
+            self._nanCount += sign
+        elif np.isneginf(value):
+            self._zeroCount += sign
+        else:
+            self._logSum += sign*value
+
+    def update(self,x):
+        with np.errstate(divide='ignore',invalid='ignore'):
+            value = np.log(float(x))
+        ix = self._count%self.windowSize
+        if self._count >= self.windowSize:
+            self._count_log(self._logs[ix],-1)
+        self._logs[ix] = value
+        self._count_log(value,1)
+        self._count += 1
+        if self._count%self.windowSize == 0:
+            self._logSum = self._logs[~np.isnan(self._logs) & ~np.isneginf(self._logs)].sum()
+        if self._count < self.windowSize or self._nanCount > 0:
+            return np.nan
+        if self._zeroCount > 0:
+            return 0.
+        return np.exp(self._logSum/self.windowSize)
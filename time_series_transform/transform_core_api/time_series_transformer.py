@@ -8,11 +8,16 @@ from pyarrow import parquet as pq
 from collections import defaultdict
 from time_series_transform import io
 from time_series_transform.transform_core_api.base import (Time_Series_Data,Time_Series_Data_Collection)
+from time_series_transform.transform_core_api.block_manager import Block_Manager
+from time_series_transform.transform_core_api.plan import (Plan,Plan_Node,Plan_Group)
+from time_series_transform.transform_core_api.alignment import (_fill_dtype,_fill_value)
+from time_series_transform.transform_core_api.window import (window_shift,identical_window)
+from time_series_transform.transform_core_api.executor import _column_updates
 from time_series_transform.plot import *
 
 class Time_Series_Transformer(object):
 
-    def __init__(self,data,timeSeriesCol,mainCategoryCol=None):
+    def __init__(self,data,timeSeriesCol,mainCategoryCol=None,lazy=False):
         """
         __init__ the class for time series data manipulation
         
@@ -31,8 +36,15 @@ class Time_Series_Transformer(object):
         mainCategoryCol : str or None
             the main category column of the time series data
             for example, symbol ticker for stock data. Or, the product segment for inventory
+        lazy : bool, optional
+            if True, lag, lead, sequence, transform and remove_feature only record
+            a plan which is optimized and executed when the data is accessed
+            (e.g. to_pandas, to_numpy or to_parquet), by default False
         """
         super().__init__()
+        self._plan = Plan()
+        self._registry = Plan()
+        self._lazy = lazy
         if isinstance(data,(Time_Series_Data,Time_Series_Data_Collection)):
             self.time_series_data = data
         else:
@@ -42,16 +54,141 @@ class Time_Series_Transformer(object):
         self.mainCategoryCol = mainCategoryCol
         self.plot = TimeSeriesPlot(self.time_series_data)
 
+    @property
+    def time_series_data(self):
+        if len(self._plan) > 0:
+            self.collect()
+        return self._time_series_data
+
+    @time_series_data.setter
+    def time_series_data(self,time_series_data):
+        self._time_series_data = time_series_data
+
+    @property
+    def lazy(self):
+        return self._lazy
+
+    @lazy.setter
+    def lazy(self,lazy):
+        if not lazy:
+            self.collect()
+        self._lazy = lazy
+
+    def collect(self):
+        """
+        collect execute the pending lazy plan
+
+        the plan is optimized before execution: the data removed or
+        overwritten before being read is never computed, consecutive lag
+        and lead of the same data are computed together, and lag and lead
+        sequences of the same data and window size share one window view.
+
+        Returns
+        -------
+        self
+        """
+        plan = self._plan
+        steps = plan.optimize()
+        self._plan = Plan()
+        positions = plan.positions()
+        removed = {o for n in plan.nodes if n.op == 'remove' for o in n.outputs}
+        before = {k:self._columns(tsd)-removed for k,tsd in self._tsd_dict().items()}
+        lazy = self._lazy
+        self._lazy = False
+        try:
+            for step in steps:
+                for s in (step if isinstance(step,list) else [step]):
+                    if isinstance(s,Plan_Node) and s.opaque:
+                        # the outputs of opaque node are known after execution
+                        columns = {k:self._columns(tsd) for k,tsd in self._tsd_dict().items()}
+                        self._execute_step(s)
+                        for k,tsd in self._tsd_dict().items():
+                            for o in self._columns(tsd)-columns[k]:
+                                positions.setdefault(o,s.order)
+                    else:
+                        self._execute_step(s)
+        finally:
+            self._lazy = lazy
+        # the new columns keep the order of calls as eager execution,
+        # a pruned writer still decides the position of its output
+        for k,tsd in self._tsd_dict().items():
+            for dictionary in [tsd._data,tsd._labels]:
+                new = [o for o in dictionary if o not in before[k]]
+                for o in sorted(new,key=lambda o:positions.get(o,len(plan))):
+                    _move_to_end(dictionary,o)
+        return self
+
+    def explain(self):
+        """
+        explain the optimized plan of pending lazy operations
+        
+        Returns
+        -------
+        str
+        """
+        return self._plan.explain()
+
+    def _nodes(self,op,method,inputLabels,suffix,suffixNum,**kwargs):
+        if isinstance(inputLabels,list) == False:
+            inputLabels = [inputLabels]
+        return [Plan_Node(
+            op,[i],[_label_name(i,suffix,suffixNum)],method,
+            dict(kwargs,inputLabels=i,suffix=suffix)
+            ) for i in inputLabels]
+
+    def _record(self,op,method,inputLabels,suffix,suffixNum,**kwargs):
+        for node in self._nodes(op,method,inputLabels,suffix,suffixNum,**kwargs):
+            self._plan.add(node)
+        return self
+
+    def _register(self,*nodes):
+        # the executed operations are replayed on the new rows by append
+        if self._registry is not None:
+            for node in nodes:
+                self._registry.add(node)
+        return self
+
+    def _tsd_dict(self):
+        if self._isCollection:
+            return {i:self._time_series_data[i] for i in self._time_series_data}
+        return {None:self._time_series_data}
+
+    def _columns(self,tsd):
+        return set(tsd.data)|set(tsd.labels)
+
+    def _execute_step(self,step):
+        if isinstance(step,Plan_Node):
+            getattr(self,step.method)(*step.args,**step.kwargs)
+            return
+        self._register(*step.nodes)
+        if step.kind == 'shift':
+            func = fused_shift
+            kwargs = {'shifts':[
+                (n.outputs[0],n.kwargs['lagNum'] if n.op == 'lag' else -n.kwargs['leadNum'])
+                for n in step.nodes
+                ]}
+        else:
+            func = fused_window
+            kwargs = {'windowSize':step.params['windowSize'],'shifts':[
+                (n.outputs[0],'lag',n.kwargs['lagNum']) if n.op == 'lag_sequence' else (n.outputs[0],'lead',n.kwargs['leadNum'])
+                for n in step.nodes
+                ]}
+        kwargs['fillMissing'] = step.params['fillMissing']
+        if self._isCollection:
+            self._time_series_data.transform(step.inputLabel,None,func,n_jobs=step.params['n_jobs'],verbose=step.params['verbose'],**kwargs)
+        else:
+            self._time_series_data.transform(step.inputLabel,None,func,**kwargs)
+
     def _setup_time_series_data(self,data,timeSeriesCol,mainCategoryCol):
         if timeSeriesCol is None:
             raise KeyError("time series index is required")
         tsd = Time_Series_Data(data,timeSeriesCol)
         if mainCategoryCol is None:
             return tsd
-        tsc = Time_Series_Data_Collection(tsd,timeSeriesCol,mainCategoryCol)
+        tsc = Time_Series_Data_Collection(tsd,timeSeriesCol,mainCategoryCol,copy=False)
         return tsc
     
-    def transform(self,inputLabels,newName,func,n_jobs =1,verbose = 0,backend='loky',*args,**kwargs):
+    def transform(self,inputLabels,newName,func,n_jobs =1,verbose = 0,backend='loky',*args,appendLookback=None,appendLookahead=0,**kwargs):
         """
         transform the wrapper of functions performing data manipulation
         
@@ -73,26 +210,76 @@ class Time_Series_Transformer(object):
         verbose : int, optional
             joblib implmentation only used when mainCategoryCol is given, by default 0
         backend : str, optional
-            joblib implmentation only used when mainCategoryCol is given, by default 'loky'
+            joblib implmentation only used when mainCategoryCol is given,
+            'thread_pool' runs in a persistent thread pool and 'memmap' shares
+            the columns through memory mapped files, by default 'loky'
+        appendLookback : int, optional
+            keyword only, the number of previous rows the function needs for 
+            each row (e.g. windowSize-1 for moving average). if given, append
+            only computes the new rows; if None, append recomputes all data.
+            it should stay None for the functions depending on the whole history
+            (e.g. ema), by default None
+        appendLookahead : int, optional
+            keyword only, the number of next rows the function needs for
+            each row (e.g. lead), by default 0
         
         Returns
         -------
         self
         """
+        node = Plan_Node(
+            'transform',inputLabels if isinstance(inputLabels,list) else [inputLabels],[newName],'transform',
+            dict(kwargs,appendLookback=appendLookback,appendLookahead=appendLookahead),(inputLabels,newName,func,n_jobs,verbose,backend)+args,opaque=True
+            )
+        if self._lazy:
+            self._plan.add(node)
+            return self
         if isinstance(self.time_series_data,Time_Series_Data_Collection):
-            self.time_series_data = self.time_series_data.transform(inputLabels,newName,func,n_jobs =1,verbose = 0,backend='loky',*args,**kwargs)
+            self.time_series_data = self.time_series_data.transform(inputLabels,newName,func,n_jobs=n_jobs,verbose=verbose,backend=backend,*args,**kwargs)
         else:
             self.time_series_data = self.time_series_data.transform(inputLabels,newName,func,*args,**kwargs)
-        return self
+        return self._register(node)
 
 
+    def cross_sectional_transform(self,inputLabels,newName,func,*args,**kwargs):
+        """
+        cross_sectional_transform the wrapper of functions across categories
+        
+        the function receives the data of all categories at once,
+        (time, category) array for single input or (time, category, feature) 
+        array for list of input. e.g. ranking or z-score at each time.
+        if mainCategoryCol is not specified, this function has no function.
+        
+        Parameters
+        ----------
+        inputLabels : str, numeric data or list of data or numeric data
+            the input data columns passing to function
+        newName : str
+            the output data name or prefix
+        func : function
+            the data manipulation function
+        
+        Returns
+        -------
+        self
+        """
+        if self._isCollection:
+            self.time_series_data = self.time_series_data.cross_sectional_transform(inputLabels,newName,func,*args,**kwargs)
+            self._register(Plan_Node(
+                'cross_sectional',inputLabels if isinstance(inputLabels,list) else [inputLabels],[newName],
+                'cross_sectional_transform',kwargs,(inputLabels,newName,func)+args,opaque=True
+                ))
+        else:
+            warnings.warn('Setup mainCategoryCol is necessary for this function')
+        return self
+
     def _transform_wrapper(self,inputLabels,newName,func,suffix,suffixNum,inputAsList,n_jobs,verbose,*args,**kwargs):
         if isinstance(inputLabels,list) == False:
             inputLabels = [inputLabels]
         if self._isCollection:
             if inputAsList == False:
                 for i in inputLabels:
-                    labelName = [f'{i}{suffix}{str(suffixNum)}' if suffix is not None else f"{i}{str(suffixNum)}"][0]
+                    labelName = _label_name(i,suffix,suffixNum)
                     self.time_series_data.transform(i,labelName,func,n_jobs =n_jobs,verbose = verbose,*args,**kwargs)
                 return
             labelName = newName
@@ -100,12 +287,21 @@ class Time_Series_Transformer(object):
         else:
             if inputAsList == False:
                 for i in inputLabels:
-                    labelName = [f'{i}{suffix}{str(suffixNum)}' if suffix is not None else f"{i}{str(suffixNum)}"][0]
+                    labelName = _label_name(i,suffix,suffixNum)
                     self.time_series_data.transform(i,labelName,func,*args,**kwargs)
                 return
             labelName = newName
             self.time_series_data.transform(inputLabels,labelName,func,*args,**kwargs)
 
+    def _shift_wrapper(self,inputLabels,suffix,periods,sign,fillMissing,n_jobs,verbose):
+        if isinstance(inputLabels,list) == False:
+            inputLabels = [inputLabels]
+        for i in inputLabels:
+            shifts = [(_label_name(i,suffix,k),sign*k) for k in periods]
+            if self._isCollection:
+                self.time_series_data.transform(i,None,fused_shift,n_jobs =n_jobs,verbose = verbose,shifts=shifts,fillMissing=fillMissing)
+            else:
+                self.time_series_data.transform(i,None,fused_shift,shifts=shifts,fillMissing=fillMissing)
 
     def make_lag(self,inputLabels,lagNum,suffix=None,fillMissing=np.nan,verbose=0,n_jobs=1):
         """
@@ -115,8 +311,9 @@ class Time_Series_Transformer(object):
         ----------
         inputLabels : str, numeric or list of str, or numeric
             the name of input data 
-        lagNum : int
-            the target lag period to make
+        lagNum : int or list of int
+            the target lag period to make (non negative, see make_lead), 
+            a list (or range) of periods is computed at once for each input data
         suffix : str, optional
             the suffix of new data, by default None
         fillMissing : object, optional
@@ -129,19 +326,20 @@ class Time_Series_Transformer(object):
         Returns
         -------
         self
+        
+        Raises
+        ------
+        ValueError
+            negative lagNum
         """
-        self._transform_wrapper(
-            inputLabels,
-            None,
-            make_lag,
-            suffix,
-            lagNum,
-            False,
-            n_jobs,
-            verbose,
-            lagNum=lagNum,
-            fillMissing=fillMissing
-            )
+        periods = _periods(lagNum,'lagNum')
+        if self._lazy:
+            for k in periods:
+                self._record('lag','make_lag',inputLabels,suffix,k,lagNum=k,fillMissing=fillMissing,verbose=verbose,n_jobs=n_jobs)
+            return self
+        self._shift_wrapper(inputLabels,suffix,periods,1,fillMissing,n_jobs,verbose)
+        for k in periods:
+            self._register(*self._nodes('lag','make_lag',inputLabels,suffix,k,lagNum=k,fillMissing=fillMissing,verbose=verbose,n_jobs=n_jobs))
         return self
 
     def make_lead(self,inputLabels,leadNum,suffix=None,fillMissing=np.nan,verbose=0,n_jobs=1):
@@ -152,8 +350,9 @@ class Time_Series_Transformer(object):
         ----------
         inputLabels : str, numeric or list of str, or numeric
             the name of input data 
-        leadNum : int
-            the target lead period to make
+        leadNum : int or list of int
+            the target lead period to make (non negative, see make_lag), 
+            a list (or range) of periods is computed at once for each input data
         suffix : str, optional
             the suffix of new data, by default None
         fillMissing : object, optional
@@ -166,19 +365,20 @@ class Time_Series_Transformer(object):
         Returns
         -------
         self
+        
+        Raises
+        ------
+        ValueError
+            negative leadNum
         """
-        self._transform_wrapper(
-            inputLabels,
-            None,
-            make_lead,
-            suffix,
-            leadNum,
-            False,
-            n_jobs,
-            verbose,
-            leadNum=leadNum,
-            fillMissing=fillMissing
-            )
+        periods = _periods(leadNum,'leadNum')
+        if self._lazy:
+            for k in periods:
+                self._record('lead','make_lead',inputLabels,suffix,k,leadNum=k,fillMissing=fillMissing,verbose=verbose,n_jobs=n_jobs)
+            return self
+        self._shift_wrapper(inputLabels,suffix,periods,-1,fillMissing,n_jobs,verbose)
+        for k in periods:
+            self._register(*self._nodes('lead','make_lead',inputLabels,suffix,k,leadNum=k,fillMissing=fillMissing,verbose=verbose,n_jobs=n_jobs))
         return self
                 
     def make_lag_sequence(self,inputLabels,windowSize,lagNum,suffix=None,fillMissing=np.nan,verbose=0,n_jobs=1):
@@ -208,6 +408,11 @@ class Time_Series_Transformer(object):
         -------
         self
         """
+        if self._lazy:
+            return self._record(
+                'lag_sequence','make_lag_sequence',inputLabels,suffix,windowSize,
+                windowSize=windowSize,lagNum=lagNum,fillMissing=fillMissing,verbose=verbose,n_jobs=n_jobs
+                )
         self._transform_wrapper(
             inputLabels,
             None,
@@ -221,7 +426,10 @@ class Time_Series_Transformer(object):
             lagNum = lagNum,
             fillMissing=fillMissing
             )
-        return self
+        return self._register(*self._nodes(
+            'lag_sequence','make_lag_sequence',inputLabels,suffix,windowSize,
+            windowSize=windowSize,lagNum=lagNum,fillMissing=fillMissing,verbose=verbose,n_jobs=n_jobs
+            ))
 
     def make_lead_sequence(self,inputLabels,windowSize,leadNum,suffix=None,fillMissing=np.nan,verbose=0,n_jobs=1):
         """
@@ -250,6 +458,11 @@ class Time_Series_Transformer(object):
         -------
         self
         """
+        if self._lazy:
+            return self._record(
+                'lead_sequence','make_lead_sequence',inputLabels,suffix,windowSize,
+                windowSize=windowSize,leadNum=leadNum,fillMissing=fillMissing,verbose=verbose,n_jobs=n_jobs
+                )
         self._transform_wrapper(
             inputLabels,
             None,
@@ -263,7 +476,10 @@ class Time_Series_Transformer(object):
             leadNum=leadNum,
             fillMissing=fillMissing
             )
-        return self
+        return self._register(*self._nodes(
+            'lead_sequence','make_lead_sequence',inputLabels,suffix,windowSize,
+            windowSize=windowSize,leadNum=leadNum,fillMissing=fillMissing,verbose=verbose,n_jobs=n_jobs
+            ))
 
     def make_identical_sequence(self,inputLabels,windowSize,suffix=None,verbose=0,n_jobs=1):
         """
@@ -289,6 +505,8 @@ class Time_Series_Transformer(object):
         -------
         self
         """
+        if self._lazy:
+            return self._record('identity','make_identical_sequence',inputLabels,suffix,windowSize,windowSize=windowSize,verbose=verbose,n_jobs=n_jobs)
         self._transform_wrapper(
             inputLabels,
             None,
@@ -300,7 +518,7 @@ class Time_Series_Transformer(object):
             verbose,
             windowSize=windowSize
             )
-        return self
+        return self._register(*self._nodes('identity','make_identical_sequence',inputLabels,suffix,windowSize,windowSize=windowSize,verbose=verbose,n_jobs=n_jobs))
 
     def make_stack_sequence(self,inputLabels,newName,axis =-1,verbose=0,n_jobs=1):
         """
@@ -326,6 +544,13 @@ class Time_Series_Transformer(object):
         [type]
             [description]
         """
+        node = Plan_Node(
+            'stack',inputLabels if isinstance(inputLabels,list) else [inputLabels],[newName],'make_stack_sequence',
+            {'inputLabels':inputLabels,'newName':newName,'axis':axis,'verbose':verbose,'n_jobs':n_jobs}
+            )
+        if self._lazy:
+            self._plan.add(node)
+            return self
         self._transform_wrapper(
             inputLabels,
             newName,
@@ -337,8 +562,56 @@ class Time_Series_Transformer(object):
             verbose,
             axis =axis
             )
-        return self
+        return self._register(node)
+
 
+    def make_sequence_tensor(self,inputLabels,newName,windowSize,lagNum=0,fillMissing=np.nan,dtype=np.float32,verbose=0,n_jobs=1):
+        """
+        make_sequence_tensor making one (time, window, feature) tensor from raw data
+        
+        it is the fused version of make_lag_sequence and make_stack_sequence
+        (axis=-1) without making a sequence data for each input.
+        this function could be useful for deep learning.
+        
+        Parameters
+        ----------
+        inputLabels : str, numeric or list of str, or numeric
+            the name of input data, the order becomes the feature axis
+        newName : str
+            new name for the tensor data
+        windowSize : int
+            the length of sequence
+        lagNum : int, optional
+            the lag period of sequence, negative number makes lead sequence, by default 0
+        fillMissing : object, optional
+            the data for filling missing data, by default np.nan
+        dtype : numpy dtype, optional
+            the dtype of tensor, by default np.float32
+        verbose : int, optional
+            joblib implmentation only used when mainCategoryCol is given, by default 0
+        n_jobs : int, optional
+            joblib implmentation only used when mainCategoryCol is given, by default 1
+        
+        Returns
+        -------
+        self
+        """
+        if isinstance(inputLabels,list) == False:
+            inputLabels = [inputLabels]
+        node = Plan_Node(
+            'tensor',inputLabels,[newName],'make_sequence_tensor',
+            {'inputLabels':inputLabels,'newName':newName,'windowSize':windowSize,'lagNum':lagNum,
+            'fillMissing':fillMissing,'dtype':dtype,'verbose':verbose,'n_jobs':n_jobs}
+            )
+        if self._lazy:
+            self._plan.add(node)
+            return self
+        kwargs = {'name':newName,'windowSize':windowSize,'lagNum':lagNum,'fillMissing':fillMissing,'dtype':dtype}
+        if self._isCollection:
+            self.time_series_data.transform(inputLabels,newName,sequence_tensor,n_jobs =n_jobs,verbose = verbose,**kwargs)
+        else:
+            self.time_series_data.transform(inputLabels,newName,sequence_tensor,**kwargs)
+        return self._register(node)
 
     def make_label(self,key,collectionKey=None):
         """
@@ -374,22 +647,28 @@ class Time_Series_Transformer(object):
             self.time_series_data.remove(key,'data')
         return self
 
-    def remove_different_category_time(self):
+    def remove_different_category_time(self,calendar=None):
         """
         remove_different_category_time 
         remove different time index for category
         if mainCategoryCol is not specified, this function has no function.
+
+        Parameters
+        ----------
+        calendar : list, optional
+            if not None, the time outside of the calendar is removed as well, by default None
+
         Returns
         -------
         self
         """
         if self._isCollection:
-            self.time_series_data.remove_different_time_index()
+            self.time_series_data.remove_different_time_index(calendar)
         else:
             warnings.warn('Setup mainCategoryCol is necessary for this function')
         return self
 
-    def pad_different_category_time(self,fillMissing= np.nan):
+    def pad_different_category_time(self,fillMissing= np.nan,calendar=None):
         """
         pad_different_category_time 
         pad time length
@@ -399,13 +678,16 @@ class Time_Series_Transformer(object):
         ----------
         fillMissing : object, optional
             data for filling paded data, by default np.nan
+        calendar : list, optional
+            if not None, every category is aligned to this calendar
+            instead of the union of time, by default None
         
         Returns
         -------
         self
         """
         if self._isCollection:
-            self.time_series_data.pad_time_index(fillMissing)
+            self.time_series_data.pad_time_index(fillMissing,calendar)
         else:
             warnings.warn('Setup mainCategoryCol is necessary for this function')
         return self
@@ -440,14 +722,18 @@ class Time_Series_Transformer(object):
         -------
         self
         """
+        node = Plan_Node('remove',[],[colName],'remove_feature',{'colName':colName})
+        if self._lazy:
+            self._plan.add(node)
+            return self
         if isinstance(self.time_series_data,Time_Series_Data_Collection):
             for i in self.time_series_data:
                 self.time_series_data[i].remove(colName)
-                return self
-        self.time_series_data.remove(colName)
-        return self
+        else:
+            self.time_series_data.remove(colName)
+        return self._register(node)
 
-    def dropna(self,categoryKey=None):
+    def dropna(self,categoryKey=None,how='any',subset=None,thresh=None):
         """
         dropna drop null values
         
@@ -457,20 +743,113 @@ class Time_Series_Transformer(object):
         ----------
         categoryKey :  str or numeric, optional
             if None all category will be chosen, by default None
+        how : {'any','all'}, optional
+            drop the time index if any or all of the columns are null, by default 'any'
+        subset : list of str, optional
+            the data or labels to be checked, if None all are checked, by default None
+        thresh : int, optional
+            keep the time index with at least thresh non null columns, 
+            it overrides how, by default None
         
         Returns
         -------
         self
         """
         if isinstance(self.time_series_data,Time_Series_Data):
-            self.time_series_data = self.time_series_data.dropna()
+            self.time_series_data = self.time_series_data.dropna(how,subset,thresh)
             return self
-        self.time_series_data = self.time_series_data.dropna(categoryKey)
+        self.time_series_data = self.time_series_data.dropna(categoryKey,how,subset,thresh)
         return self
 
+    def append(self,rows,fillMissing=np.nan):
+        """
+        append adding new rows and updating the transformed data
+        
+        the operations applied before (lag, lead, sequence, transform, ...)
+        are remembered. lag, stack, sequence tensor and transform with appendLookback
+        only compute the new rows with the previous rows they need, lead also
+        updates the last rows which were filled before (as do the operations
+        on lead data, e.g. stacked lead sequences). sequence data,
+        cross sectional transform and transform without appendLookback are recomputed
+        (e.g. ema, its state depends on the whole history).
+        the removed data is not kept, so it can not be used by append.
+        
+        Parameters
+        ----------
+        rows : dict of list
+            the new values of original data (time index, category, data and labels)
+        fillMissing : object, optional
+            the value of the original data not in rows, by default np.nan
+        
+        Returns
+        -------
+        self
+        """
+        tsd = self.time_series_data
+        removed = {o for n in self._registry.nodes if n.op == 'remove' for o in n.outputs}
+        rows = {k:v for k,v in rows.items() if k not in removed}
+        before = {k:v.time_length for k,v in self._tsd_dict().items()}
+        order = {k:(list(v.data),list(v.labels)) for k,v in self._tsd_dict().items()}
+        windows = _append_windows(self._registry.nodes)
+        # the sequence data is rebuilt instead of being extended
+        for node,(lookback,_) in zip(self._registry.nodes,windows):
+            if lookback is None and not node.opaque:
+                for v in self._tsd_dict().values():
+                    for o in node.outputs:
+                        v.remove(o)
+        tsd.append(rows,fillMissing)
+        registry,lazy = self._registry,self._lazy
+        self._registry,self._lazy = None,False
+        try:
+            for node,(lookback,lookahead) in zip(registry.nodes,windows):
+                if lookback is None:
+                    getattr(self,node.method)(*node.args,**node.kwargs)
+                    continue
+                for k,v in self._tsd_dict().items():
+                    if v.time_length > before.get(k,0):
+                        self._update_tail(v,node,v.time_length-before.get(k,0),lookback,lookahead)
+        finally:
+            self._registry,self._lazy = registry,lazy
+        template = next(iter(order.values()),([],[]))
+        for k,v in self._tsd_dict().items():
+            dataOrder,labelOrder = order.get(k,template)
+            for dictionary,keys in [(v._data,dataOrder),(v._labels,labelOrder)]:
+                for o in keys+[o for o in list(dictionary) if o not in keys]:
+                    if o in dictionary:
+                        _move_to_end(dictionary,o)
+        return self
+
+    def _update_tail(self,time_series_data,node,added,lookback,lookahead):
+        n = time_series_data.time_length
+        first = max(n-added-lookahead,0)
+        start = max(first-lookback,0)
+        # only the inputs of node, so only its outputs are written back
+        tail = time_series_data._take_columns(node.inputs,slice(start,n))
+        before = dict(tail.data)
+        before.update(tail.labels)
+        transformer = Time_Series_Transformer(tail,self.timeSeriesCol)
+        transformer._registry = None
+        getattr(transformer,node.method)(*node.args,**node.kwargs)
+        for updates in _column_updates(tail,before).values():
+            for k,arr in updates.items():
+                if k not in time_series_data.data and k not in time_series_data.labels:
+                    # removed by a later operation
+                    continue
+                if time_series_data.block_storage:
+                    # the block is copied once if it is shared, not on every append
+                    dictionary = time_series_data._data if k in time_series_data.data else time_series_data._labels
+                    column = dictionary.writable(k)
+                elif first < n-added:
+                    # the rows before the new ones are rewritten (lookahead)
+                    outputType = 'data' if k in time_series_data.data else 'labels'
+                    column = time_series_data._own_rows(outputType,k)
+                else:
+                    column = time_series_data.make_writable(k)
+                column[first:] = np.asarray(arr)[first-start:]
+
 
     @classmethod
-    def from_pandas(cls, pandasFrame,timeSeriesCol,mainCategoryCol):
+    def from_pandas(cls, pandasFrame,timeSeriesCol,mainCategoryCol,copy=True):
         """
         from_pandas import data from pandas dataFrame
         
@@ -482,16 +861,19 @@ class Time_Series_Transformer(object):
             time series column name
         mainCategoryCol : str or numeric
             main category name
+        copy : bool, optional
+            whether to copy the frame. if False, the columns are kept as 
+            read-only views of the frame, by default True
         
         Returns
         -------
         Time_Series_Transformer
         """
-        data = io.from_pandas(pandasFrame,timeSeriesCol,mainCategoryCol)
+        data = io.from_pandas(pandasFrame,timeSeriesCol,mainCategoryCol,copy)
         return cls(data,timeSeriesCol,mainCategoryCol)
 
     @classmethod
-    def from_numpy(cls,numpyData,timeSeriesCol,mainCategoryCol):
+    def from_numpy(cls,numpyData,timeSeriesCol,mainCategoryCol,copy=True):
         """
         from_numpy import data from numpy
         
@@ -503,12 +885,15 @@ class Time_Series_Transformer(object):
             index of time series column
         mainCategoryCol : int
             index of main category column
+        copy : bool, optional
+            whether to copy the array. if False, the columns are kept as 
+            read-only views of the array, by default True
         
         Returns
         -------
         Time_Series_Transformer
         """
-        data = io.from_numpy(numpyData,timeSeriesCol,mainCategoryCol)
+        data = io.from_numpy(numpyData,timeSeriesCol,mainCategoryCol,copy)
         return cls(data,timeSeriesCol,mainCategoryCol)
 
     @classmethod
@@ -778,11 +1163,75 @@ class Time_Series_Transformer(object):
         statement += f"main category column: {self.mainCategoryCol}"
         return statement
 
+def _node_window(node):
+    # (lookback, lookahead) rows needed to update the new rows, None lookback means recomputation
+    kwargs = node.kwargs
+    if node.op == 'lag':
+        return kwargs['lagNum'],0
+    if node.op == 'lead':
+        return 0,kwargs['leadNum']
+    if node.op == 'stack':
+        return 0,0
+    if node.op == 'tensor':
+        if kwargs['lagNum'] >= 0:
+            return kwargs['windowSize']-1+kwargs['lagNum'],0
+        return 0,kwargs['windowSize']-1-kwargs['lagNum']
+    if node.op == 'transform':
+        return kwargs['appendLookback'],kwargs['appendLookahead']
+    return None,0
+
+def _append_windows(nodes):
+    # (lookback, lookahead) of each node for append, the lookahead includes the
+    # rows its inputs read ahead (e.g. stacked lead sequences), so the rows
+    # reaching into the new data are updated as well
+    reach = {}
+    res = []
+    for node in nodes:
+        lookback,lookahead = _node_window(node)
+        ahead = [reach.get(i,0) for i in node.inputs]
+        ahead = None if None in ahead else max(ahead+[0])
+        if lookback is not None:
+            if ahead is None:
+                lookback,lookahead = None,0
+            else:
+                lookahead += ahead
+        res.append((lookback,lookahead))
+        if ahead is not None and node.op == 'lead_sequence':
+            outputReach = ahead+node.kwargs['windowSize']-1+node.kwargs['leadNum']
+        elif ahead is not None and node.op in ('lag_sequence','identity'):
+            outputReach = ahead
+        else:
+            outputReach = None if lookback is None else lookahead
+        for o in node.outputs:
+            reach[o] = outputReach
+    return res
+
+def _move_to_end(dictionary,key):
+    # block storage only reorders the columns, so the blocks stay consolidated
+    if isinstance(dictionary,Block_Manager):
+        dictionary.move_to_end(key)
+    else:
+        dictionary[key] = dictionary.pop(key)
+
+def _periods(num,name):
+    # one period or list (range) of periods, the negative period would be the other direction
+    periods = [num] if np.ndim(num) == 0 else list(num)
+    for k in periods:
+        if k < 0:
+            raise ValueError(f'{name} must be non negative, got {k}')
+    return periods
+
+def _label_name(inputLabel,suffix,suffixNum):
+    if suffix is not None:
+        return f'{inputLabel}{suffix}{str(suffixNum)}'
+    return f"{inputLabel}{str(suffixNum)}"
+
 def make_sequence(arr, window,fillMissing=np.nan):
     """
     rolling_window create an rolling window tensor
     
-    this function create a rolling window numpy tensor given its original sequence and window size
+    this function create a rolling window tensor given its original sequence and window size
+    the first window-1 rows are filled with fillMissing
     
     Parameters
     ----------
@@ -793,50 +1242,157 @@ def make_sequence(arr, window,fillMissing=np.nan):
     
     Returns
     -------
-    numpy 2d array
-        the rolling window array
+    Window_Array
+        the rolling window array (n, window)
     """
-    shape = arr.shape[:-1] + (arr.shape[-1] - window + 1, window)
-    strides = arr.strides + (arr.strides[-1],)
-    seq = np.lib.stride_tricks.as_strided(arr, shape=shape, strides=strides)
-    empty = np.empty(((len(arr)-seq.shape[0],seq.shape[1])))
-    empty[:] = fillMissing
-    res = np.vstack([empty,seq])
-    return res
+    return window_shift(arr,window,[('lag',0)],fillMissing)[0]
 
 
 def make_lag_sequnece(data,windowSize,lagNum,fillMissing):
-    lagdata = np.array(make_lag(data,lagNum,fillMissing))
-    return make_sequence(lagdata,windowSize,fillMissing)
+    return window_shift(data,windowSize,[('lag',lagNum)],fillMissing)[0]
 
 def identity_window(arr,windowSize):
-    return np.repeat(arr,windowSize).reshape((-1,windowSize))
+    return identical_window(arr,windowSize)
+
+def make_shift(data,shiftList,fillMissing=np.nan):
+    """
+    make_shift making multiple lag and lead data in one buffer
+    
+    the dtype of data is kept if it can hold fillMissing 
+    (e.g. int becomes float for nan), otherwise object is used.
+    
+    Parameters
+    ----------
+    data : numpy array
+        the original data sequence
+    shiftList : list of int
+        positive number is lag period and negative number is lead period
+    fillMissing : object, optional
+        the data for filling missing data, by default np.nan
+    
+    Returns
+    -------
+    numpy array
+        the shifted data with shape (len(shiftList),) + data.shape
+    """
+    data = np.asarray(data)
+    n = len(data)
+    dtype = _fill_dtype(data.dtype,fillMissing)
+    fillMissing = _fill_value(dtype,fillMissing)
+    res = np.empty((len(shiftList),)+data.shape,dtype=dtype)
+    for ix,k in enumerate(shiftList):
+        k = int(k)
+        if k >= 0:
+            k = min(k,n)
+            res[ix,:k] = fillMissing
+            res[ix,k:] = data[:n-k]
+        else:
+            k = min(-k,n)
+            res[ix,:n-k] = data[k:]
+            res[ix,n-k:] = fillMissing
+    return res
 
 def make_lead(data,leadNum,fillMissing):
-    res = np.empty((leadNum))
-    res[:] = fillMissing
-    res = res.tolist()        
-    leadValues = data[leadNum:].tolist()
-    leadValues.extend(res)        
-    return leadValues        
+    return make_shift(data,[-leadNum],fillMissing)[0]
 
 def make_lag(data,lagNum,fillMissing):
-    res = np.empty((lagNum))
-    res[:] = fillMissing
-    res = res.tolist()        
-    lagValues = data[:-lagNum]
-    res.extend(lagValues)        
-    return res
+    return make_shift(data,[lagNum],fillMissing)[0]
 
 def lead_sequence(arr,leadNum,windowSize,fillMissing=np.nan):
-    shape = arr.shape[:-1] + (arr.shape[-1] - windowSize + 1, windowSize)
-    strides = arr.strides + (arr.strides[-1],)
-    seq = np.lib.stride_tricks.as_strided(arr, shape=shape, strides=strides)
-    seq = seq[leadNum:]
-    empty = np.empty(((len(arr)-seq.shape[0],seq.shape[1])))
-    empty[:] = fillMissing
-    res = np.vstack([seq,empty])
-    return res
+    return window_shift(arr,windowSize,[('lead',leadNum)],fillMissing)[0]
+
+def fused_shift(arr,shifts,fillMissing=np.nan):
+    """
+    fused_shift making multiple named lag and lead data from one buffer
+    
+    Parameters
+    ----------
+    arr : numpy 1D array
+        the original data sequence
+    shifts : list of tuple
+        (name, shift) pairs, positive shift is lag and negative shift is lead
+    fillMissing : object, optional
+        the data for filling missing data, by default np.nan
+    
+    Returns
+    -------
+    dict of numpy array
+        the views of the rows of make_shift output
+    """
+    buffer = make_shift(arr,[k for _,k in shifts],fillMissing)
+    return {name:buffer[ix] for ix,(name,_) in enumerate(shifts)}
+
+def fused_window(arr,windowSize,shifts,fillMissing=np.nan):
+    """
+    fused_window making multiple lag and lead sequences sharing one padded base
+    
+    Parameters
+    ----------
+    arr : numpy 1D array
+        the original data sequence
+    windowSize : int
+        the length of sequence
+    shifts : list of tuple
+        (name, 'lag' or 'lead', period) tuples
+    fillMissing : object, optional
+        the data for filling missing data, by default np.nan
+    
+    Returns
+    -------
+    dict of Window_Array
+    """
+    windows = window_shift(arr,windowSize,[(op,num) for _,op,num in shifts],fillMissing)
+    return {name:windows[ix] for ix,(name,_,_) in enumerate(shifts)}
+
+def sequence_tensor(arrDict,name,windowSize,lagNum=0,fillMissing=np.nan,dtype=np.float32):
+    """
+    sequence_tensor making one (time, window, feature) tensor from multiple data
+    
+    the inputs are written into one padded (time, feature) buffer, 
+    the tensor is gathered from its window view at once.
+    lag window of row t is data[t-windowSize+1-lag:t+1-lag] (the first
+    windowSize-1 rows are filled), lead window of row t is
+    data[t+lead:t+lead+windowSize] (the rows exceeding the data are filled).
+    
+    Parameters
+    ----------
+    arrDict : dict of numpy 1D array
+        the input data, the order becomes the feature axis
+    name : str
+        the name of tensor
+    windowSize : int
+        the length of sequence
+    lagNum : int, optional
+        the lag period of sequence, negative number makes lead sequence, by default 0
+    fillMissing : object, optional
+        the data for filling missing data, by default np.nan
+    dtype : numpy dtype, optional
+        the dtype of tensor, by default np.float32
+    
+    Returns
+    -------
+    dict of numpy 3D array
+    """
+    arrList = list(arrDict.values())
+    n = len(arrList[0])
+    pad = max(lagNum,0)+windowSize-1
+    padded = np.empty((pad+n,len(arrList)),dtype=dtype)
+    padded[:pad] = fillMissing
+    for ix,arr in enumerate(arrList):
+        padded[pad:,ix] = arr
+    # (window position, feature, window) -> (window position, window, feature)
+    windows = np.lib.stride_tricks.sliding_window_view(padded,windowSize,axis=0).transpose(0,2,1)
+    t = np.arange(n)
+    if lagNum >= 0:
+        start = t+pad-windowSize+1-lagNum
+        valid = t >= windowSize-1
+    else:
+        start = t+pad-lagNum
+        valid = t-lagNum+windowSize <= n
+    res = np.empty((n,windowSize,len(arrList)),dtype=dtype)
+    res[~valid] = fillMissing
+    res[valid] = windows[start[valid]]
+    return {name:res}
 
 def stack_sequence(arrDict, axis = -1):
     res = []
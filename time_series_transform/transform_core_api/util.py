@@ -2,7 +2,26 @@ from numpy.fft import *
 import pandas as pd
 import numpy as np
 import pywt
-from scipy.stats.mstats import gmean
+from functools import lru_cache
+from time_series_transform.transform_core_api.rolling import rolling_gmean
+from time_series_transform.transform_core_api.ewm import ewm_mean
+from time_series_transform.transform_core_api.difference import (difference,fractional_difference)
+
+
+def _valid_runs(arr):
+    # (start, stop) of each contiguous run without nan
+    valid = np.concatenate([[False],~np.isnan(arr),[False]])
+    edges = np.flatnonzero(valid[1:] != valid[:-1])
+    return edges.reshape(-1,2)
+
+
+def _apply_runs(arr,func,*args,**kwargs):
+    # func is applied to each contiguous run (view) and written back at its position
+    arr = np.asarray(arr,dtype=float)
+    res = np.full(len(arr),np.nan)
+    for start,stop in _valid_runs(arr):
+        res[start:stop] = func(arr[start:stop],*args,**kwargs)
+    return res
 
 
 def moving_average(arr, windowSize=3) :
@@ -10,6 +29,13 @@ def moving_average(arr, windowSize=3) :
     moving_average the arithimetic moving average
     
     Given the window size, this function will perform simple moving average
+    over the last windowSize valid values. nan stays nan at its position,
+    so the output is aligned to the input.
+    the gaps are skipped (the window reaches back over them), unlike
+    rolling.rolling_mean whose window is windowSize rows, so a nan inside
+    the window makes it nan. both are the same for the series without nan.
+    the running sum is kept (not the blocked sums of rolling_mean), so it
+    stays identical to streaming.Streaming_Moving_Average.
     
     Parameters
     ----------
@@ -23,14 +49,16 @@ def moving_average(arr, windowSize=3) :
     numpy array
         the moving average array
     """
-    orgLen = len(arr)
-    arr = arr[~np.isnan(arr)]
-    ret = np.cumsum(arr, dtype=float)
+    arr = np.asarray(arr,dtype=float)
+    valid = ~np.isnan(arr)
+    # masked cumulative sum, the gaps add nothing
+    ret = np.cumsum(np.where(valid,arr,0.))[valid]
     ret[windowSize:] = ret[windowSize:] - ret[:-windowSize]
-    ret = ret[windowSize - 1:] / windowSize
-    res = np.empty((int(orgLen-len(ret))))
-    res[:] = np.nan
-    return np.append(res,ret) 
+    ret /= windowSize
+    ret[:windowSize-1] = np.nan
+    res = np.full(len(arr),np.nan)
+    res[valid] = ret
+    return res
 
 
 def rfft_transform(arr, threshold=1e3):
@@ -39,6 +67,8 @@ def rfft_transform(arr, threshold=1e3):
     
     Fast fourier trnasformation and ignoring the imagine number
     note: numpy implmentation
+    each contiguous run without nan is transformed separately,
+    nan stays nan at its position.
 
     Parameters
     ----------
@@ -52,15 +82,79 @@ def rfft_transform(arr, threshold=1e3):
     numpy array
         rfft array
     """
-    orgLen = len(arr)
-    arr = arr[~np.isnan(arr)]
-    fourier = rfft(arr)
-    frequencies = rfftfreq(arr.size, d=20e-3/arr.size)
-    fourier[frequencies > threshold] = 0
-    fourier =  irfft(fourier)
-    res = np.empty((int(orgLen-len(fourier))))
-    res[:] = np.nan
-    return np.append(res,fourier) 
+    return _apply_runs(arr,_rfft_filter,threshold)
+
+
+def _rfft_filter(arr,threshold):
+    # arr is 1D or 2D (series, time), the transform runs along the last axis
+    n = arr.shape[-1]
+    fourier = rfft(arr,axis=-1)
+    fourier[...,_frequency_mask(n,threshold)] = 0
+    return irfft(fourier,n=n,axis=-1)
+
+
+@lru_cache(maxsize=128)
+def _frequency_mask(length,threshold):
+    # the filtered frequencies only depend on the length, so they are cached
+    mask = rfftfreq(length, d=20e-3/length) > threshold
+    mask.setflags(write=False)
+    return mask
+
+
+def _batch_rows(arr,axis,func,fallback,*args,**kwargs):
+    # the (series, time) block of nan free series is processed in one call,
+    # series having nan fall back to the per run version
+    arr = np.moveaxis(np.asarray(arr,dtype=float),axis,-1)
+    shape = arr.shape
+    flat = arr.reshape(-1,shape[-1])
+    res = np.full(flat.shape,np.nan)
+    complete = ~np.isnan(flat).any(axis=1)
+    if complete.any() and shape[-1] > 0:
+        res[complete] = func(flat[complete],*args,**kwargs)
+    for ix in np.flatnonzero(~complete):
+        res[ix] = fallback(flat[ix],*args,**kwargs)
+    return np.moveaxis(res.reshape(shape),-1,axis)
+
+
+def _batch_dict(arr,axis,batchFunc,*args,**kwargs):
+    # dictionary input (list of inputLabels of Time_Series_Data) is one block
+    # of columns, the output columns keep the input names
+    if not isinstance(arr,dict):
+        return batchFunc(arr,*args,axis=axis,**kwargs)
+    keys = list(arr.keys())
+    res = batchFunc(np.stack([np.asarray(arr[k],dtype=float) for k in keys]),*args,axis=-1,**kwargs)
+    return pd.DataFrame(dict(zip(keys,res)))
+
+
+def rfft_transform_batch(arr, threshold=1e3, axis=-1):
+    """
+    rfft_transform_batch batched version of rfft_transform
+    
+    it takes a (series, time) block, e.g. (category, time) array of 
+    Time_Series_Panel or the columns of Time_Series_Data, and runs one
+    rfft/irfft along the time axis for all nan free series.
+    series having nan are transformed by run as rfft_transform.
+
+    Parameters
+    ----------
+    arr : numpy array or dict
+        input array or dictionary of 1D arrays (the list of inputLabels
+        of Time_Series_Data), the output is DataFrame of the same keys
+    threshold : float, optional
+        the threshold used for filter frequency, by default 1e3
+    axis : int, optional
+        the time axis, by default -1
+    
+    Returns
+    -------
+    numpy array or pandas DataFrame
+        rfft array of the same shape
+    """
+    return _batch_dict(arr,axis,_rfft_transform_batch,threshold)
+
+
+def _rfft_transform_batch(arr,threshold,axis):
+    return _batch_rows(arr,axis,_rfft_filter,rfft_transform,threshold)
 
 
 def madev(d, axis=None):
@@ -73,6 +167,8 @@ def wavelet_denoising(arr, wavelet='db4',coeff_mode = "per",threshold_mode='hard
     wavelet_denoising wavelet transformation
     
     wavelet transformation, with pywt implmentation
+    each contiguous run without nan is denoised separately,
+    nan stays nan at its position.
     
     Parameters
     ----------
@@ -89,31 +185,88 @@ def wavelet_denoising(arr, wavelet='db4',coeff_mode = "per",threshold_mode='hard
     level : int, optional
         sigma level for theshold, by default 1
     matchOriginLenth : bool, optional
-        whether to match the input array length, by default True
+        whether to match the input array length, 
+        if False the reconstructions of runs are concatenated, by default True
     
     Returns
     -------
     numpy array
         wevelet transformed array
     """
-    orgLen = len(arr)
-    arr = arr[~np.isnan(arr)]
-    coeff = pywt.wavedec(arr, wavelet, mode=coeff_mode)
-    sigma = (1/0.6745) * madev(coeff[-level])
-    uthresh = sigma * np.sqrt(2 * np.log(len(arr)))
+    kwargs = {
+        'wavelet':wavelet,'coeff_mode':coeff_mode,'threshold_mode':threshold_mode,
+        'rec_mode':rec_mode,'level':level
+        }
+    if matchOriginLenth:
+        return _apply_runs(arr,_wavelet_filter,matchOriginLenth=True,**kwargs)
+    arr = np.asarray(arr,dtype=float)
+    wavs = [_wavelet_filter(arr[start:stop],**kwargs) for start,stop in _valid_runs(arr)]
+    return np.concatenate(wavs) if wavs else np.array([])
+
+
+def _wavelet_filter(arr,wavelet,coeff_mode,threshold_mode,rec_mode,level,matchOriginLenth=False):
+    # arr is 1D or 2D (series, time), the transform runs along the last axis
+    n = arr.shape[-1]
+    coeff = pywt.wavedec(arr, wavelet, mode=coeff_mode, axis=-1)
+    detail = coeff[-level]
+    # one threshold per series
+    sigma = (1/0.6745) * np.mean(np.absolute(detail - np.mean(detail, axis=-1, keepdims=True)), axis=-1, keepdims=True)
+    uthresh = sigma * np.sqrt(2 * np.log(n))
+    if arr.ndim == 1:
+        uthresh = uthresh[0]
     coeff[1:] = (pywt.threshold(i, value=uthresh, mode=threshold_mode) for i in coeff[1:])
-    wav = pywt.waverec(coeff, wavelet, mode=rec_mode)
+    wav = pywt.waverec(coeff, wavelet, mode=rec_mode, axis=-1)
     if matchOriginLenth:
-        if len(wav) > orgLen:
-            return wav[:len(arr)]
-        else:
-            res = np.empty((int(orgLen-len(wav))))
-            res[:] = np.nan
-            return np.append(res,wav) 
-    else:
-        return wav
+        if wav.shape[-1] > n:
+            return wav[...,:n]
+        res = np.full(arr.shape[:-1]+(n-wav.shape[-1],),np.nan)
+        return np.concatenate([res,wav],axis=-1)
+    return wav
 
-def differencing(arr,order =1):
+
+def wavelet_denoising_batch(arr, wavelet='db4',coeff_mode = "per",threshold_mode='hard',rec_mode='per', level=1,axis=-1):
+    """
+    wavelet_denoising_batch batched version of wavelet_denoising
+    
+    it takes a (series, time) block, e.g. (category, time) array of 
+    Time_Series_Panel or the columns of Time_Series_Data, and runs one
+    wavedec/waverec along the time axis for all nan free series.
+    the threshold is computed per series, series having nan are denoised
+    by run as wavelet_denoising. the output always matches the input length.
+
+    Parameters
+    ----------
+    arr : numpy array or dict
+        input array or dictionary of 1D arrays (the list of inputLabels
+        of Time_Series_Data), the output is DataFrame of the same keys
+    wavelet : str, optional
+        wavelet transform family, by default 'db4'
+    coeff_mode : str, optional
+        the coefficient mode, by default "per"
+    threshold_mode : str, optional
+        the threshold tye, by default 'hard'
+    rec_mode : str, optional
+        recover mode, by default 'per'
+    level : int, optional
+        sigma level for theshold, by default 1
+    axis : int, optional
+        the time axis, by default -1
+    
+    Returns
+    -------
+    numpy array or pandas DataFrame
+        wevelet transformed array of the same shape
+    """
+    return _batch_dict(arr,axis,_wavelet_denoising_batch,wavelet,coeff_mode,threshold_mode,rec_mode,level)
+
+
+def _wavelet_denoising_batch(arr,wavelet,coeff_mode,threshold_mode,rec_mode,level,axis):
+    return _batch_rows(
+        arr,axis,_wavelet_filter,wavelet_denoising,
+        wavelet,coeff_mode,threshold_mode,rec_mode,level,matchOriginLenth=True
+        )
+
+def differencing(arr,order =1,lag=1):
     """
     differencing time series differencing
     
@@ -124,42 +277,44 @@ def differencing(arr,order =1):
     order 2
         Xt, Xt+1, Xt+2 --> Xt+1 - Xt, Xt+2-Xt+1 = a,b --> b - a 
     and so on
+    all orders are computed in one pass by binomial weights (see difference.difference)
     
     Parameters
     ----------
     arr : numpy array
-        input array
+        input array, 2D array is differenced along the first axis
     order : int, optional
         number of differencing, by default 1
+    lag : int, optional
+        the seasonal lag, e.g. Xt+k - Xt for lag k, by default 1
     
     Returns
     -------
     numpy array
         differenced array
     """
-    for i in range(order):
-        if i == 0:
-            diff = np.diff(arr)
-        else:
-            diff = np.diff(diff)
-    res = np.empty((int(len(arr)-len(diff))))
-    res[:] = np.nan
-    return np.append(res,diff) 
+    return difference(arr,order,lag)
 
     
 def ema(arr, com = None, span = None, halflife = None, alpha = None, adjust = True, min_periods = 0, ignore_na = False, axis = 0):
     """
     this is the panads ema implmentation
+
+    it is computed by ewm.ewm_mean (same as pandas ewm without building DataFrame),
+    1D array is treated as one column, so the output is (n, 1) array
     """
-    df = pd.DataFrame(arr)
-    return df.ewm(com = com, span = span, halflife = halflife, alpha = alpha, min_periods = min_periods, adjust = adjust, ignore_na = ignore_na, axis = axis).mean().to_numpy()
+    arr = np.asarray(arr,dtype=float)
+    if arr.ndim == 1:
+        arr = arr.reshape(-1,1)
+    return ewm_mean(arr, com = com, span = span, halflife = halflife, alpha = alpha, adjust = adjust, min_periods = min_periods, ignore_na = ignore_na, axis = axis)
 
 
 def geometric_ma(arr,windowSize):
     """
     geometric_ma geometric moving average
     
-    it use pandas rolling window with sicpy gmean function
+    it uses the cumulative log sums (see rolling.rolling_gmean),
+    the window having nan is nan
     
     Parameters
     ----------
@@ -173,4 +328,4 @@ def geometric_ma(arr,windowSize):
     numpy array
         geometric moving average array
     """
-    return pd.Series(arr).rolling(window=windowSize).apply(gmean)
\ No newline at end of file
+    return pd.Series(rolling_gmean(arr,windowSize))
\ No newline at end of file
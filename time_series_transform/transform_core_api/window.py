@@ -0,0 +1,290 @@
+import numpy as np
+import pandas as pd
+from time_series_transform.transform_core_api.alignment import (_fill_dtype,_fill_value)
+
+
+def _isna(arr):
+    if arr.dtype.kind in 'fc':
+        return np.isnan(arr)
+    if arr.dtype.kind in 'mM':
+        return np.isnat(arr)
+    if arr.dtype.kind == 'O':
+        return np.asarray(pd.isna(arr),dtype=bool)
+    return np.zeros(arr.shape,dtype=bool)
+
+
+class Window_Array(object):
+    def __init__(self,base,windowSize,length,start=0,validStart=0,validStop=None,step=1,fillMissing=np.nan,rows=None):
+        """
+        Window_Array the windowed (sequence) column stored as one 1-D array
+
+        row t is base[start+t], base[start+t+step], ... (windowSize values).
+        the rows outside [validStart, validStop) are incomplete windows,
+        they are filled with fillMissing. Hence, the memory is O(n) instead
+        of O(n x windowSize); the 2-D array is only materialized when it is
+        converted into numpy (e.g. exporting to pandas).
+        the taken rows (e.g. dropna or sort) are a slice of the base if they are
+        contiguous, otherwise the row map of the windows above.
+
+        Parameters
+        ----------
+        base : numpy 1D array
+            the (padded) values, it is kept as read-only
+        windowSize : int
+            the length of window
+        length : int
+            the number of rows
+        start : int, optional
+            the position of first window in base, by default 0
+        validStart : int, optional
+            the first complete row, by default 0
+        validStop : int, optional
+            the end (exclusive) of complete rows, if None all rows are complete, by default None
+        step : {0, 1}, optional
+            the distance between window values, 0 repeats the same value, by default 1
+        fillMissing : object, optional
+            the value of incomplete rows, by default np.nan
+        rows : numpy 1D array of int, optional
+            the row map, row t is the window of row rows[t] above,
+            if None the rows are not mapped, by default None
+        """
+        base = np.asarray(base).view()
+        base.flags.writeable = False
+        self._base = base
+        self._windowSize = windowSize
+        self._length = length
+        self._start = start
+        self._validStart = min(max(validStart,0),length)
+        validStop = length if validStop is None else validStop
+        self._validStop = min(max(validStop,self._validStart),length)
+        self._step = step
+        self._fillMissing = _fill_value(base.dtype,fillMissing)
+        if rows is not None:
+            rows = np.asarray(rows,dtype=np.int64).view()
+            rows.flags.writeable = False
+        self._rows = rows
+
+    @property
+    def base(self):
+        return self._base
+
+    @property
+    def window_size(self):
+        return self._windowSize
+
+    @property
+    def shape(self):
+        return (len(self),self._windowSize)
+
+    @property
+    def ndim(self):
+        return 2
+
+    @property
+    def dtype(self):
+        return self._base.dtype
+
+    @property
+    def size(self):
+        return len(self)*self._windowSize
+
+    def __len__(self):
+        return self._length if self._rows is None else len(self._rows)
+
+    def _mapped(self,rows):
+        # the same windows with the row map
+        return Window_Array(
+            self._base,self._windowSize,self._length,self._start,
+            self._validStart,self._validStop,self._step,self._fillMissing,rows
+            )
+
+    def window_view(self):
+        """
+        window_view read-only view of the complete windows
+
+        Returns
+        -------
+        numpy 2D array
+            the rows from validStart to validStop, no data is copied.
+            the complete windows of mapped rows are gathered (copied)
+        """
+        if self._rows is not None:
+            rows = self._rows[(self._rows >= self._validStart) & (self._rows < self._validStop)]
+            return self._window_view()[rows-self._validStart]
+        return self._window_view()
+
+    def _window_view(self):
+        first = self._start+self._validStart
+        rows = self._validStop-self._validStart
+        if rows == 0:
+            return np.empty((0,self._windowSize),dtype=self.dtype)
+        if self._step == 0:
+            return np.lib.stride_tricks.as_strided(
+                self._base[first:first+rows],
+                shape=(rows,self._windowSize),
+                strides=(self._base.strides[0],0),
+                writeable=False
+                )
+        windows = np.lib.stride_tricks.sliding_window_view(self._base[first:],self._windowSize)
+        return windows[:rows]
+
+    def _take(self,rows):
+        if self._rows is not None:
+            rows = self._rows[rows]
+        res = np.empty((len(rows),self._windowSize),dtype=self.dtype)
+        valid = (rows >= self._validStart) & (rows < self._validStop)
+        if not valid.all():
+            res[~valid] = self._fillMissing
+        res[valid] = self._window_view()[rows[valid]-self._validStart]
+        return res
+
+    def __array__(self,dtype=None,copy=None):
+        if self._rows is not None:
+            res = self._take(np.arange(len(self)))
+            return res if dtype is None else res.astype(dtype,copy=False)
+        res = np.empty(self.shape,dtype=self.dtype)
+        # complete windows never need fillMissing (e.g. int identical windows)
+        if self._validStart > 0:
+            res[:self._validStart] = self._fillMissing
+        if self._validStop < self._length:
+            res[self._validStop:] = self._fillMissing
+        res[self._validStart:self._validStop] = self._window_view()
+        if dtype is not None:
+            res = res.astype(dtype,copy=False)
+        return res
+
+    def to_numpy(self):
+        return np.asarray(self)
+
+    def __getitem__(self,ix):
+        length = len(self)
+        if isinstance(ix,(int,np.integer)):
+            if ix < 0:
+                ix += length
+            if ix < 0 or ix >= length:
+                raise IndexError('index out of range')
+            return self._take(np.array([ix]))[0]
+        if isinstance(ix,tuple):
+            return np.asarray(self)[ix]
+        if self._rows is not None:
+            return self._mapped(self._rows[ix])
+        if isinstance(ix,slice) and (ix.step or 1) == 1:
+            lo,hi,_ = ix.indices(length)
+            hi = max(lo,hi)
+            return Window_Array(
+                self._base,self._windowSize,hi-lo,self._start+lo,
+                self._validStart-lo,self._validStop-lo,self._step,self._fillMissing
+                )
+        rows = np.arange(length)[ix]
+        if len(rows) == 0 or (rows[-1]-rows[0] == len(rows)-1 and (np.diff(rows) == 1).all()):
+            # contiguous rows (e.g. dropna of the leading and trailing incomplete windows)
+            return self[slice(rows[0],rows[-1]+1) if len(rows) else slice(0,0)]
+        return self._mapped(rows)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def tolist(self):
+        return np.asarray(self).tolist()
+
+    def copy(self):
+        return Window_Array(
+            self._base.copy(),self._windowSize,self._length,self._start,
+            self._validStart,self._validStop,self._step,self._fillMissing,self._rows
+            )
+
+    def astype(self,dtype):
+        return np.asarray(self).astype(dtype)
+
+    def nan_row_mask(self):
+        """
+        nan_row_mask whether each row has any null value
+
+        it is computed on the 1-D base (O(n)) without materializing the windows
+
+        Returns
+        -------
+        numpy array of bool
+        """
+        if self._rows is not None:
+            return self._mapped(None).nan_row_mask()[self._rows]
+        res = np.empty(self._length,dtype=bool)
+        res[:] = bool(pd.isna(self._fillMissing))
+        rows = self._validStop-self._validStart
+        first = self._start+self._validStart
+        if self._step == 0:
+            res[self._validStart:self._validStop] = _isna(self._base[first:first+rows])
+            return res
+        count = np.zeros(len(self._base)+1,dtype=np.int64)
+        np.cumsum(_isna(self._base),out=count[1:])
+        begin = first+np.arange(rows)
+        res[self._validStart:self._validStop] = (count[begin+self._windowSize]-count[begin]) > 0
+        return res
+
+    def __repr__(self):
+        return f"Window_Array({np.asarray(self)!r})"
+
+
+def _padded_base(data,before,fillMissing):
+    data = np.asarray(data)
+    dtype = _fill_dtype(data.dtype,fillMissing)
+    base = np.empty(before+len(data),dtype=dtype)
+    base[:before] = _fill_value(dtype,fillMissing)
+    base[before:] = data
+    return base
+
+
+def window_shift(data,windowSize,shifts,fillMissing=np.nan):
+    """
+    window_shift making multiple lag and lead windows sharing one padded base
+
+    lag window of row t is data[t-windowSize+1-lag:t+1-lag] (the first
+    windowSize-1 rows are filled), lead window of row t is
+    data[t+lead:t+lead+windowSize] (the rows exceeding the data are filled).
+
+    Parameters
+    ----------
+    data : numpy 1D array
+        the original data sequence
+    windowSize : int
+        the length of window
+    shifts : list of tuple
+        ('lag' or 'lead', period) pairs
+    fillMissing : object, optional
+        the data for filling missing data, by default np.nan
+
+    Returns
+    -------
+    list of Window_Array
+    """
+    n = len(data)
+    maxLag = max([num for op,num in shifts if op == 'lag']+[0])
+    pad = maxLag+windowSize-1
+    base = _padded_base(data,pad,fillMissing)
+    res = []
+    for op,num in shifts:
+        if op == 'lag':
+            res.append(Window_Array(base,windowSize,n,maxLag-num,windowSize-1,n,fillMissing=fillMissing))
+        else:
+            res.append(Window_Array(base,windowSize,n,pad+num,0,n-windowSize-num+1,fillMissing=fillMissing))
+    return res
+
+
+def identical_window(data,windowSize):
+    """
+    identical_window making windows repeating the value of each row
+
+    Parameters
+    ----------
+    data : numpy 1D array
+        the original data sequence
+    windowSize : int
+        the length of window
+
+    Returns
+    -------
+    Window_Array
+    """
+    base = np.array(data)
+    return Window_Array(base,windowSize,len(base),step=0)